@@ -0,0 +1,399 @@
+import csv
+import importlib.util
+import json
+import os
+from datetime import datetime
+from itertools import islice
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal, QThread
+
+from Model.Stocks.symbol_metadata import symbol_metadata
+from Model.Transactions.transaction_store import format_transaction_date
+
+
+CHUNK_SIZE = 2000  # Rows written (and progress reported) per chunk
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMAT_PARQUET = "parquet"
+
+
+def parquet_available():
+    """True if pyarrow is installed - Parquet export is only offered then.
+    Looked up without importing it, pyarrow takes a while to load and is only needed to write the file."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def file_dialog_filter():
+    """Filter string for QFileDialog listing the formats we can write"""
+    filters = ["CSV Files (*.csv)", "JSON Lines (*.jsonl)"]
+    if parquet_available():
+        filters.append("Parquet Files (*.parquet)")
+    return ";;".join(filters)
+
+
+def format_for_path(file_path, selected_filter=""):
+    """Work out the export format from the chosen file/filter and make sure the path has the extension"""
+    extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+    if extension in (FORMAT_CSV, FORMAT_JSONL) or (extension == FORMAT_PARQUET and parquet_available()):
+        return extension, file_path
+
+    if "*.jsonl" in selected_filter:
+        file_format = FORMAT_JSONL
+    elif "*.parquet" in selected_filter and parquet_available():
+        file_format = FORMAT_PARQUET
+    else:
+        file_format = FORMAT_CSV
+    return file_format, f"{file_path}.{file_format}"
+
+
+class ExportJob:
+    """One export: where to write, which columns, and a lazy source of row dicts.
+
+    `columns` is a list of (name, kind) pairs where kind is "text" or "number".
+    Rows are pulled from `rows` one chunk at a time so the full export never
+    has to exist in memory. `csv_formatters` maps a column to a function used
+    only for CSV output and `footer` holds extra raw rows appended to CSV files.
+    """
+
+    def __init__(self, file_path, columns, rows, total=None, file_format=FORMAT_CSV,
+                 csv_formatters=None, footer=None):
+        self.file_path = file_path
+        self.columns = columns
+        self.fieldnames = [name for name, _ in columns]
+        self.rows = rows
+        self.total = total
+        self.file_format = file_format
+        self.csv_formatters = csv_formatters or {}
+        self.footer = footer or []
+
+    def chunks(self):
+        """Yield lists of at most CHUNK_SIZE rows"""
+        iterator = iter(self.rows)
+        while True:
+            chunk = list(islice(iterator, CHUNK_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
+    def format_csv_row(self, row):
+        if not self.csv_formatters:
+            return row
+        formatted = dict(row)
+        for name, formatter in self.csv_formatters.items():
+            formatted[name] = formatter(row.get(name))
+        return formatted
+
+
+def _write_csv(job, on_chunk):
+    with open(job.file_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=job.fieldnames)
+        writer.writeheader()
+        for chunk in job.chunks():
+            writer.writerows(job.format_csv_row(row) for row in chunk)
+            if not on_chunk(len(chunk)):
+                return False
+        if job.footer:
+            csv.writer(csvfile).writerows(job.footer)
+    return True
+
+
+def _write_jsonl(job, on_chunk):
+    with open(job.file_path, 'w', encoding='utf-8') as jsonfile:
+        for chunk in job.chunks():
+            jsonfile.write("".join(json.dumps(row, default=str) + "\n" for row in chunk))
+            if not on_chunk(len(chunk)):
+                return False
+    return True
+
+
+def _write_parquet(job, on_chunk):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (name, pa.float64() if kind == "number" else pa.string())
+        for name, kind in job.columns
+    ])
+    # Each chunk becomes its own row group, so only one chunk is held in memory at a time
+    with pq.ParquetWriter(job.file_path, schema) as writer:
+        for chunk in job.chunks():
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            if not on_chunk(len(chunk)):
+                return False
+    return True
+
+
+WRITERS = {
+    FORMAT_CSV: _write_csv,
+    FORMAT_JSONL: _write_jsonl,
+    FORMAT_PARQUET: _write_parquet,
+}
+
+
+class ExportWorker(QObject):
+    """Writes an ExportJob in a background thread"""
+    progress = Signal(int, int)  # (rows written, total rows or 0 if unknown)
+    finished = Signal(str)       # Path of the written file
+    error = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.written = 0
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Ask the worker to stop after the current chunk"""
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            completed = WRITERS[self.job.file_format](self.job, self._on_chunk_written)
+        except Exception as e:
+            print(f"Error exporting to {self.job.file_path}: {e}")
+            self._remove_partial_file()
+            self.error.emit(str(e))
+            return
+
+        if not completed:
+            self._remove_partial_file()
+            self.cancelled.emit()
+            return
+
+        self.finished.emit(self.job.file_path)
+
+    def _on_chunk_written(self, count):
+        self.written += count
+        self.progress.emit(self.written, self.job.total or 0)
+        return not self._cancel_requested
+
+    def _remove_partial_file(self):
+        try:
+            if os.path.exists(self.job.file_path):
+                os.remove(self.job.file_path)
+        except OSError as e:
+            print(f"Could not remove partial export {self.job.file_path}: {e}")
+
+
+class ExportService(QObject):
+    """Runs one export at a time off the UI thread and relays its progress"""
+    progress = Signal(int, int)
+    finished = Signal(str)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread = None
+        self.worker = None
+
+    def is_running(self):
+        return self.thread is not None
+
+    def start(self, job):
+        """Start writing the job in a worker thread, returns False if an export is already running"""
+        if self.is_running():
+            return False
+
+        self.thread = QThread()
+        self.worker = ExportWorker(job)
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.progress)
+        self.worker.finished.connect(self.finished)
+        self.worker.error.connect(self.failed)
+        self.worker.cancelled.connect(self.cancelled)
+        for signal in (self.worker.finished, self.worker.error, self.worker.cancelled):
+            signal.connect(self.thread.quit)
+        self.thread.finished.connect(self._cleanup_thread)
+
+        self.thread.start()
+        return True
+
+    def cancel(self):
+        """Cancel the running export (the partial file is removed)"""
+        if self.worker:
+            self.worker.cancel()
+
+    def _cleanup_thread(self):
+        self.worker.deleteLater()
+        self.thread.deleteLater()
+        self.worker = None
+        self.thread = None
+
+
+def _money(value):
+    return f"${value:.2f}" if value else ''
+
+
+def _number(value):
+    """Numpy scalar -> plain float, NaN -> None"""
+    if value is None or np.isnan(value):
+        return None
+    return float(value)
+
+
+def transaction_export_job(file_path, file_format, store, names=None, lots=None):
+    """Export job streaming the rows of a TransactionStore, with the realized P&L of
+    every sell when a LotsEngine replayed the same ledger"""
+    names = names or {}
+    # Hold on to the current columns so a refresh during the export can't mix two versions
+    transactions = store.transactions
+    timestamps = store.timestamps
+    raw_dates = store.raw_dates
+    symbols = store.symbols
+    quantities = store.quantities
+    prices = store.prices
+    totals = store.totals
+    realized = lots.trade_realized if lots is not None else None
+
+    def rows():
+        for row in range(len(symbols)):
+            symbol = symbols[row]
+            name = names.get(symbol, symbol)
+            record = {
+                'Date': format_transaction_date(timestamps[row], raw_dates[row], "%Y-%m-%d %H:%M:%S"),
+                'Type': transactions[row].get('transactionType', 'Unknown'),
+                'Symbol': symbol,
+                'Company': name if name != symbol else '',
+                'Quantity': _number(quantities[row]),
+                'Price': _number(prices[row]),
+                'Total': float(totals[row]) or None,
+                'Status': 'Completed'
+            }
+            if realized is not None:
+                record['Realized P&L'] = realized[row] if row < len(realized) else None
+            yield record
+
+    columns = [('Date', 'text'), ('Type', 'text'), ('Symbol', 'text'), ('Company', 'text'),
+               ('Quantity', 'number'), ('Price', 'number'), ('Total', 'number'), ('Status', 'text')]
+    csv_formatters = {
+        'Quantity': lambda value: '' if value is None else (int(value) if value.is_integer() else value),
+        'Price': _money,
+        'Total': _money
+    }
+    if realized is not None:
+        columns.append(('Realized P&L', 'number'))
+        csv_formatters['Realized P&L'] = lambda value: '' if value is None else f"{value:+.2f}"
+    return ExportJob(
+        file_path, columns, rows(), total=len(symbols), file_format=file_format,
+        csv_formatters=csv_formatters
+    )
+
+
+def portfolio_export_job(file_path, file_format, user_stocks, stocks_details, balance, lots=None):
+    """Export job streaming one row per holding, with the totals as a CSV footer.
+
+    With a LotsEngine that has open lots the rows are the open tax lots instead,
+    with their cost basis and unrealized P&L, and the footer adds the P&L totals.
+    """
+    user_stocks = list(user_stocks or [])
+    stocks_details = stocks_details or {}
+    balance = balance or 0
+    tax_lots = [lot for lot in lots.open_lots() if lot['symbol'] in stocks_details] if lots is not None else []
+
+    def prices(symbol):
+        stock_details = stocks_details[symbol]
+        current_price = stock_details.get('currentPrice', 0)
+        previous_price = stock_details.get('previousClose', current_price * 0.99)
+        daily_change = ((current_price - previous_price) / previous_price) * 100 if previous_price else 0
+        return stock_details, current_price, daily_change
+
+    def holding_rows():
+        for stock in user_stocks:
+            symbol = stock['stockSymbol']
+            if symbol not in stocks_details:
+                continue
+            quantity = stock['quantity']
+            stock_details, current_price, daily_change = prices(symbol)
+            yield {
+                "Symbol": symbol,
+                "Name": stock_details.get('name') or symbol_metadata.name(symbol),
+                "Quantity": quantity,
+                "Current Price ($)": current_price,
+                "Total Value ($)": current_price * quantity,
+                "Daily Change (%)": daily_change,
+                "Sector": stock_details.get('sector') or symbol_metadata.sector(symbol, 'N/A')
+            }
+
+    def lot_rows():
+        for lot in tax_lots:
+            symbol = lot['symbol']
+            quantity = lot['quantity']
+            stock_details, current_price, daily_change = prices(symbol)
+            yield {
+                "Symbol": symbol,
+                "Name": stock_details.get('name') or symbol_metadata.name(symbol),
+                "Acquired": (lot['date'] or '')[:10],
+                "Quantity": quantity,
+                "Cost Price ($)": lot['price'],
+                "Cost Basis ($)": lot['price'] * quantity,
+                "Current Price ($)": current_price,
+                "Total Value ($)": current_price * quantity,
+                "Unrealized P&L ($)": (current_price - lot['price']) * quantity,
+                "Daily Change (%)": daily_change,
+                "Sector": stock_details.get('sector') or symbol_metadata.sector(symbol, 'N/A')
+            }
+
+    columns = [("Symbol", "text"), ("Name", "text"), ("Quantity", "number"),
+               ("Current Price ($)", "number"), ("Total Value ($)", "number"),
+               ("Daily Change (%)", "number"), ("Sector", "text")]
+    two_decimals = lambda value: f"{value:.2f}"
+    csv_formatters = {
+        "Current Price ($)": two_decimals,
+        "Total Value ($)": two_decimals,
+        "Daily Change (%)": two_decimals
+    }
+
+    if tax_lots:
+        rows, total = lot_rows(), len(tax_lots)
+        total_portfolio_value = sum(stocks_details[lot['symbol']].get('currentPrice', 0) * lot['quantity']
+                                    for lot in tax_lots)
+        columns[2:2] = [("Acquired", "text")]
+        columns[4:4] = [("Cost Price ($)", "number"), ("Cost Basis ($)", "number")]
+        columns[8:8] = [("Unrealized P&L ($)", "number")]
+        for name in ("Cost Price ($)", "Cost Basis ($)", "Unrealized P&L ($)"):
+            csv_formatters[name] = two_decimals
+        csv_formatters["Quantity"] = lambda value: int(value) if float(value).is_integer() else value
+    else:
+        rows, total = holding_rows(), len(user_stocks)
+        total_portfolio_value = sum(
+            stocks_details[stock['stockSymbol']].get('currentPrice', 0) * stock['quantity']
+            for stock in user_stocks if stock['stockSymbol'] in stocks_details
+        )
+
+    # Footer rows put their amount under the "Total Value ($)" column
+    value_column = [name for name, _ in columns].index("Total Value ($)")
+
+    def footer_row(label, description, value):
+        row = [""] * len(columns)
+        row[0], row[1], row[value_column] = label, description, f"{value:.2f}"
+        return row
+
+    footer = [
+        [],  # Empty row for separation
+        footer_row("TOTAL", "", total_portfolio_value),
+        footer_row("CASH", "Cash Balance", balance),
+        footer_row("TOTAL ASSETS", "", total_portfolio_value + balance),
+    ]
+    if tax_lots:
+        cost_basis = sum(lot['price'] * lot['quantity'] for lot in tax_lots)
+        footer += [
+            [],
+            footer_row("UNREALIZED P&L", f"{lots.method.upper()} cost basis {cost_basis:.2f}",
+                       total_portfolio_value - cost_basis),
+            footer_row("REALIZED P&L", f"{lots.method.upper()} matched sells", lots.total_realized),
+        ]
+    footer += [
+        [],
+        [f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"]
+    ]
+
+    return ExportJob(
+        file_path, columns, rows, total=total, file_format=file_format,
+        csv_formatters=csv_formatters, footer=footer
+    )
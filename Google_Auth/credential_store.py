@@ -0,0 +1,131 @@
+# Google_Auth/credential_store.py
+import ctypes
+import json
+import os
+import sys
+
+from app_paths import data_path
+
+SERVICE_NAME = "StockMaster Google Sign-In"
+
+
+def _keyring():
+    """The keyring module, None if it isn't installed or has no usable backend"""
+    try:
+        import keyring
+        from keyring.backends import fail
+    except ImportError:
+        return None
+    if isinstance(keyring.get_keyring(), fail.Keyring):
+        return None
+    return keyring
+
+
+class _DataBlob(ctypes.Structure):
+    _fields_ = [("cbData", ctypes.c_ulong), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+
+def _dpapi(data, protect):
+    """Encrypt (or decrypt) bytes with the Windows user's DPAPI key"""
+    crypt32 = ctypes.windll.crypt32
+    buffer = ctypes.create_string_buffer(data, len(data))
+    blob_in = _DataBlob(len(data), buffer)
+    blob_out = _DataBlob()
+    call = crypt32.CryptProtectData if protect else crypt32.CryptUnprotectData
+    if not call(ctypes.byref(blob_in), None, None, None, None, 0, ctypes.byref(blob_out)):
+        raise OSError("DPAPI call failed")
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+
+class CredentialStore:
+    """Google refresh tokens kept between runs, one per OAuth client id.
+
+    They go to the OS keyring, or on Windows without a keyring backend to a
+    file in the app data folder encrypted with the user's DPAPI key. Anywhere
+    else the token isn't kept at all rather than written in the clear.
+    Nothing here raises: a token that can't be stored or read just means
+    the browser sign in.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+
+    def load(self, client_id):
+        """The stored refresh token, None if there is none"""
+        if not client_id:
+            return None
+        try:
+            keyring = _keyring()
+            if keyring is not None:
+                return keyring.get_password(SERVICE_NAME, client_id)
+            return self._read_file().get(client_id)
+        except Exception as e:
+            print(f"Couldn't read the saved Google credentials: {e}")
+            return None
+
+    def save(self, client_id, refresh_token):
+        if not client_id or not refresh_token:
+            return
+        try:
+            keyring = _keyring()
+            if keyring is not None:
+                keyring.set_password(SERVICE_NAME, client_id, refresh_token)
+                return
+            tokens = self._read_file()
+            tokens[client_id] = refresh_token
+            self._write_file(tokens)
+        except Exception as e:
+            print(f"Couldn't save the Google credentials: {e}")
+
+    def clear(self, client_id):
+        """Forget the client's token, the next sign in goes through the browser"""
+        if not client_id:
+            return
+        try:
+            keyring = _keyring()
+            if keyring is not None:
+                if keyring.get_password(SERVICE_NAME, client_id) is not None:
+                    keyring.delete_password(SERVICE_NAME, client_id)
+                return
+            tokens = self._read_file()
+            if tokens.pop(client_id, None) is not None:
+                self._write_file(tokens)
+        except Exception as e:
+            print(f"Couldn't clear the Google credentials: {e}")
+
+    def _file(self):
+        return self.path or data_path("google_credentials.bin")
+
+    def _read_file(self):
+        path = self._file()
+        if not os.path.exists(path):
+            return {}
+        if sys.platform != "win32":
+            # Not something we can decrypt (an unencrypted file from an older version), drop it
+            os.remove(path)
+            return {}
+        with open(path, "rb") as f:
+            data = _dpapi(f.read(), protect=False)
+        return json.loads(data.decode("utf-8"))
+
+    def _write_file(self, tokens):
+        if sys.platform != "win32":
+            print("No keyring available, the Google sign in won't be remembered")
+            return
+        path = self._file()
+        data = _dpapi(json.dumps(tokens).encode("utf-8"), protect=True)
+        # Written next to the old file and swapped in, so a crash can't leave half a file
+        temp_path = path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)  # A leftover would keep its old permissions
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+
+# One store for the app
+credential_store = CredentialStore()
@@ -1,9 +1,14 @@
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
 import os
 import json
 from PySide6.QtCore import QObject, Signal, QThread
 
+from Google_Auth.credential_store import credential_store
+
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+SCOPES = ["openid",
+          "https://www.googleapis.com/auth/userinfo.email",
+          "https://www.googleapis.com/auth/userinfo.profile"]
+
 class GoogleAuthThread(QThread):
     """Thread to run Google authentication without blocking the UI"""
     
@@ -17,6 +22,9 @@ class GoogleAuthThread(QThread):
         
     def run(self):
         try:
+            # Imported here, the OAuth libraries are slow to load and only needed for a Google sign in
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             # Create the flow
             flow = InstalledAppFlow.from_client_secrets_file(
                 self.client_secret_file,
@@ -39,16 +47,57 @@ class GoogleAuthThread(QThread):
             self.error = str(e)
 
 
+class GoogleRefreshThread(QThread):
+    """Thread that trades a saved refresh token for fresh credentials, one request and no browser"""
+
+    def __init__(self, client_id, client_secret, refresh_token, scopes):
+        super().__init__()
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = refresh_token
+        self.scopes = scopes
+        self.credentials = None
+        self.error = None
+        self.revoked = False  # Google refused the token (revoked or expired), it's no use anymore
+
+    def run(self):
+        try:
+            from google.auth.exceptions import RefreshError
+            from google.auth.transport.requests import Request
+            from google.oauth2.credentials import Credentials
+
+            credentials = Credentials(
+                None,
+                refresh_token=self.refresh_token,
+                token_uri=TOKEN_URI,
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                scopes=self.scopes
+            )
+            try:
+                credentials.refresh(Request())
+                self.credentials = credentials
+            except RefreshError as e:
+                print(f"Saved Google credentials were refused: {e}")
+                self.revoked = True
+                self.error = str(e)
+        except Exception as e:
+            print(f"Silent Google sign in failed: {e}")
+            self.error = str(e)
+
+
 class GoogleAuthService(QObject):
     """Service to handle Google OAuth authentication for desktop applications"""
     auth_success = Signal(str)  # Signal emitted on successful authentication with token
     auth_failure = Signal(str)  # Signal emitted on authentication failure with error message
     
-    def __init__(self, client_id, client_secret, parent=None):
+    def __init__(self, client_id, client_secret, parent=None, store=None):
         super().__init__(parent)
         self.client_id = client_id
         self.client_secret = client_secret
+        self.store = store if store is not None else credential_store
         self.auth_thread = None
+        self.refresh_thread = None
         
         # Create client_secret.json if it doesn't exist
         self._ensure_client_secret_file()
@@ -61,7 +110,7 @@ class GoogleAuthService(QObject):
                     "client_id": self.client_id,
                     "client_secret": self.client_secret,
                     "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token",
+                    "token_uri": TOKEN_URI,
                     "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
                     "redirect_uris": ["urn:ietf:wg:oauth:2.0:oob", "http://localhost"]
                 }
@@ -71,6 +120,44 @@ class GoogleAuthService(QObject):
                 json.dump(client_config, f)
     
     def start_auth_flow(self):
+        """Sign in with the saved refresh token if there is one, through the browser otherwise"""
+        if self.refresh_thread:
+            return  # A silent sign in is already on its way
+
+        refresh_token = self.store.load(self.client_id)
+        if not refresh_token:
+            self.start_browser_flow()
+            return
+
+        self.refresh_thread = GoogleRefreshThread(self.client_id, self.client_secret, refresh_token, SCOPES)
+        self.refresh_thread.finished.connect(self._on_refresh_thread_finished)
+        self.refresh_thread.start()
+
+    def forget_credentials(self):
+        """Drop the saved refresh token, e.g. when the backend didn't accept what it gave"""
+        self.store.clear(self.client_id)
+
+    def _on_refresh_thread_finished(self):
+        thread = self.refresh_thread
+        self.refresh_thread = None
+        if thread is None:
+            return
+        thread.deleteLater()
+
+        credentials = thread.credentials
+        if credentials is not None and (credentials.id_token or credentials.token):
+            # Google may rotate the refresh token
+            if credentials.refresh_token and credentials.refresh_token != thread.refresh_token:
+                self.store.save(self.client_id, credentials.refresh_token)
+            self._emit_credentials(credentials)
+            return
+
+        if thread.revoked:
+            self.forget_credentials()
+        # Offline or refused, the browser flow still works (or reports the real error)
+        self.start_browser_flow()
+
+    def start_browser_flow(self):
         """Begin the Google authentication flow with a shorter timeout"""
         # Cancel any existing auth thread
         if self.auth_thread:
@@ -82,11 +169,7 @@ class GoogleAuthService(QObject):
             self.auth_thread = None
         
         # Create and start the auth thread normally
-        scopes = ["openid", 
-                "https://www.googleapis.com/auth/userinfo.email",
-                "https://www.googleapis.com/auth/userinfo.profile"]
-        
-        self.auth_thread = GoogleAuthThread("client_secret.json", scopes)
+        self.auth_thread = GoogleAuthThread("client_secret.json", SCOPES)
         self.auth_thread.finished.connect(self._on_auth_thread_finished)
         self.auth_thread.start()
         
@@ -129,15 +212,20 @@ class GoogleAuthService(QObject):
         elif hasattr(self.auth_thread, 'credentials') and self.auth_thread.credentials:
             # Authentication succeeded
             credentials = self.auth_thread.credentials
-            if hasattr(credentials, 'id_token') and credentials.id_token:
-                self.auth_success.emit(credentials.id_token)
-            else:
-                # If no ID token is available, try to use the access token
-                self.auth_success.emit(credentials.token)
+            # Kept so the next sign in skips the browser
+            self.store.save(self.client_id, getattr(credentials, 'refresh_token', None))
+            self._emit_credentials(credentials)
         else:
             # Something unexpected happened
             self.auth_failure.emit("Authentication failed for unknown reasons")
         
         # Clean up
         self.auth_thread.deleteLater()
-        self.auth_thread = None
\ No newline at end of file
+        self.auth_thread = None
+
+    def _emit_credentials(self, credentials):
+        if hasattr(credentials, 'id_token') and credentials.id_token:
+            self.auth_success.emit(credentials.id_token)
+        else:
+            # If no ID token is available, try to use the access token
+            self.auth_success.emit(credentials.token)
@@ -5,8 +5,11 @@ class AiChatModel:
     def __init__(self, api_base_url="http://localhost:5000"):
         self.api_base_url = api_base_url
     
-    def send_message(self, message):
-        """Send a message to the AI API and get a response"""
+    def send_message(self, message, context=None):
+        """Send a message to the AI API and get a response, `context` adds fields to the request
+
+        When the API can't answer, the reply is a stand-in advice marked "failed" (so it isn't cached)
+        """
         print(f"Sending message to AI API: {message}")
         try:
             # API endpoint
@@ -18,7 +21,7 @@ class AiChatModel:
             # Send the request
             response = requests.post(
                 endpoint, 
-                json={"question": message}, 
+                json={"question": message, **(context or {})}, 
                 headers=headers,
                 timeout=30  # 30 second timeout
             )
@@ -40,6 +43,7 @@ class AiChatModel:
                     pass
                 
                 return {
+                    "failed": True,
                     "advice": "I'm having trouble connecting to the financial data service. " +
                              "Please try again later or contact support if the issue persists."
                 }
@@ -47,6 +51,7 @@ class AiChatModel:
         except requests.exceptions.Timeout:
             print("API request timed out")
             return {
+                "failed": True,
                 "advice": "The request is taking longer than expected. " +
                          "Our servers might be experiencing high load. Please try again shortly."
             }
@@ -54,6 +59,7 @@ class AiChatModel:
         except requests.exceptions.ConnectionError:
             print("API connection error")
             return {
+                "failed": True,
                 "advice": "I'm unable to connect to the financial data service. " +
                          "Please check your internet connection or try again later."
             }
@@ -61,6 +67,7 @@ class AiChatModel:
         except Exception as e:
             print(f"Unexpected error during API call: {str(e)}")
             return {
+                "failed": True,
                 "advice": "Sorry, I encountered an unexpected error while processing your request. " +
                          "Please try again or contact support if the issue persists."
             }
\ No newline at end of file
@@ -0,0 +1,91 @@
+# Model/Ai_chat/chat_history.py
+import sqlite3
+import time
+
+from app_paths import data_path
+
+PAGE_SIZE = 30  # Messages loaded when the advisor opens, and per scroll-up
+
+
+class ChatHistoryStore:
+    """AI advisor conversations kept in a local SQLite database.
+
+    A session is one conversation (clearing the chat starts a new one, the
+    old one stays on disk). Messages are indexed by (session, time) and read a
+    page at a time - the latest page when the advisor opens, then the page
+    before the oldest one shown - so opening the advisor costs the same
+    however long the history is.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._db = None
+
+    def _connection(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path or data_path("chat_history.sqlite3"))
+            self._db.row_factory = sqlite3.Row
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    started REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS sessions_by_user ON sessions (user_id, started);
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id INTEGER NOT NULL REFERENCES sessions (id),
+                    sender TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS messages_by_session ON messages (session_id, created, id);
+            """)
+        return self._db
+
+    def current_session(self, user_id):
+        """The user's latest session, a new one if they have none"""
+        row = self._connection().execute(
+            "SELECT id FROM sessions WHERE user_id = ? ORDER BY started DESC, id DESC LIMIT 1",
+            (user_id or "",)).fetchone()
+        return row["id"] if row else self.new_session(user_id)
+
+    def new_session(self, user_id):
+        db = self._connection()
+        with db:
+            cursor = db.execute("INSERT INTO sessions (user_id, started) VALUES (?, ?)",
+                                (user_id or "", time.time()))
+        return cursor.lastrowid
+
+    def add_message(self, session_id, sender, text, created=None):
+        """Store one message, returns it as the pages do"""
+        created = created or time.time()
+        db = self._connection()
+        with db:
+            cursor = db.execute("INSERT INTO messages (session_id, sender, text, created) VALUES (?, ?, ?, ?)",
+                                (session_id, sender, text, created))
+        return {"id": cursor.lastrowid, "sender": sender, "text": text, "created": created}
+
+    def latest_page(self, session_id, limit=PAGE_SIZE):
+        """The last `limit` messages of a session, oldest first"""
+        rows = self._connection().execute(
+            "SELECT id, sender, text, created FROM messages WHERE session_id = ? "
+            "ORDER BY created DESC, id DESC LIMIT ?", (session_id, limit)).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def page_before(self, session_id, message, limit=PAGE_SIZE):
+        """The `limit` messages right before `message` (a dict from a page), oldest first"""
+        rows = self._connection().execute(
+            "SELECT id, sender, text, created FROM messages WHERE session_id = ? "
+            "AND (created, id) < (?, ?) ORDER BY created DESC, id DESC LIMIT ?",
+            (session_id, message["created"], message["id"], limit)).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# One store for the app, the database is opened on first use
+chat_history = ChatHistoryStore()
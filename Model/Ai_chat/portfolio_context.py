@@ -0,0 +1,138 @@
+# Model/Ai_chat/portfolio_context.py
+import heapq
+
+from Model.Protofilio.positions_engine import PositionsEngine
+from Model.Transactions.transaction_store import EPOCH, parse_transaction_date
+
+MAX_HOLDINGS = 10  # Largest holdings listed one by one, the rest are summed up
+MAX_SECTORS = 8
+MAX_TRADES = 5
+
+
+def _money(value):
+    return round(float(value or 0))
+
+
+def _percent(value):
+    return round(float(value or 0), 1)
+
+
+def _cash(balance):
+    """The balance as a number ("$1,234.50" or 1234.5), None if it isn't one"""
+    if balance is None:
+        return None
+    try:
+        return float(str(balance).replace("$", "").replace(",", ""))
+    except ValueError:
+        return None
+
+
+class PortfolioContextBuilder:
+    """Compact summary of the user's portfolio sent along with every advisor question.
+
+    Holdings, sector allocation, P&L and the last few trades, so the RAG
+    service doesn't have to look the portfolio up itself. The holdings go
+    through a PositionsEngine, which only touches what changed between two
+    syncs, and the summary is rebuilt only when the positions' version, the
+    transaction list, the balance or the risk summary changed - otherwise the
+    same dict is returned. Its size is bounded: at most MAX_HOLDINGS holdings,
+    MAX_SECTORS sectors and MAX_TRADES trades, with money rounded to dollars.
+    """
+
+    def __init__(self, positions=None):
+        self.positions = positions if positions is not None else PositionsEngine()
+        self._transactions_source = None
+        self._recent_trades = []
+        self._key = None
+        self._context = None
+
+    def build(self, user_stocks, stocks_details, transactions=None, balance=None, risk_summary=None):
+        """The context fields for the current data (the cached dict when nothing changed)"""
+        if user_stocks is None:
+            # Holdings not loaded yet - better no portfolio than an empty one
+            return {"portfolioRisk": risk_summary} if risk_summary else {}
+
+        self.positions.sync(user_stocks, stocks_details)
+        if transactions is not self._transactions_source:
+            self._recent_trades = self._summarize_trades(transactions or [])
+            self._transactions_source = transactions
+
+        key = (self.positions.version, id(self._transactions_source), balance, risk_summary)
+        if key == self._key:
+            return self._context
+
+        portfolio = self._summarize_positions()
+        portfolio["recentTrades"] = self._recent_trades
+        cash = _cash(balance)
+        if cash is not None:
+            portfolio["cash"] = _money(cash)
+
+        context = {"portfolio": portfolio}
+        if risk_summary:
+            context["portfolioRisk"] = risk_summary
+        self._key = key
+        self._context = context
+        return context
+
+    def _summarize_positions(self):
+        positions = self.positions
+        holdings = positions.holdings()
+        largest = heapq.nlargest(MAX_HOLDINGS, holdings,
+                                 key=lambda position: position['quantity'] * position['price'])
+        total_value = positions.total_value
+        unrealized = total_value - sum(position['cost'] for position in holdings)
+
+        summary = {
+            "totalValue": _money(total_value),
+            "dailyChange": _money(positions.daily_change),
+            "dailyChangePercent": _percent(positions.daily_change_percent),
+            "unrealizedPnl": _money(unrealized),
+            "unrealizedPnlPercent": _percent(unrealized / (total_value - unrealized) * 100
+                                             if total_value - unrealized > 0 else 0),
+            "holdingCount": len(holdings),
+            "holdings": [self._summarize_holding(position, total_value) for position in largest],
+        }
+        if len(holdings) > len(largest):
+            listed = sum(position['quantity'] * position['price'] for position in largest)
+            summary["otherHoldingsValue"] = _money(total_value - listed)
+
+        allocation = sorted(positions.allocation().items(), key=lambda item: item[1], reverse=True)
+        summary["allocation"] = {sector: _percent(percent) for sector, percent in allocation[:MAX_SECTORS]}
+        return summary
+
+    @staticmethod
+    def _summarize_holding(position, total_value):
+        value = position['quantity'] * position['price']
+        return {
+            "symbol": position['symbol'],
+            "shares": round(position['quantity'], 4),
+            "price": round(position['price'], 2),
+            "value": _money(value),
+            "weight": _percent(value / total_value * 100 if total_value > 0 else 0),
+            "pnl": _money(value - position['cost']),
+            "dayChangePercent": _percent(position['change_percent']),
+            "sector": position['sector'],
+        }
+
+    @staticmethod
+    def _summarize_trades(transactions):
+        """The latest MAX_TRADES transactions, newest first"""
+        dated = []
+        for tx in transactions:
+            tx_date = parse_transaction_date(tx.get('date'))
+            if tx_date is not None:
+                dated.append(((tx_date - EPOCH).total_seconds(), tx_date, tx))
+
+        trades = []
+        for _, tx_date, tx in heapq.nlargest(MAX_TRADES, dated, key=lambda item: item[0]):
+            trade = {
+                "date": tx_date.strftime("%Y-%m-%d"),
+                "type": (tx.get('transactionType') or '').lower(),
+                "symbol": tx.get('stockSymbol') or '',
+            }
+            if tx.get('quantity') is not None:
+                trade["shares"] = tx['quantity']
+            if tx.get('price') is not None:
+                trade["price"] = round(float(tx['price']), 2)
+            trades.append(trade)
+        return trades
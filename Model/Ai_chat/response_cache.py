@@ -0,0 +1,70 @@
+# Model/Ai_chat/response_cache.py
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_question(question):
+    """The question with case, punctuation and spacing evened out, so rephrasing those still matches"""
+    text = unicodedata.normalize("NFKC", question or "").casefold()
+    text = re.sub(r"['\u2019]", "", text)  # what's -> whats
+    text = re.sub(r"[^\w\s$%]", " ", text)
+    return " ".join(text.split())
+
+
+def context_fingerprint(context):
+    """Short hash of the portfolio context a question is sent with"""
+    payload = json.dumps(context or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Advisor answers keyed by (normalized question, portfolio context fingerprint).
+
+    Asking the same thing again about the same portfolio is answered from
+    here instead of another round-trip to the RAG endpoint. Answers expire
+    after `ttl` seconds (the market moves on) and the least recently used
+    ones are dropped once there are more than `max_entries`.
+    """
+
+    def __init__(self, ttl=30 * 60, max_entries=64):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored at, response)
+
+    @staticmethod
+    def key(question, context=None):
+        return normalize_question(question), context_fingerprint(context)
+
+    def get(self, question, context=None):
+        """The cached answer, None on a miss or if it expired"""
+        key = self.key(question, context)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, question, context, response):
+        key = self.key(question, context)
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# One cache for every advisor window
+response_cache = ResponseCache()
@@ -1,5 +1,6 @@
 # Model/Dashboard/dashboard_model.py
 import requests
+from datetime import date
 class DashboardModel:
     """Model for dashboard data handling"""
     
@@ -65,4 +66,44 @@ class DashboardModel:
             print(f"Exception during API request: {str(e)}")
             return None
         
-    
\ No newline at end of file
+    
+
+    def get_stock_history(self, symbol):
+        """Daily history of one symbol since the start of the year (drives the portfolio card's graph)"""
+        now = date.today().strftime("%Y-%m-%d")
+        try:
+            response = requests.get(f"http://localhost:5000/api/stocks-query/history?ticker={symbol}&startDate=1-1-2025&endDate={now}")
+            if response.status_code == 200:
+                return response.json()
+            else:
+                print(f"Failed to get stock history. Status code: {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"Error fetching stock history: {str(e)}")
+            return None
+
+    def get_ai_advice(self):
+        """Daily advice for the AI insights card"""
+        try:
+            response = requests.get("http://localhost:5000/api/rag/daily-advice")
+            if response.status_code == 200:
+                return response.json()
+            else:
+                print(f"Error fetching daily advice: {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"Exception during API request: {str(e)}")
+            return None
+
+    def get_balance(self, user_id):
+        """User's cash balance"""
+        try:
+            response = requests.get("http://localhost:5000/api/user-query/balance/" + user_id)
+            if response.status_code == 200:
+                return response.json()["balance"]
+            else:
+                print("Failed to get balance" + response.text)
+                return None
+        except Exception as e:
+            print(f"API request error: {e}")
+            return None
@@ -0,0 +1,196 @@
+# Model/Protofilio/lots_engine.py
+from collections import deque
+
+from Model.Protofilio.performance_engine import trade_key
+from Model.Transactions.transaction_store import EPOCH, parse_transaction_date
+
+FIFO = "fifo"
+LIFO = "lifo"
+SPECIFIC = "specific"
+METHODS = (FIFO, LIFO, SPECIFIC)
+
+
+def _timestamp(transaction):
+    """Seconds since EPOCH of a transaction, None if the date can't be parsed"""
+    parsed = parse_transaction_date(transaction.get('date') or '')
+    return None if parsed is None else (parsed - EPOCH).total_seconds()
+
+
+def _trade_price(transaction, quantity):
+    price = transaction.get('price')
+    if price is None and quantity:
+        price = (transaction.get('amount') or 0) / quantity
+    return float(price or 0)
+
+
+class LotsEngine:
+    """Open tax lots and realized P&L per symbol, replayed from the transaction ledger.
+
+    Every buy opens a lot, every sell closes shares out of the open lots of its
+    symbol - oldest first (FIFO), newest first (LIFO), or the lots the sell names
+    in 'lotIds' (SPECIFIC, falling back to FIFO for the rest). Open quantity, open
+    cost and realized P&L are running sums, so a trade newer than the ones already
+    applied only touches its own symbol; the full replay is only needed when an
+    older trade shows up or the ledger was edited.
+
+    A lot id is the transaction's 'id' if it has one, otherwise its position in
+    the ledger.
+    """
+
+    def __init__(self, method=FIFO):
+        if method not in METHODS:
+            raise ValueError(f"Unknown lot matching method: {method}")
+        self.method = method
+        self.version = 0
+        self._reset()
+
+    def _reset(self):
+        self.lots = {}            # symbol -> deque of open lots, oldest first
+        self.open_quantity = {}
+        self.open_cost = {}
+        self.realized = {}        # symbol -> realized P&L
+        self.total_realized = 0.0
+        self.total_open_cost = 0.0
+        self.trade_realized = []  # Realized P&L of every ledger entry (None if it isn't a sell)
+        self._ledger = []
+        self._ledger_keys = []
+        self._last_timestamp = None
+
+    def set_method(self, method):
+        """Switch the matching method and replay the ledger with it"""
+        if method not in METHODS:
+            raise ValueError(f"Unknown lot matching method: {method}")
+        if method != self.method:
+            self.method = method
+            self.set_ledger(self._ledger)
+
+    # Ledger
+
+    def set_ledger(self, transactions):
+        """Replay the whole ledger in date order (ledger order for trades on the same time)"""
+        transactions = list(transactions or [])
+        self._reset()
+        self._ledger = transactions
+        self._ledger_keys = [trade_key(transaction) for transaction in transactions]
+        self.trade_realized = [None] * len(transactions)
+
+        # Undated trades keep their place in the ledger
+        timestamps = []
+        previous = float("-inf")
+        for transaction in transactions:
+            timestamp = _timestamp(transaction)
+            previous = previous if timestamp is None else timestamp
+            timestamps.append(previous)
+
+        for index in sorted(range(len(transactions)), key=lambda i: (timestamps[i], i)):
+            self.trade_realized[index] = self._apply(index, transactions[index])
+        if transactions:
+            self._last_timestamp = max(timestamps)
+        self.version += 1
+
+    def sync_ledger(self, transactions):
+        """Apply a freshly fetched ledger, only adding the new trades when the old ones are unchanged"""
+        transactions = transactions or []
+        known = len(self._ledger_keys)
+        keys = [trade_key(transaction) for transaction in transactions[:known]]
+        if len(transactions) < known or keys != self._ledger_keys:
+            self.set_ledger(transactions)
+            return
+        for transaction in transactions[known:]:
+            self.add_trade(transaction)
+
+    def add_trade(self, transaction):
+        """Apply one new transaction; one dated before the last applied trade replays the ledger"""
+        timestamp = _timestamp(transaction)
+        if timestamp is not None and self._last_timestamp is not None and timestamp < self._last_timestamp:
+            self.set_ledger(self._ledger + [transaction])
+            return
+
+        index = len(self._ledger)
+        self._ledger.append(transaction)
+        self._ledger_keys.append(trade_key(transaction))
+        self.trade_realized.append(self._apply(index, transaction))
+        if timestamp is not None:
+            self._last_timestamp = timestamp
+        self.version += 1
+
+    # Matching
+
+    def _apply(self, index, transaction):
+        """Open or close lots for one transaction, returns the realized P&L of a sell"""
+        symbol = transaction.get('stockSymbol')
+        quantity = float(transaction.get('quantity') or 0)
+        tx_type = (transaction.get('transactionType') or '').lower()
+        if not symbol or quantity <= 0 or tx_type not in ('buy', 'sell'):
+            return None
+
+        price = _trade_price(transaction, quantity)
+        if tx_type == 'buy':
+            self.lots.setdefault(symbol, deque()).append({
+                'id': transaction.get('id', index),
+                'symbol': symbol,
+                'date': transaction.get('date'),
+                'quantity': quantity,
+                'price': price,
+            })
+            self.open_quantity[symbol] = self.open_quantity.get(symbol, 0.0) + quantity
+            self._add_cost(symbol, quantity * price)
+            return None
+
+        realized = 0.0
+        remaining = quantity
+        lots = self.lots.get(symbol, deque())
+        for lot in self._lots_to_close(lots, transaction):
+            if remaining <= 0:
+                break
+            closed = min(remaining, lot['quantity'])
+            lot['quantity'] -= closed
+            remaining -= closed
+            realized += closed * (price - lot['price'])
+            self.open_quantity[symbol] -= closed
+            self._add_cost(symbol, -closed * lot['price'])
+
+        if remaining > 1e-9:
+            print(f"Sell of {quantity} {symbol} is {remaining} shares more than the open lots")
+        # Drop the closed lots (and the float dust of partially closed ones)
+        self.lots[symbol] = deque(lot for lot in lots if lot['quantity'] > 1e-9)
+
+        self.realized[symbol] = self.realized.get(symbol, 0.0) + realized
+        self.total_realized += realized
+        return realized
+
+    def _lots_to_close(self, lots, transaction):
+        """Open lots in the order a sell should close them"""
+        if self.method == LIFO:
+            return list(reversed(lots))
+        if self.method == SPECIFIC and transaction.get('lotIds'):
+            wanted = list(transaction['lotIds'])
+            named = sorted((lot for lot in lots if lot['id'] in wanted), key=lambda lot: wanted.index(lot['id']))
+            return named + [lot for lot in lots if lot['id'] not in wanted]
+        return list(lots)
+
+    def _add_cost(self, symbol, cost):
+        self.open_cost[symbol] = self.open_cost.get(symbol, 0.0) + cost
+        self.total_open_cost += cost
+
+    # Outputs
+
+    def open_lots(self, symbol=None):
+        """Open lots of one symbol, or of every symbol"""
+        if symbol is not None:
+            return list(self.lots.get(symbol, ()))
+        return [lot for lots in self.lots.values() for lot in lots]
+
+    def unrealized(self, symbol, price):
+        """Unrealized P&L of a symbol's open lots at `price`"""
+        return self.open_quantity.get(symbol, 0.0) * price - self.open_cost.get(symbol, 0.0)
+
+    def summary(self, prices):
+        """(open cost, unrealized P&L) over the symbols that have a price in `prices`"""
+        cost = 0.0
+        unrealized = 0.0
+        for symbol, price in prices.items():
+            if self.open_quantity.get(symbol, 0) > 1e-9:
+                cost += self.open_cost[symbol]
+                unrealized += self.unrealized(symbol, price)
+        return cost, unrealized
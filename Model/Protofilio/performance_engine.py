@@ -0,0 +1,347 @@
+# Model/Protofilio/performance_engine.py
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from Model.Transactions.transaction_store import EPOCH, parse_transaction_date
+
+SECONDS_PER_DAY = 86400
+PERIODS = ["1D", "1W", "1M", "3M", "YTD", "1Y", "All"]
+PERIOD_DAYS = {"1W": 7, "1M": 30, "3M": 91, "1Y": 365}
+
+
+def day_number(value):
+    """Days since EPOCH for an API date string (or a day number), None if it can't be parsed"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    parsed = parse_transaction_date(value) if isinstance(value, str) else value
+    if parsed is None:
+        return None
+    return int((parsed - EPOCH).total_seconds() // SECONDS_PER_DAY)
+
+
+def trade_key(transaction):
+    """What identifies a ledger entry when checking that a refetched ledger only grew"""
+    return (transaction.get('date'), transaction.get('transactionType'),
+            transaction.get('stockSymbol'), transaction.get('quantity'))
+
+
+def signed_quantity(transaction):
+    """Shares added to the position by a transaction (negative for sells)"""
+    quantity = transaction.get('quantity') or 0
+    tx_type = (transaction.get('transactionType') or '').lower()
+    if tx_type == 'buy':
+        return quantity
+    if tx_type == 'sell':
+        return -quantity
+    return 0
+
+
+class PerformanceEngine:
+    """Daily portfolio value rebuilt from the transaction ledger and per-symbol price history.
+
+    Prices and positions are kept as (day x symbol) matrices over the union of
+    all bar dates. Prices are forward filled over days a symbol has no bar,
+    positions are the cumulative sum of the trades, and the value of every day
+    is one row-wise dot product. All periods are slices of that one series.
+    A new trade only touches its symbol's column from the trade day on, and a
+    bar newer than the last day appends a single row.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.history_version = 0  # Only bumped by price changes, trades don't touch it
+        self.histories = {}  # symbol -> (day numbers, closes), sorted by day
+        self._history_sources = {}  # symbol -> the bar list last synced, to skip an unchanged one
+        self.trades = []     # (day number, symbol, signed quantity)
+        self._ledger_keys = []
+        self.symbols = []
+        self._columns = {}
+        self._size = 0
+        self._days = np.zeros(0, dtype=np.int64)
+        self._prices = np.zeros((0, 0))
+        self._positions = np.zeros((0, 0))
+        self._values = np.zeros(0)
+        self._late_trades = []  # Trades newer than the last bar, shown on the last row for now
+        self._dirty = False
+
+    # Inputs
+
+    def set_price_history(self, symbol, history):
+        """Replace the bars of a symbol ([{'date': ..., 'close': ...}, ...] as the API sends them)"""
+        days = []
+        closes = []
+        for bar in history or []:
+            day = day_number(bar.get('date'))
+            close = bar.get('close')
+            if day is None or close is None:
+                continue
+            days.append(day)
+            closes.append(float(close))
+
+        days = np.asarray(days, dtype=np.int64)
+        closes = np.asarray(closes, dtype=float)
+        order = np.argsort(days, kind="stable")
+        self.histories[symbol] = (days[order], closes[order])
+        self.history_version += 1
+        self._dirty = True
+
+    def set_ledger(self, transactions):
+        """Replace the trade ledger"""
+        self.trades = []
+        self._ledger_keys = []
+        for transaction in transactions or []:
+            self._record_trade(transaction)
+        self._dirty = True
+
+    def sync_ledger(self, transactions):
+        """Apply a freshly fetched ledger, only adding the new trades when the old ones are unchanged"""
+        transactions = transactions or []
+        known = len(self._ledger_keys)
+        keys = [trade_key(transaction) for transaction in transactions[:known]]
+        if len(transactions) < known or keys != self._ledger_keys:
+            self.set_ledger(transactions)
+            return
+        for transaction in transactions[known:]:
+            self.add_trade(transaction)
+
+    def _record_trade(self, transaction):
+        """Add a transaction to the ledger, returns the stored trade or None if it is not a trade"""
+        self._ledger_keys.append(trade_key(transaction))
+        day = day_number(transaction.get('date'))
+        quantity = signed_quantity(transaction)
+        symbol = transaction.get('stockSymbol')
+        if day is None or not quantity or not symbol:
+            return None
+        trade = (day, symbol, quantity)
+        self.trades.append(trade)
+        return trade
+
+    # Incremental updates
+
+    def add_trade(self, transaction):
+        """Apply one new transaction without rebuilding the matrices"""
+        trade = self._record_trade(transaction)
+        if trade is None or self._dirty:
+            return
+        day, symbol, quantity = trade
+        column = self._columns.get(symbol)
+        if column is None or not self._size:
+            # No price history for the symbol yet, it can't change the value
+            return
+
+        # Everything from the trade day on holds `quantity` more shares
+        row = max(0, int(np.searchsorted(self.days, day, side="right")) - 1)
+        if day > self.days[-1]:
+            self._late_trades.append((day, column, quantity))
+        self._positions[row:self._size, column] += quantity
+        self._values[row:self._size] += quantity * self._prices[row:self._size, column]
+        self.version += 1
+
+    def add_bar(self, symbol, date, close):
+        """Apply one new daily close; a bar newer than every other day appends a single row"""
+        day = day_number(date)
+        if day is None:
+            return
+        close = float(close)
+        self.history_version += 1
+
+        days, closes = self.histories.get(symbol, (np.zeros(0, dtype=np.int64), np.zeros(0)))
+        if len(days) and day == days[-1]:
+            # The latest close moved (today's bar): it's forward filled up to the last row
+            closes = closes.copy()
+            closes[-1] = close
+            self.histories[symbol] = (days, closes)
+            column = self._columns.get(symbol)
+            if self._dirty or column is None:
+                self._dirty = True
+                return
+            row = int(np.searchsorted(self.days, day))
+            self._prices[row:self._size, column] = close
+            self._values[row:self._size] = np.einsum("ij,ij->i", self._positions[row:self._size],
+                                                     self._prices[row:self._size])
+            self.version += 1
+            return
+
+        if len(days) and day < days[-1]:
+            # A correction of an old bar: simplest to rebuild from the histories
+            position = int(np.searchsorted(days, day))
+            if position < len(days) and days[position] == day:
+                closes = closes.copy()
+                closes[position] = close
+            else:
+                days = np.insert(days, position, day)
+                closes = np.insert(closes, position, close)
+            self.histories[symbol] = (days, closes)
+            self._dirty = True
+            return
+
+        self.histories[symbol] = (np.append(days, day), np.append(closes, close))
+        column = self._columns.get(symbol)
+        if self._dirty or column is None:
+            self._dirty = True
+            return
+
+        if self._size and day == self.days[-1]:
+            last = self._size - 1
+        elif not self._size or day > self.days[-1]:
+            last = self._append_row(day)
+        else:
+            # Another symbol already has later bars, the forward fill changes
+            self._dirty = True
+            return
+
+        self._prices[last, column] = close
+        self._values[last] = self._positions[last] @ self._prices[last]
+        self.version += 1
+
+    def sync_price_history(self, symbol, history):
+        """Apply a refetched history: bars past the known ones go through add_bar, no rebuild"""
+        if self._history_sources.get(symbol) is history:
+            return
+        self._history_sources[symbol] = history
+        if symbol not in self.histories:
+            self.set_price_history(symbol, history)
+            return
+        days, closes = self.histories[symbol]
+        bars = []
+        for bar in history or []:
+            day = day_number(bar.get('date'))
+            if day is not None and bar.get('close') is not None:
+                bars.append((day, float(bar['close'])))
+        bars.sort(key=lambda bar: bar[0])
+
+        if not len(days):
+            self.set_price_history(symbol, history)
+            return
+        known = sum(1 for day, _ in bars if day < days[-1])
+        if known != len(days) - 1:
+            # Older bars were added or dropped, not just new ones
+            self.set_price_history(symbol, history)
+            return
+        for day, close in bars[known:]:
+            if day == days[-1] and close == closes[-1]:
+                continue
+            self.add_bar(symbol, day, close)
+
+    def _append_row(self, day):
+        """Add a day that carries the previous prices and positions forward, returns its row"""
+        if self._size == len(self._days):
+            # Grow the buffers geometrically so appending a bar stays amortized O(symbols)
+            capacity = max(16, 2 * len(self._days))
+            self._days = np.resize(self._days, capacity)
+            self._prices = self._grow(self._prices, capacity)
+            self._positions = self._grow(self._positions, capacity)
+            self._values = np.resize(self._values, capacity)
+
+        row = self._size
+        self._days[row] = day
+        if row:
+            self._prices[row] = self._prices[row - 1]
+            self._positions[row] = self._positions[row - 1]
+            # Trades made on or after the new day belong to it, not to the previous row
+            for trade_day, column, quantity in self._late_trades:
+                if trade_day >= day:
+                    self._positions[row - 1, column] -= quantity
+                    self._values[row - 1] -= quantity * self._prices[row - 1, column]
+            self._late_trades = [trade for trade in self._late_trades if trade[0] > day]
+        else:
+            self._prices[row] = 0
+            self._positions[row] = 0
+        self._values[row] = self._positions[row] @ self._prices[row]
+        self._size += 1
+        return row
+
+    @staticmethod
+    def _grow(matrix, capacity):
+        grown = np.zeros((capacity, matrix.shape[1]))
+        grown[:len(matrix)] = matrix
+        return grown
+
+    # Full build
+
+    def rebuild(self):
+        """Recompute the price, position and value arrays from the histories and the ledger"""
+        self.symbols = sorted(symbol for symbol, (days, _) in self.histories.items() if len(days))
+        self._columns = {symbol: column for column, symbol in enumerate(self.symbols)}
+
+        if self.symbols:
+            days = np.unique(np.concatenate([self.histories[symbol][0] for symbol in self.symbols]))
+        else:
+            days = np.zeros(0, dtype=np.int64)
+        day_count, symbol_count = len(days), len(self.symbols)
+
+        # Scatter every bar into its (day, symbol) cell, then forward fill each column
+        prices = np.full((day_count, symbol_count), np.nan)
+        for column, symbol in enumerate(self.symbols):
+            bar_days, closes = self.histories[symbol]
+            prices[np.searchsorted(days, bar_days), column] = closes
+        if day_count:
+            last_seen = np.where(np.isnan(prices), 0, np.arange(day_count)[:, None])
+            np.maximum.accumulate(last_seen, axis=0, out=last_seen)
+            prices = prices[last_seen, np.arange(symbol_count)]
+        prices = np.nan_to_num(prices)  # No bar yet -> the holding can't be valued
+
+        # Trades land on the last bar day not after them (earlier trades on the first day)
+        positions = np.zeros((day_count, symbol_count))
+        trades = [trade for trade in self.trades if trade[1] in self._columns]
+        if trades and day_count:
+            trade_days = np.array([trade[0] for trade in trades], dtype=np.int64)
+            rows = np.maximum(np.searchsorted(days, trade_days, side="right") - 1, 0)
+            columns = np.array([self._columns[trade[1]] for trade in trades], dtype=np.intp)
+            np.add.at(positions, (rows, columns), [trade[2] for trade in trades])
+            np.cumsum(positions, axis=0, out=positions)
+
+        self._days = days
+        self._prices = prices
+        self._positions = positions
+        self._values = np.einsum("ij,ij->i", positions, prices)
+        self._size = day_count
+        self._late_trades = [(trade[0], self._columns[trade[1]], trade[2]) for trade in trades
+                             if day_count and trade[0] > days[-1]]
+        self._dirty = False
+        self.version += 1
+
+    def _ensure_built(self):
+        if self._dirty:
+            self.rebuild()
+
+    # Outputs
+
+    @property
+    def days(self):
+        self._ensure_built()
+        return self._days[:self._size]
+
+    @property
+    def prices(self):
+        """(day x symbol) closes, forward filled, columns in the order of `symbols`"""
+        self._ensure_built()
+        return self._prices[:self._size]
+
+    @property
+    def values(self):
+        self._ensure_built()
+        return self._values[:self._size]
+
+    def period_start(self, period):
+        """Index of the first day in a period"""
+        self._ensure_built()
+        days = self.days
+        if not len(days) or period == "All":
+            return 0
+        if period == "1D":
+            return max(0, len(days) - 2)  # Daily bars: the last close against the one before
+        if period == "YTD":
+            year_start = day_number(datetime((EPOCH + timedelta(days=int(days[-1]))).year, 1, 1))
+            return int(np.searchsorted(days, year_start))
+        return int(np.searchsorted(days, days[-1] - PERIOD_DAYS[period]))
+
+    def series(self, period):
+        """(day numbers, values) of a period - views into the full series, nothing is copied"""
+        start = self.period_start(period)
+        return self.days[start:], self.values[start:]
+
+    def all_series(self):
+        """Every period from the one value series"""
+        return {period: self.series(period) for period in PERIODS}
@@ -0,0 +1,175 @@
+# Model/Protofilio/positions_engine.py
+from Model.Stocks.symbol_metadata import symbol_metadata
+
+
+class PositionsEngine:
+    """Holdings aggregated per symbol with the portfolio totals kept up to date.
+
+    The API sends one entry per lot ({'stockSymbol', 'quantity', 'price'}) and a
+    details dict per symbol ({'currentPrice', 'previousClose', 'sector', ...}).
+    Lots are summed per symbol once, and total value, previous close value, cost
+    basis and per-sector value are running sums: a price tick or a trade removes
+    the symbol's old contribution and adds the new one, so it costs O(1) no
+    matter how many holdings there are.
+    """
+
+    def __init__(self):
+        self.positions = {}  # symbol -> position dict, in the order the symbols first appeared
+        self.total_value = 0.0
+        self.previous_value = 0.0
+        self.total_cost = 0.0
+        self.sector_values = {}
+        self.version = 0
+        self._stocks_source = None
+        self._details_source = None
+
+    # Derived figures
+
+    @property
+    def daily_change(self):
+        return self.total_value - self.previous_value
+
+    @property
+    def daily_change_percent(self):
+        return (self.daily_change / self.total_value * 100) if self.total_value > 0 else 0
+
+    def allocation(self):
+        """Percentage of the valued holdings per sector"""
+        if self.total_value <= 0:
+            return {}
+        return {sector: value / self.total_value * 100
+                for sector, value in self.sector_values.items() if value > 1e-9}
+
+    def holdings(self):
+        """Priced positions with their current figures, one per symbol"""
+        return [position for position in self.positions.values()
+                if position['priced'] and position['quantity']]
+
+    # Updates
+
+    def sync(self, user_stocks, stocks_details):
+        """Bring the engine in line with the lists the API returned, touching only what changed"""
+        if user_stocks is self._stocks_source and stocks_details is self._details_source:
+            return
+
+        if user_stocks is not self._stocks_source:
+            self._sync_lots(user_stocks or [])
+            self._stocks_source = user_stocks
+
+        # Unchanged symbols cost a comparison, only changed prices touch the totals
+        details = stocks_details or {}
+        for symbol, position in self.positions.items():
+            if symbol in details:
+                self.update_details(symbol, details[symbol])
+            elif position['priced']:
+                # No details anymore - like before, the holding is left out of the value
+                self.set_priced(symbol, False)
+        self._details_source = stocks_details
+
+    def invalidate_details(self):
+        """Re-apply the details on the next sync (e.g. after the symbol metadata changed)"""
+        self._details_source = None
+
+    def _sync_lots(self, user_stocks):
+        """Sum the lots per symbol and apply the differences as trades"""
+        totals = {}
+        for stock in user_stocks:
+            symbol = stock.get('stockSymbol')
+            if not symbol:
+                continue
+            quantity = float(stock.get('quantity', 0) or 0)
+            cost = float(stock.get('price', 0) or 0) * quantity
+            held_quantity, held_cost = totals.get(symbol, (0.0, 0.0))
+            totals[symbol] = (held_quantity + quantity, held_cost + cost)
+
+        for symbol in [symbol for symbol in self.positions if symbol not in totals]:
+            self.set_position(symbol, 0, 0)
+            del self.positions[symbol]
+        for symbol, (quantity, cost) in totals.items():
+            position = self.positions.get(symbol)
+            if position is None or position['quantity'] != quantity or position['cost'] != cost:
+                self.set_position(symbol, quantity, cost)
+
+    def _position(self, symbol):
+        position = self.positions.get(symbol)
+        if position is None:
+            position = {
+                'symbol': symbol, 'name': symbol, 'sector': 'Other',
+                'quantity': 0.0, 'cost': 0.0, 'price': 0.0, 'previous_close': 0.0,
+                'change_percent': 0.0, 'priced': False,
+            }
+            self.positions[symbol] = position
+        return position
+
+    def _remove_contribution(self, position):
+        self.total_cost -= position['cost']
+        if position['priced']:
+            value = position['quantity'] * position['price']
+            self.total_value -= value
+            self.previous_value -= position['quantity'] * position['previous_close']
+            self.sector_values[position['sector']] = self.sector_values.get(position['sector'], 0) - value
+
+    def _add_contribution(self, position):
+        self.total_cost += position['cost']
+        if position['priced']:
+            value = position['quantity'] * position['price']
+            self.total_value += value
+            self.previous_value += position['quantity'] * position['previous_close']
+            self.sector_values[position['sector']] = self.sector_values.get(position['sector'], 0) + value
+        self.version += 1
+
+    def set_position(self, symbol, quantity, cost):
+        """Set the shares held and what they cost in total"""
+        position = self._position(symbol)
+        self._remove_contribution(position)
+        position['quantity'] = quantity
+        position['cost'] = cost
+        self._add_contribution(position)
+
+    def apply_trade(self, symbol, quantity, price=None):
+        """Buy (positive quantity) or sell (negative) shares; sells take out the average cost"""
+        position = self._position(symbol)
+        if quantity >= 0:
+            cost = position['cost'] + quantity * (price if price is not None else position['price'])
+        elif position['quantity']:
+            cost = position['cost'] * (position['quantity'] + quantity) / position['quantity']
+        else:
+            cost = 0
+        self.set_position(symbol, position['quantity'] + quantity, cost)
+
+    def update_price(self, symbol, price, previous_close=None):
+        """Price tick for one symbol"""
+        position = self._position(symbol)
+        if previous_close is None:
+            previous_close = position['previous_close'] if position['priced'] else price * 0.99
+        if position['priced'] and position['price'] == price and position['previous_close'] == previous_close:
+            return
+        self._remove_contribution(position)
+        position['price'] = price
+        position['previous_close'] = previous_close
+        position['priced'] = True
+        self._add_contribution(position)
+
+    def set_priced(self, symbol, priced):
+        """Include or leave out a holding from the valued totals"""
+        position = self._position(symbol)
+        if position['priced'] != priced:
+            self._remove_contribution(position)
+            position['priced'] = priced
+            self._add_contribution(position)
+
+    def update_details(self, symbol, details):
+        """Apply the API details of a symbol (price, previous close, name, sector, change)"""
+        position = self._position(symbol)
+        # The prices payload doesn't always carry the name/sector, the metadata store does
+        position['name'] = details.get('name') or symbol_metadata.name(symbol)
+        position['change_percent'] = details.get('changePercent', 0)
+
+        sector = details.get('sector') or symbol_metadata.sector(symbol)
+        if sector != position['sector']:
+            self._remove_contribution(position)
+            position['sector'] = sector
+            self._add_contribution(position)
+
+        price = details.get('currentPrice', 0)
+        self.update_price(symbol, price, details.get('previousClose', price * 0.99))
@@ -1,6 +1,16 @@
 import requests
+import time
+from datetime import date, timedelta
+
+from Model.Protofilio.performance_engine import EPOCH, day_number
+
+HISTORY_TTL = 15 * 60  # Seconds before a cached history is checked for new bars
+
 
 class PortfolioModel:
+    # symbol -> (fetched at, price history), shared by every page instance
+    _history_cache = {}
+
     def __init__(self):
         pass
 
@@ -92,3 +102,45 @@ class PortfolioModel:
             print(f"Error fetching balance: {str(e)}")
             # Return dummy balance for testing
             return 500.00
+
+    def get_stock_history(self, symbol, start_date="1-1-2025"):
+        """Get daily price history for a stock"""
+        now = date.today().strftime("%Y-%m-%d")
+        try:
+            response = requests.get(f"http://localhost:5000/api/stocks-query/history?ticker={symbol}&startDate={start_date}&endDate={now}")
+            if response.status_code == 200:
+                return response.json()
+            else:
+                print(f"Failed to get stock history for {symbol}. Status code: {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"Error fetching stock history for {symbol}: {str(e)}")
+            return None
+
+    def get_price_histories(self, symbols):
+        """Price history for each symbol, fetched once and then only topped up with new bars.
+
+        A history older than HISTORY_TTL is refreshed from its last bar on (closed
+        bars don't change, the last one may still move), the rest come from the cache.
+        """
+        cache = PortfolioModel._history_cache
+        now = time.monotonic()
+        for symbol in symbols:
+            fetched_at, history = cache.get(symbol, (None, None))
+            if history is not None and now - fetched_at < HISTORY_TTL:
+                continue
+            dated = [(day_number(bar.get('date')), bar) for bar in history or []]
+            dated = [(day, bar) for day, bar in dated if day is not None]
+            if not dated:
+                history = self.get_stock_history(symbol)
+                if history is not None:
+                    cache[symbol] = (now, history)
+                continue
+
+            last_day = max(day for day, _ in dated)
+            start_date = (EPOCH + timedelta(days=last_day)).strftime("%Y-%m-%d")
+            new_bars = self.get_stock_history(symbol, start_date=start_date)
+            if new_bars is not None:
+                # The cached bars before the last one, then whatever the API has from there on
+                cache[symbol] = (now, [bar for day, bar in dated if day < last_day] + list(new_bars))
+        return {symbol: cache[symbol][1] for symbol in symbols if symbol in cache}
@@ -0,0 +1,169 @@
+# Model/Protofilio/risk_engine.py
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from Model.Protofilio.performance_engine import day_number
+from Model.Transactions.transaction_store import EPOCH
+
+BENCHMARK_SYMBOL = "SPY"
+TRADING_DAYS = 252
+Z_SCORES = {0.95: 1.6449, 0.99: 2.3263}  # One-sided normal quantiles for the parametric VaR
+
+
+def _returns(prices):
+    """Daily simple returns of each column, NaN where either close is missing"""
+    previous = prices[:-1]
+    current = prices[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = current / previous - 1
+    returns[(previous <= 0) | (current <= 0)] = np.nan
+    return returns
+
+
+def _betas(returns, benchmark_returns):
+    """Beta of every column of `returns` against the benchmark, over the days both have a return"""
+    mask = np.isfinite(returns) & np.isfinite(benchmark_returns)[:, None]
+    counts = mask.sum(axis=0)
+    x = np.where(mask, benchmark_returns[:, None], 0.0)
+    y = np.where(mask, returns, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = x.sum(axis=0) / counts
+        mean_y = y.sum(axis=0) / counts
+        covariance = (x * y).sum(axis=0) / counts - mean_x * mean_y
+        variance = (x * x).sum(axis=0) / counts - mean_x * mean_x
+        betas = covariance / variance
+    betas[(counts < 2) | ~(variance > 1e-12)] = np.nan
+    return betas
+
+
+def _value_or_none(value):
+    return None if value is None or not np.isfinite(value) else float(value)
+
+
+class RiskEngine:
+    """Volatility, beta, drawdown and VaR of the current holdings over their price history.
+
+    Reads the aligned (day x symbol) close matrix the PerformanceEngine already
+    keeps and the quantities of the PositionsEngine, so there is no extra fetching
+    or aligning. The portfolio is the current holdings valued over the last
+    `window` days; every statistic is a handful of numpy reductions over that
+    matrix. The report is cached per (holdings version, history version), so
+    asking for it on every refresh only computes when something changed.
+    """
+
+    def __init__(self, benchmark=BENCHMARK_SYMBOL, confidence=0.95, window=TRADING_DAYS):
+        self.benchmark = benchmark
+        self.confidence = confidence
+        self.window = window
+        self._key = None
+        self._report = None
+
+    def report(self, performance, positions):
+        """Risk figures as a dict (None for figures without enough history), cached per version"""
+        key = (positions.version, performance.history_version)
+        if key != self._key:
+            self._report = self.compute(performance.days, performance.prices, performance.symbols,
+                                        {symbol: position['quantity']
+                                         for symbol, position in positions.positions.items()
+                                         if position['quantity']})
+            self._key = key
+        return self._report
+
+    def compute(self, days, prices, symbols, quantities):
+        """Risk figures for `quantities` held over the (day x symbol) close matrix `prices`"""
+        report = {
+            'benchmark': self.benchmark, 'confidence': self.confidence, 'observations': 0,
+            'value': None, 'volatility': None, 'beta': None, 'max_drawdown': None,
+            'var_historical': None, 'var_parametric': None,
+            'annual_return': None, 'mtd_return': None, 'holdings': {},
+        }
+        columns = [column for column, symbol in enumerate(symbols) if quantities.get(symbol)]
+        if not columns or len(days) < 2:
+            return report
+
+        held = prices[:, columns]
+        shares = np.array([quantities[symbols[column]] for column in columns], dtype=float)
+
+        # Only the trailing days on which every holding has a close can value the portfolio
+        complete = np.flatnonzero(~(held > 0).all(axis=1))
+        start = max(int(complete[-1]) + 1 if len(complete) else 0, len(days) - self.window - 1)
+        if len(days) - start < 2:
+            return report
+        days = days[start:]
+        held = held[start:]
+        values = held @ shares
+
+        portfolio_returns = values[1:] / values[:-1] - 1
+        holding_returns = _returns(held)
+        mean = portfolio_returns.mean()
+        deviation = portfolio_returns.std(ddof=1) if len(portfolio_returns) > 1 else np.nan
+        holding_deviation = np.full(len(columns), np.nan)
+        enough = np.isfinite(holding_returns).sum(axis=0) > 1
+        if enough.any():
+            holding_deviation[enough] = np.nanstd(holding_returns[:, enough], axis=0, ddof=1)
+
+        # Beta against the benchmark, when its history is part of the matrix
+        portfolio_beta = np.nan
+        holding_betas = np.full(len(columns), np.nan)
+        if self.benchmark in symbols:
+            benchmark_returns = _returns(prices[start:, symbols.index(self.benchmark)][:, None])[:, 0]
+            holding_betas = _betas(holding_returns, benchmark_returns)
+            portfolio_beta = _betas(portfolio_returns[:, None], benchmark_returns)[0]
+
+        # Deepest fall from a running peak
+        drawdowns = values / np.maximum.accumulate(values) - 1
+
+        # One-day loss not exceeded with `confidence`, in dollars of today's value
+        value = values[-1]
+        historical = -np.percentile(portfolio_returns, (1 - self.confidence) * 100) * value
+        z_score = Z_SCORES.get(self.confidence, Z_SCORES[0.95])
+        parametric = (z_score * deviation - mean) * value
+
+        # Trailing year return, annualized when the history is shorter than a year
+        year_start = int(np.searchsorted(days, days[-1] - 365))
+        span = days[-1] - days[year_start]
+        growth = values[-1] / values[year_start]
+        annual_return = growth ** (365.0 / span) - 1 if 0 < span < 365 else growth - 1
+
+        # Month to date: from the last close before the month started
+        last_day = EPOCH + timedelta(days=int(days[-1]))
+        month_start = day_number(datetime(last_day.year, last_day.month, 1))
+        month_row = max(0, int(np.searchsorted(days, month_start)) - 1)
+
+        report.update({
+            'observations': len(portfolio_returns),
+            'value': float(value),
+            'volatility': _value_or_none(deviation * np.sqrt(TRADING_DAYS)),
+            'beta': _value_or_none(portfolio_beta),
+            'max_drawdown': float(drawdowns.min()),
+            'var_historical': _value_or_none(historical),
+            'var_parametric': _value_or_none(parametric),
+            'annual_return': _value_or_none(annual_return),
+            'mtd_return': _value_or_none(values[-1] / values[month_row] - 1),
+            'holdings': {
+                symbols[column]: {
+                    'volatility': _value_or_none(holding_deviation[i] * np.sqrt(TRADING_DAYS)),
+                    'beta': _value_or_none(holding_betas[i]),
+                }
+                for i, column in enumerate(columns)
+            },
+        })
+        return report
+
+
+def risk_summary(report):
+    """Short plain-text version of a report, for the AI advisor"""
+    if not report or report.get('volatility') is None:
+        return None
+    parts = [f"annualized volatility {report['volatility'] * 100:.1f}%"]
+    if report.get('beta') is not None:
+        parts.append(f"beta {report['beta']:.2f} vs {report['benchmark']}")
+    parts.append(f"max drawdown {report['max_drawdown'] * 100:.1f}%")
+    confidence = int(report['confidence'] * 100)
+    if report.get('var_historical') is not None:
+        parts.append(f"1-day {confidence}% VaR ${report['var_historical']:,.0f} historical"
+                     f" / ${report['var_parametric'] or 0:,.0f} parametric")
+    if report.get('annual_return') is not None:
+        parts.append(f"annual return {report['annual_return'] * 100:+.1f}%")
+    return "Portfolio risk (current holdings, last year): " + ", ".join(parts)
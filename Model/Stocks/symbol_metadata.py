@@ -0,0 +1,174 @@
+# Model/Stocks/symbol_metadata.py
+import json
+import os
+import time
+
+import requests
+from PySide6.QtCore import QObject, Signal, QThread, QTimer
+
+from app_paths import data_path
+
+PRICES_URL = "http://localhost:5000/api/stocks-query/prices"
+MAX_AGE = 7 * 24 * 3600              # Names and sectors hardly change, refetch weekly
+REFRESH_INTERVAL_MS = 6 * 3600 * 1000
+DEFAULT_SECTOR = "Other"
+
+
+class MetadataFetchWorker(QObject):
+    """Fetches the prices payload for a list of symbols in a background thread"""
+    finished = Signal(object)  # {symbol: details} (empty on failure)
+
+    def __init__(self, symbols):
+        super().__init__()
+        self.symbols = symbols
+
+    def run(self):
+        self.finished.emit(fetch_details(self.symbols))
+
+
+def fetch_details(symbols):
+    """One bulk request for the details of every symbol, {} if it fails"""
+    if not symbols:
+        return {}
+    try:
+        response = requests.post(PRICES_URL, json={"tickers": list(symbols)}, timeout=30)
+        if response.status_code == 200:
+            return response.json() or {}
+        print(f"Error fetching symbol metadata: {response.status_code}")
+    except Exception as e:
+        print(f"Exception fetching symbol metadata: {str(e)}")
+    return {}
+
+
+class SymbolMetadataStore(QObject):
+    """Name and sector of every symbol the app has seen, kept on disk between runs.
+
+    Lookups are plain dict reads, so views can ask for any symbol - including
+    ones the user sold long ago and that no longer come with the holdings'
+    prices. Entries are learned from every prices payload the app already gets,
+    missing or week-old symbols are fetched in one bulk request off the UI
+    thread, and a slow timer repeats that for the symbols the app asked about.
+    """
+    updated = Signal()  # New names/sectors arrived
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.entries = None  # symbol -> {'name', 'sector', 'updated'}, loaded on first use
+        self.known_symbols = set()
+        self.thread = None
+        self.worker = None
+        self._timer = None
+
+    def _ensure_loaded(self):
+        if self.entries is not None:
+            return
+        self.entries = {}
+        if self.path is None:
+            self.path = data_path("symbol_metadata.json")
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                self.entries = json.load(file)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Could not read symbol metadata {self.path}: {e}")
+
+    def save(self):
+        """Write the entries (to a temporary file first so a crash can't leave half a file)"""
+        self._ensure_loaded()
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump(self.entries, file)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"Could not save symbol metadata {self.path}: {e}")
+
+    # Lookups
+
+    def name(self, symbol, default=None):
+        """Company name of a symbol, `default` (or the symbol) if it isn't known"""
+        self._ensure_loaded()
+        entry = self.entries.get(symbol)
+        if entry and entry.get('name'):
+            return entry['name']
+        return default if default is not None else symbol
+
+    def sector(self, symbol, default=DEFAULT_SECTOR):
+        """Sector of a symbol, `default` if it isn't known"""
+        self._ensure_loaded()
+        entry = self.entries.get(symbol)
+        return (entry.get('sector') or default) if entry else default
+
+    def names(self, symbols):
+        """{symbol: name} for a list of symbols"""
+        return {symbol: self.name(symbol) for symbol in symbols}
+
+    # Updates
+
+    def learn(self, stocks_details):
+        """Take the names/sectors out of a prices payload ({symbol: details}), returns True if anything changed"""
+        self._ensure_loaded()
+        changed = False
+        refreshed = False
+        now = time.time()
+        for symbol, details in (stocks_details or {}).items():
+            if not isinstance(details, dict):
+                continue
+            entry = self.entries.setdefault(symbol, {'name': None, 'sector': None, 'updated': 0})
+            for key in ('name', 'sector'):
+                value = details.get(key)
+                if value and value != entry[key]:
+                    entry[key] = value
+                    changed = True
+            # Stale entries that were confirmed are saved too, or they'd be refetched every start
+            refreshed = refreshed or entry['updated'] < now - MAX_AGE
+            entry['updated'] = now
+        if changed or refreshed:
+            self.save()
+        if changed:
+            self.updated.emit()
+        return changed
+
+    def stale(self, symbols, max_age=MAX_AGE):
+        """Symbols with no entry, no name, or an entry older than `max_age` seconds"""
+        self._ensure_loaded()
+        cutoff = time.time() - max_age
+        return [symbol for symbol in symbols
+                if not self.entries.get(symbol, {}).get('name')
+                or self.entries[symbol].get('updated', 0) < cutoff]
+
+    def refresh_in_background(self, symbols):
+        """Fetch the stale symbols in one request off the UI thread and keep them fresh from now on"""
+        self.known_symbols.update(symbol for symbol in symbols if symbol)
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.timeout.connect(lambda: self.refresh_in_background([]))
+            self._timer.start(REFRESH_INTERVAL_MS)
+
+        symbols = self.stale(sorted(self.known_symbols))
+        if not symbols or self.thread is not None:
+            return
+
+        self.thread = QThread()
+        self.worker = MetadataFetchWorker(symbols)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self._on_fetched)
+        self.worker.finished.connect(self.thread.quit)
+        self.thread.finished.connect(self._cleanup_thread)
+        self.thread.start()
+
+    def _on_fetched(self, details):
+        self.learn(details)
+
+    def _cleanup_thread(self):
+        self.worker.deleteLater()
+        self.thread.deleteLater()
+        self.worker = None
+        self.thread = None
+
+
+# One store for the whole app
+symbol_metadata = SymbolMetadataStore()
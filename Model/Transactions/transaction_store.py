@@ -0,0 +1,193 @@
+# Model/Transactions/transaction_store.py
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Reference point for the timestamp column (kept naive, like the dates the API sends)
+EPOCH = datetime(1970, 1, 1)
+
+
+def parse_transaction_date(date_str):
+    """Parse a transaction date from the API, returns None if the format is unknown"""
+    if not date_str:
+        return None
+
+    try:
+        if 'T' in date_str:
+            # ISO format - strip the timezone part (Z, +hh:mm or -hh:mm after the time)
+            date_part, time_part = date_str.rstrip('Z').split('T', 1)
+            time_part = time_part.split('+')[0].split('-')[0]
+
+            if '.' in time_part:
+                # Pad or truncate microseconds to exactly 6 digits
+                base, ms_part = time_part.split('.', 1)
+                ms_part = ms_part.ljust(6, '0')[:6]
+                return datetime.strptime(f"{date_part}T{base}.{ms_part}", "%Y-%m-%dT%H:%M:%S.%f")
+
+            return datetime.strptime(f"{date_part}T{time_part}", "%Y-%m-%dT%H:%M:%S")
+
+        # Other formats
+        for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%b %d, %Y"]:
+            try:
+                return datetime.strptime(date_str, fmt)
+            except ValueError:
+                continue
+    except (ValueError, AttributeError) as e:
+        print(f"Error parsing transaction date {date_str}: {e}")
+
+    return None
+
+
+def timestamp_to_datetime(timestamp):
+    """Convert a value from the timestamp column back to a datetime"""
+    return EPOCH + timedelta(seconds=float(timestamp))
+
+
+def format_transaction_date(timestamp, raw_date, fmt="%b %d, %Y"):
+    """Format a timestamp column value, the raw API date if it couldn't be parsed"""
+    if np.isnan(timestamp):
+        return raw_date
+    return timestamp_to_datetime(timestamp).strftime(fmt)
+
+
+class TransactionStore:
+    """Columnar copy of the user's transaction history.
+
+    Every field is kept in its own array (one entry per transaction) so the views
+    can read a single cell without building per-row widgets or dicts. Sort orders
+    and the type/symbol indexes are built on first use and reused until the
+    transactions change, so sorting and filtering never rebuild the table.
+    """
+    SORT_KEYS = ["date", "type", "symbol", "shares", "amount"]
+
+    def __init__(self, transactions=None):
+        self.version = 0
+        self.set_transactions(transactions or [])
+
+    def __len__(self):
+        return len(self.types)
+
+    def set_transactions(self, transactions):
+        """Rebuild all columns from the raw API transaction list"""
+        count = len(transactions)
+
+        self.transactions = transactions
+        self.raw_dates = [''] * count
+        self.types = [''] * count
+        self.symbols = [''] * count
+        self.timestamps = np.full(count, np.nan)  # Seconds since EPOCH, NaN if unparseable
+        self.quantities = np.full(count, np.nan)  # NaN when the transaction has no shares
+        self.prices = np.full(count, np.nan)
+        self.totals = np.zeros(count)
+
+        for i, tx in enumerate(transactions):
+            self.raw_dates[i] = tx.get('date') or ''
+            self.types[i] = (tx.get('transactionType') or '').lower()
+            self.symbols[i] = tx.get('stockSymbol') or ''
+
+            tx_date = parse_transaction_date(self.raw_dates[i])
+            if tx_date is not None:
+                self.timestamps[i] = (tx_date - EPOCH).total_seconds()
+
+            quantity = tx.get('quantity')
+            price = tx.get('price')
+            if quantity is not None:
+                self.quantities[i] = quantity
+            if price is not None:
+                self.prices[i] = price
+
+            # Same rule the table always used: price * quantity, falling back to the amount
+            if quantity and price:
+                self.totals[i] = price * quantity
+            else:
+                self.totals[i] = tx.get('amount') or 0
+
+        # Any index built for the previous data is now stale
+        self._sort_cache = {}
+        self._codes = {}
+        self._inverted = {}
+        self.version += 1
+
+    def _factorize(self, key):
+        """Return (sorted distinct values, code per row) for the 'type' or 'symbol' column"""
+        if key not in self._codes:
+            values = np.array(self.types if key == "type" else self.symbols, dtype=object)
+            if len(values):
+                uniques, codes = np.unique(values, return_inverse=True)
+            else:
+                uniques, codes = np.array([], dtype=object), np.array([], dtype=np.intp)
+            self._codes[key] = (uniques, codes.ravel())
+        return self._codes[key]
+
+    def _sort_values(self, key):
+        """Column used to order the rows for a sort key"""
+        if key == "date":
+            return self.timestamps
+        if key in ("type", "symbol"):
+            return self._factorize(key)[1]
+        if key == "shares":
+            return self.quantities
+        if key == "amount":
+            return self.totals
+        raise ValueError(f"Unknown sort key: {key}")
+
+    def sort_permutation(self, key):
+        """Row numbers ordered ascending by the given key (computed once per data version)"""
+        if key not in self._sort_cache:
+            self._sort_cache[key] = np.argsort(self._sort_values(key), kind="stable")
+        return self._sort_cache[key]
+
+    def inverted_index(self, key):
+        """Map each distinct 'type' or 'symbol' value to the row numbers that have it"""
+        if key not in self._inverted:
+            uniques, codes = self._factorize(key)
+            # Group the rows by code in one pass instead of scanning once per value
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes, minlength=len(uniques))
+            groups = np.split(order, np.cumsum(counts)[:-1]) if len(uniques) else []
+            self._inverted[key] = dict(zip(uniques.tolist(), groups))
+        return self._inverted[key]
+
+    def distinct(self, key):
+        """Sorted distinct values of the 'type' or 'symbol' column"""
+        return [value for value in self._factorize(key)[0].tolist() if value]
+
+    def filter_mask(self, symbol=None, tx_type=None):
+        """Boolean mask of the rows matching the filters, None when nothing is filtered"""
+        mask = None
+        for key, value in (("symbol", symbol), ("type", tx_type)):
+            if not value:
+                continue
+            key_mask = np.zeros(len(self), dtype=bool)
+            key_mask[self.inverted_index(key).get(value, [])] = True
+            mask = key_mask if mask is None else mask & key_mask
+        return mask
+
+    def query(self, sort_key=None, descending=False, symbol=None, tx_type=None):
+        """Row numbers to display for a sort order and filters, without touching the columns"""
+        if sort_key:
+            rows = self.sort_permutation(sort_key)
+            if descending:
+                rows = rows[::-1]
+        else:
+            rows = np.arange(len(self))
+
+        mask = self.filter_mask(symbol=symbol, tx_type=tx_type)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        return rows
+
+    def formatted_date(self, row, fmt="%b %d, %Y"):
+        """Return the date of a row formatted for display"""
+        return format_transaction_date(self.timestamps[row], self.raw_dates[row], fmt)
+
+    def has_shares(self, row):
+        """True if the row has both a quantity and a price"""
+        return not (np.isnan(self.quantities[row]) or np.isnan(self.prices[row]))
+
+    def quantity(self, row):
+        """Quantity of a row as the API sent it (int when it is a whole number)"""
+        quantity = self.quantities[row]
+        if np.isnan(quantity):
+            return None
+        return int(quantity) if quantity.is_integer() else float(quantity)
@@ -1,74 +1,150 @@
-from PySide6.QtCore import QObject, Signal, QThread, QCoreApplication
+import sqlite3
 
-# Worker class that will run in a separate thread
-class ApiWorker(QObject):
-    finished = Signal(object)  # Signal to emit when API call completes
-    error = Signal(str)        # Signal to emit on error
-    
-    def __init__(self, model, message):
-        super().__init__()
-        self.model = model
-        self.message = message
-    
-    def run(self):
-        """Run the API call in a separate thread"""
-        try:
-            # Get response from the model
-            response = self.model.send_message(self.message)
-            # Emit the finished signal with the response
-            self.finished.emit(response)
-        except Exception as e:
-            # Emit the error signal
-            self.error.emit(str(e))
+from PySide6.QtCore import QObject
 
+from Model.Ai_chat.chat_history import PAGE_SIZE
+from Model.Ai_chat.response_cache import response_cache
+from Presenter.Ai_chat.ai_request_queue import ai_requests
 
-class AiChatPresenter:
-    def __init__(self, view, model):
+
+def _answer_text(response):
+    """Text of an answer from the API ({'advice': ...} or {'answer': ...})"""
+    if isinstance(response, dict):
+        return response.get('advice') or response.get('answer') or ""
+    return response or ""
+
+
+class AiChatPresenter(QObject):
+    def __init__(self, view, model, context_provider=None, history=None, user_id=None, request_queue=None,
+                 cache=None):
+        super().__init__()
         self.view = view
         self.model = model
-        self.thread = None
+        # Questions go through the app wide queue: one at a time and in order for this chat
+        self.request_queue = request_queue or ai_requests
+        self.questions = {}  # view message id -> AiRequest, until answered or cancelled
+        # Answers by question and portfolio, a repeated question doesn't go to the API again
+        self.cache = cache if cache is not None else response_cache
+        # Called on every question for extra fields to send along (e.g. the portfolio risk figures)
+        self.context_provider = context_provider
+        # ChatHistoryStore the conversation is kept in (None keeps it in memory only)
+        self.history = history
+        self.user_id = user_id
+        self.session_id = None
+        self.oldest_message = None  # Oldest stored message shown, older pages are read before it
         
         # Connect to the view's message_sent signal
         self.view.message_sent.connect(self.handle_message)
+        self.view.question_cancelled.connect(self.cancel_question)
+        self.view.chat_cleared.connect(self.handle_chat_cleared)
+
+        if self.history is not None:
+            self.view.older_messages_requested.connect(self.load_older_messages)
+            self.load_history()
+
+    def load_history(self):
+        """Show the last page of the user's current conversation"""
+        try:
+            self.session_id = self.history.current_session(self.user_id)
+            messages = self.history.latest_page(self.session_id)
+        except sqlite3.Error as e:
+            print(f"Error loading chat history: {e}")
+            self.history = None
+            return
+        self.oldest_message = messages[0] if messages else None
+        self.view.show_history(messages, len(messages) == PAGE_SIZE)
+
+    def load_older_messages(self):
+        """The user scrolled up - show the page before the oldest message shown"""
+        messages = []
+        if self.history is not None and self.oldest_message is not None:
+            try:
+                messages = self.history.page_before(self.session_id, self.oldest_message)
+            except sqlite3.Error as e:
+                print(f"Error loading chat history: {e}")
+        if messages:
+            self.oldest_message = messages[0]
+        self.view.add_older_messages(messages, len(messages) == PAGE_SIZE)
+
+    def handle_chat_cleared(self):
+        """Questions still waiting are dropped with the chat"""
+        for message_id in list(self.questions):
+            self.cancel_question(message_id)
+        self.start_new_session()
+
+    def start_new_session(self):
+        """The chat was cleared - later messages go to a new conversation, the old one stays stored"""
+        if self.history is None:
+            return
+        try:
+            self.session_id = self.history.new_session(self.user_id)
+        except sqlite3.Error as e:
+            print(f"Error starting a chat session: {e}")
+        self.oldest_message = None
+
+    def _store_message(self, sender, text):
+        if self.history is None or self.session_id is None or not text:
+            return
+        try:
+            message = self.history.add_message(self.session_id, sender, text)
+        except sqlite3.Error as e:
+            print(f"Error saving chat message: {e}")
+            return
+        if self.oldest_message is None:
+            self.oldest_message = message
     
-    def handle_message(self, message):
-        """Handle a message from the view"""
-        # 1. Show typing indicator
+    def handle_message(self, message, message_id):
+        """Queue a question from the view, it's sent once the questions before it are answered"""
+        context = self.context_provider() if self.context_provider else None
+
+        # Asked before about the same portfolio - answer right away, unless earlier
+        # questions are still waiting (answers come in the order they were asked)
+        cached = None if self.request_queue.pending(self) else self.cache.get(message, context)
+        if cached is not None:
+            self._store_message("user", message)
+            self.view.add_ai_message(cached, cached=True)
+            self._store_message("ai", _answer_text(cached))
+            return
+
+        self.view.set_question_state(message_id, "queued")
         self.view.show_typing_indicator()
-        
-        # 2. Force UI update
-        QCoreApplication.processEvents()
-        
-        # 3. Create a thread for the API call
-        self.thread = QThread()
-        self.worker = ApiWorker(self.model, message)
-        
-        # 4. Move worker to thread
-        self.worker.moveToThread(self.thread)
-        
-        # 5. Connect signals
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.handle_response)
-        self.worker.error.connect(self.handle_error)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.error.connect(self.thread.quit)
-        self.thread.finished.connect(self.cleanup_thread)
-        
-        # 6. Start the thread
-        self.thread.start()
-    
-    def handle_response(self, response):
+        self.questions[message_id] = self.request_queue.submit(
+            self, self.model, message, context,
+            on_started=lambda request: self._question_started(message_id, message),
+            on_answer=lambda request, response: self.handle_response(message_id, response, request),
+            on_error=lambda request, error_message: self.handle_error(message_id, error_message))
+
+    def _question_started(self, message_id, message):
+        self.view.set_question_state(message_id, "sending")
+        # Stored when it's sent, so the history keeps every question next to its answer
+        self._store_message("user", message)
+
+    def cancel_question(self, message_id):
+        """The user cancelled a question that wasn't answered yet"""
+        request = self.questions.pop(message_id, None)
+        if request is None or not self.request_queue.cancel(request):
+            return
+        self.view.set_question_state(message_id, "cancelled")
+        self._answered()
+
+    def handle_response(self, message_id, response, request=None):
         """Handle successful response"""
-        self.view.hide_typing_indicator()
-        self.view.add_ai_response(response)
-    
-    def handle_error(self, error_message):
+        self.questions.pop(message_id, None)
+        if request is not None and not (isinstance(response, dict) and response.get("failed")):
+            self.cache.put(request.message, request.context, response)
+        self.view.set_question_state(message_id, None)
+        self.view.add_ai_message(response)
+        self._store_message("ai", _answer_text(response))
+        self._answered()
+
+    def handle_error(self, message_id, error_message):
         """Handle error"""
-        self.view.hide_typing_indicator()
-        self.view.add_ai_response({"advice": f"Sorry, I encountered an error: {error_message}"})
-    
-    def cleanup_thread(self):
-        """Clean up thread resources"""
-        self.worker.deleteLater()
-        self.thread.deleteLater()
-        self.thread = None
\ No newline at end of file
+        self.questions.pop(message_id, None)
+        self.view.set_question_state(message_id, None)
+        self.view.add_ai_message({"advice": f"Sorry, I encountered an error: {error_message}"})
+        self._answered()
+
+    def _answered(self):
+        # Keep thinking while later questions of this chat are still waiting
+        if not self.request_queue.pending(self):
+            self.view.hide_typing_indicator()
@@ -0,0 +1,141 @@
+# Presenter/Ai_chat/ai_request_queue.py
+import itertools
+
+from PySide6.QtCore import QObject, Signal, QThread
+
+
+class AiRequest:
+    """One question waiting for (or getting) an answer from the RAG endpoint"""
+    _ids = itertools.count(1)
+
+    def __init__(self, conversation, model, message, context=None, on_started=None, on_answer=None,
+                 on_error=None):
+        self.id = next(self._ids)
+        self.conversation = conversation
+        self.model = model
+        self.message = message
+        self.context = context
+        # Called on the UI thread: on_started(request), on_answer(request, response), on_error(request, text)
+        self.on_started = on_started
+        self.on_answer = on_answer
+        self.on_error = on_error
+        self.state = "queued"  # queued -> running -> done, or cancelled
+
+
+# Worker class that will run in a separate thread
+class ApiWorker(QObject):
+    finished = Signal(object, object)  # (request, response) when the API call completes
+    error = Signal(object, str)        # (request, message) on error
+
+    def __init__(self, request):
+        super().__init__()
+        self.request = request
+
+    def run(self):
+        """Run the API call in a separate thread"""
+        try:
+            # Get response from the model
+            response = self.request.model.send_message(self.request.message, self.request.context)
+            # Emit the finished signal with the response
+            self.finished.emit(self.request, response)
+        except Exception as e:
+            # Emit the error signal
+            self.error.emit(self.request, str(e))
+
+
+class AiRequestQueue(QObject):
+    """Schedules the questions sent to the AI advisor.
+
+    Every conversation (any hashable key, e.g. its presenter) has at most one
+    question in flight and its questions are sent and answered in the order
+    they were asked. Across conversations at most `max_concurrent` requests
+    run at once, the rest wait in submission order. A queued question can be
+    cancelled before it's sent; cancelling one in flight drops its answer.
+    """
+
+    def __init__(self, max_concurrent=2, parent=None):
+        # A QObject so the workers' results are queued to the UI thread
+        super().__init__(parent)
+        self.max_concurrent = max_concurrent
+        self._queued = []  # Requests not sent yet, oldest first
+        self._running = {}  # conversation -> (request, thread, worker)
+        self._finished_threads = []
+
+    def submit(self, conversation, model, message, context=None, on_started=None, on_answer=None,
+               on_error=None):
+        """Queue a question, returns its AiRequest (to cancel it)"""
+        request = AiRequest(conversation, model, message, context, on_started, on_answer, on_error)
+        self._queued.append(request)
+        self._start_next()
+        return request
+
+    def cancel(self, request):
+        """Cancel a question - True if it hadn't been answered yet"""
+        if request.state == "queued":
+            self._queued.remove(request)
+        elif request.state != "running":
+            return False
+        request.state = "cancelled"
+        return True
+
+    def pending(self, conversation):
+        """Questions of a conversation still waiting for an answer (queued or in flight)"""
+        pending = [request for request in self._queued if request.conversation == conversation]
+        running = self._running.get(conversation)
+        if running and running[0].state == "running":
+            pending.insert(0, running[0])
+        return pending
+
+    def _start_next(self):
+        while len(self._running) < self.max_concurrent:
+            request = next((request for request in self._queued if request.conversation not in self._running), None)
+            if request is None:
+                return
+            self._queued.remove(request)
+            self._start(request)
+
+    def _start(self, request):
+        request.state = "running"
+        thread = QThread()
+        worker = ApiWorker(request)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_answer)
+        worker.error.connect(self._on_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(self._cleanup_threads)
+        self._running[request.conversation] = (request, thread, worker)
+        if request.on_started:
+            request.on_started(request)
+        thread.start()
+
+    def _on_answer(self, request, response):
+        if self._finish(request) and request.on_answer:
+            request.on_answer(request, response)
+        self._start_next()
+
+    def _on_error(self, request, error_message):
+        if self._finish(request) and request.on_error:
+            request.on_error(request, error_message)
+        self._start_next()
+
+    def _finish(self, request):
+        """Free the conversation's slot, False if the answer isn't wanted anymore"""
+        _, thread, worker = self._running.pop(request.conversation)
+        self._finished_threads.append((thread, worker))
+        if request.state == "cancelled":
+            return False
+        request.state = "done"
+        return True
+
+    def _cleanup_threads(self):
+        for thread, worker in list(self._finished_threads):
+            if thread.isFinished():
+                self._finished_threads.remove((thread, worker))
+                worker.deleteLater()
+                thread.deleteLater()
+
+
+# One queue for every advisor window, so the concurrency limit is app wide
+ai_requests = AiRequestQueue()
@@ -1,7 +1,6 @@
 # Presenters/Auth/auth_presenter.py
 from Model.Auth.auth_model import AuthModel
 from View.auth_page import LoginPage
-from View.home_page import MainWindow
 from PySide6.QtWidgets import QPushButton, QLineEdit  # Change PyQt5 to PySide6
 from PySide6.QtCore import Slot
 from Google_Auth.google_auth import GoogleAuthService
@@ -70,37 +69,20 @@ class AuthPresenter:
         # Show loading overlay
         self.view.loading_overlay.start("Logging in...")
         
-        # Simulate network delay for demonstration
-        # In a real app, you'd perform actual authentication here
-        QTimer.singleShot(1500, lambda: self._complete_login(email, password))
+        # Let the overlay paint before the login request blocks
+        QTimer.singleShot(0, lambda: self._complete_login(email, password))
     
     def _complete_login(self, email, password):
-        """Complete the login process after delay/authentication"""
+        """Complete the login process and open the dashboard"""
         # Call model method
         success, message, text = self.model.validate_login(email, password)
         
         # Update UI based on result
         if success:
-            # Keep showing loading while transitioning to home screen
+            # The dashboard fetches holdings, prices, transactions and advice itself, card by card
             user_info = self.model.get_user_info(text)
-            user_stocks = self.model.get_user_stocks(text)
-            user_transactions = self.model.get_user_transactions(text)
-            ai_advice = self.get_ai_advice()
-            # Extarct user stocks from user_stocks
-            # The user_stocks structure is [{'stockSymbol': 'AAPL', 'quantity': 10}]
-            stocks = []
-            for stock in user_stocks:   
-                stocks.append(stock['stockSymbol'])
-            stocks_user_holds = self.model.get_stocks_user_holds(text, stocks)
-            history = self.model.get_user_history(stocks[1])
-            print("First stock in user stocks:", stocks[1])
             print("User info:", user_info)
-            print("User stocks:", user_stocks)
-            print("User transactions:", user_transactions)
-            print("User history:", history)
-            self.view.loading_overlay.message_label.setText("Loading your dashboard...")
-            balance = self.get_balance(text)
-            QTimer.singleShot(1000, lambda: self.view.navigate_to_home(user_info, user_stocks, user_transactions, text, balance, stocks_user_holds, ai_advice, history))
+            self.view.navigate_to_home(user_info, text)
         else:
             # Stop loading and show error
             self.view.loading_overlay.stop()
@@ -118,30 +100,19 @@ class AuthPresenter:
         # Show loading overlay
         self.view.loading_overlay.start("Creating your account...")
         
-        # Simulate network delay for demonstration
-        QTimer.singleShot(2000, lambda: self._complete_signup(name, email, password, confirm_password, terms_accepted))
+        # Let the overlay paint before the signup request blocks
+        QTimer.singleShot(0, lambda: self._complete_signup(name, email, password, confirm_password, terms_accepted))
     
     def _complete_signup(self, name, email, password, confirm_password, terms_accepted):
-        """Complete the signup process after delay/authentication"""
+        """Complete the signup process and open the dashboard"""
         # Call model method
         success, message, text = self.model.validate_signup(name, email, password, confirm_password, terms_accepted)
 
         # Update UI based on result
         if success:
             user_info = self.model.get_user_info(text)
-            user_stocks = []
-            user_transactions = []
-            stocks_user_holds = []
-            ai_advice = self.get_ai_advice()
-            history = []
             print("User info:", user_info)
-            print("User stocks:", user_stocks)
-            print("User transactions:", user_transactions)
-            
-            # Keep showing loading while transitioning to home screen
-            self.view.loading_overlay.message_label.setText("Setting up your account...")
-            balance = self.get_balance(text)
-            QTimer.singleShot(1000, lambda: self.view.navigate_to_home(user_info, user_stocks, user_transactions, text, balance, stocks_user_holds, ai_advice, history))
+            self.view.navigate_to_home(user_info, text)
         else:
             # Stop loading and show error
             self.view.loading_overlay.stop()
@@ -175,31 +146,11 @@ class AuthPresenter:
         
         if success:
             user_info = self.model.get_user_info(user_data)
-            user_stocks = self.model.get_user_stocks(user_data)
-            user_transactions = self.model.get_user_transactions(user_data)
-            ai_advice = self.get_ai_advice()
-            stocks = []
-            for stock in user_stocks:   
-                stocks.append(stock['stockSymbol'])
-            stocks_user_holds = self.model.get_stocks_user_holds(user_data, stocks)
-            if len(stocks) > 0:
-                history = self.model.get_user_history(stocks[1])
-            else:
-                history = []
-
             print("User info:", user_info)
-            print("User stocks:", user_stocks)
-            print("User transactions:", user_transactions)
-            print("Stocks user holds from auth presentor:", stocks_user_holds)
-
-            
-            # Update loading message for transition
-            self.view.loading_overlay.message_label.setText("Loading your dashboard...")
-            
-            # Use timer to allow the UI to update before navigation
-            balance = self.get_balance(user_data)
-            QTimer.singleShot(800, lambda: self.view.navigate_to_home(user_info, user_stocks, user_transactions, user_data, balance, stocks_user_holds, ai_advice, history))
+            self.view.navigate_to_home(user_info, user_data)
         else:
+            # The saved Google credentials may be what got refused, next time go through the browser
+            self.google_auth_service.forget_credentials()
             # Stop loading and show error
             self.view.loading_overlay.stop()
             self.view.show_error_message("Google Sign-In Error", message)
@@ -221,11 +172,3 @@ class AuthPresenter:
         """Handle forgot password button click"""
         # This will be implemented later
         pass
-
-    def get_balance(self, firebaseId):
-        print("Getting balance for user with ID:", firebaseId)
-        return self.model.get_balance(firebaseId)
-    
-
-    def get_ai_advice(self):
-        return self.model.get_ai_advice()
\ No newline at end of file
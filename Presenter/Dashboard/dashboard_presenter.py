@@ -1,12 +1,40 @@
 # Presenter/Dashboard/dashboard_presenter.py
+from PySide6.QtCore import QObject, Signal, QThread
+
 from event_system import event_system
 
-class DashboardPresenter:
+
+class FetchWorker(QObject):
+    """Runs one model call in a background thread"""
+    finished = Signal(str, object)  # (source, result)
+
+    def __init__(self, source, fetch):
+        super().__init__()
+        self.source = source
+        self.fetch = fetch
+
+    def run(self):
+        try:
+            result = self.fetch()
+        except Exception as e:
+            print(f"Error loading {self.source}: {e}")
+            result = None
+        self.finished.emit(self.source, result)
+
+
+class DashboardPresenter(QObject):
     """Presenter for the dashboard that connects model and view"""
     
-    def __init__(self, view, model):
+    def __init__(self, view, model, on_loaded=None):
+        # A QObject so the workers' results are queued to the UI thread
+        super().__init__()
         self.view = view
         self.model = model
+        # Called with (source, data) for every fetch, so the main window can keep its copy current
+        self.on_loaded = on_loaded
+        self.user_stocks = None
+        self._threads = {}  # source -> (thread, worker)
+        self._pending = {}  # source -> fetch asked for again while its last one was running
         
         # Store reference to dashboard methods without the view knowing about presenter
         self._setup_dashboard_references()
@@ -16,9 +44,6 @@ class DashboardPresenter:
     
     def _setup_dashboard_references(self):
         """Store references to important dashboard methods without exposing presenter to view"""
-        # Store the method we'll need to call for updates
-        self._update_dashboard_data = self.view.update_dashboard_data
-        
         # Store user ID for data fetching
         self._user_id = self.view.firebaseUserId
     
@@ -29,23 +54,70 @@ class DashboardPresenter:
         event_system.transactions_updated.connect(self.refresh_dashboard)
     
     def load_initial_data(self):
-        """Load initial data for the dashboard"""
-        self.refresh_dashboard()
-    
+        """Start every dashboard fetch in the background, each card fills in as its data arrives"""
+        self._fetch("stocks", lambda: self.model.get_user_stocks(self._user_id))
+        self._fetch("transactions", lambda: self.model.get_user_transactions(self._user_id))
+        self._fetch("advice", self.model.get_ai_advice)
+        self._fetch("balance", lambda: self.model.get_balance(self._user_id))
+
+    def _fetch(self, source, fetch):
+        if source in self._threads:
+            # Run it again once the current one is done, the newest data wins
+            self._pending[source] = fetch
+            return
+        thread = QThread()
+        worker = FetchWorker(source, fetch)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_fetched)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(self._cleanup_threads)
+        self._threads[source] = (thread, worker)
+        thread.start()
+
+    def _cleanup_threads(self):
+        for source, (thread, worker) in list(self._threads.items()):
+            if thread.isFinished():
+                del self._threads[source]
+                worker.deleteLater()
+                thread.deleteLater()
+                if source in self._pending:
+                    self._fetch(source, self._pending.pop(source))
+
+    def _on_fetched(self, source, result):
+        """Hand one resolved fetch to its card (runs on the UI thread)"""
+        # A failed fetch (None) keeps whatever the dashboard already shows
+        if source == "stocks":
+            self.user_stocks = result if result is not None else (self.view.user_stocks or [])
+            symbols = [stock['stockSymbol'] for stock in self.user_stocks]
+            # Prices and the graph's history both need the symbols first
+            if symbols:
+                self._fetch("details", lambda: self.model.get_stocks_details(self.user_stocks))
+                self._fetch("history", lambda: self.model.get_stock_history(symbols[0]))
+            else:
+                self._on_fetched("details", {})
+                self._on_fetched("history", [])
+            return
+
+        if source == "details":
+            result = result if result is not None else (self.view.stocks_the_user_has or {})
+            self.view.set_holdings(self.user_stocks, result)
+            # The main window keeps holdings and their prices together
+            result = (self.user_stocks, result)
+        elif source == "transactions":
+            result = result if result is not None else (self.view.user_transactions or [])
+            self.view.set_transactions(result)
+        elif source == "history":
+            result = result if result is not None else (self.view.history or [])
+            self.view.set_history(result)
+        elif source == "advice":
+            self.view.set_ai_advice(result)
+
+        if self.on_loaded:
+            self.on_loaded(source, result)
+
     def refresh_dashboard(self):
-        """Refresh all dashboard data"""
-        # Fetch fresh data from the model
-        user_stocks = self.model.get_user_stocks(self._user_id)
-        transactions = self.model.get_user_transactions(self._user_id)
-        
-        # Only fetch stock details if we have stocks
-        stocks_details = {}
-        if user_stocks:
-            stocks_details = self.model.get_stocks_details(user_stocks)
-        
-        # Update the view with new data
-        self._update_dashboard_data(
-            user_stocks=user_stocks,
-            user_transactions=transactions,
-            stocks_the_user_has=stocks_details
-        )
\ No newline at end of file
+        """Refetch what a trade changes, through the same background fetches as the first load"""
+        self._fetch("stocks", lambda: self.model.get_user_stocks(self._user_id))
+        self._fetch("transactions", lambda: self.model.get_user_transactions(self._user_id))
+        self._fetch("balance", lambda: self.model.get_balance(self._user_id))
@@ -1,18 +1,48 @@
-from View.protofilio_view import StocksListWidget  # Replace 'some_module' with the actual module name
-from View.protofilio_view import StockItem
-from View.protofilio_view import PortfolioCard
+import time
+
+from PySide6.QtCore import QObject, QThread, QTimer, QEvent
+
 from event_system import event_system
+from Model.Protofilio.protofilio_model import HISTORY_TTL
+from Model.Protofilio.risk_engine import BENCHMARK_SYMBOL
+from Presenter.Dashboard.dashboard_presenter import FetchWorker
 
-class PortfolioPresenter:
+class PortfolioPresenter(QObject):
     def __init__(self, view, model):
+        # A QObject so the performance worker's result is queued to the UI thread
+        super().__init__()
         self.view = view
         self.model = model
         self.view.set_presenter(self)
-        self.current_stock_dialogs = {}  # Track open dialogs
+        self.current_stock_dialogs = {}  # symbol -> stock item with an open dialog
+        self._performance_loading = False
+        self._performance_pending = False  # Another load was asked for while one was running
+        self._performance_loaded_at = None  # When the last load started (monotonic)
+        self._finished_threads = []
         
         # Connect to stock items in the view
         self.setup_stock_item_connections()
         self._connect_events()
+        self.load_performance()
+
+        # Pick up the new daily bars while the page is shown (the cached page is only hidden when closed)
+        self.performance_timer = QTimer(self)
+        self.performance_timer.setInterval(HISTORY_TTL * 1000)
+        self.performance_timer.timeout.connect(self.load_performance)
+        self.view.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        """Run the performance timer only while the page is on screen"""
+        if watched is self.view:
+            if event.type() == QEvent.Show:
+                stale = (self._performance_loaded_at is None
+                         or time.monotonic() - self._performance_loaded_at >= HISTORY_TTL)
+                if stale:
+                    self.load_performance()
+                self.performance_timer.start()
+            elif event.type() == QEvent.Hide:
+                self.performance_timer.stop()
+        return False
     
     def _connect_events(self):
         """Connect to any global events that should trigger portfolio updates"""
@@ -41,56 +71,73 @@ class PortfolioPresenter:
         
         # Update the UI
         self.view.update_after_transaction()
+        self.load_performance()
+
+    def load_performance(self):
+        """Fetch the ledger and price history for the performance chart in the background"""
+        if not hasattr(self.view, 'firebaseUserId') or not self.view.firebaseUserId:
+            return
+        if self._performance_loading:
+            self._performance_pending = True
+            return
+
+        user_id = self.view.firebaseUserId
+        held = [stock['stockSymbol'] for stock in self.view.user_stocks or []]
+
+        def fetch():
+            transactions = self.model.get_user_transactions(user_id) or []
+            # Sold-out symbols still count for the days they were held
+            symbols = {tx.get('stockSymbol') for tx in transactions if tx.get('stockSymbol')}
+            symbols.update(held)
+            symbols.add(BENCHMARK_SYMBOL)  # For the beta in the risk figures
+            return transactions, self.model.get_price_histories(sorted(symbols))
+
+        self._performance_loading = True
+        self._performance_loaded_at = time.monotonic()
+        thread = QThread()
+        worker = FetchWorker("performance", fetch)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_performance_loaded)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(self._cleanup_threads)
+        self._finished_threads.append((thread, worker))
+        thread.start()
+
+    def _on_performance_loaded(self, source, result):
+        """Hand the ledger and histories to the view (runs on the UI thread)"""
+        self._performance_loading = False
+        if result is not None:
+            self.view.set_performance_data(*result)
+        if self._performance_pending:
+            self._performance_pending = False
+            self.load_performance()
+
+    def _cleanup_threads(self):
+        for thread, worker in list(self._finished_threads):
+            if thread.isFinished():
+                self._finished_threads.remove((thread, worker))
+                worker.deleteLater()
+                thread.deleteLater()
 
     def setup_stock_item_connections(self):
-        """Connect to stock items to access their sell buttons"""
-        if hasattr(self.view, 'details_section'):
-            for stock_item in self.get_stock_items():
-                stock_item.register_presenter(self)
-    
+        """Register with the holdings list so every row it makes can reach the presenter"""
+        stock_list = getattr(self.view, 'stock_list', None)
+        if stock_list:
+            stock_list.register_presenter(self)
+
     def get_stock_items(self):
-        """Get all stock items from the view"""
-        stock_items = []
-        
-        # First, try to find the stocks list widget
-        try:
-            # Navigate through the view hierarchy to find StockItem widgets
-            for i in range(self.view.details_section_layout.count()):
-                widget = self.view.details_section_layout.itemAt(i).widget()
-                if isinstance(widget, PortfolioCard):
-                    # Find the StocksListWidget inside the card
-                    stocks_list = None
-                    for j in range(widget.layout.count()):
-                        child_widget = widget.layout.itemAt(j).widget()
-                        if isinstance(child_widget, StocksListWidget):
-                            stocks_list = child_widget
-                            break
-                    
-                    if stocks_list:
-                        # Get the container within the scroll area
-                        container = stocks_list.widget()
-                        # Get all stock items from the container's layout
-                        container_layout = container.layout()
-                        for k in range(container_layout.count()):
-                            item = container_layout.itemAt(k)
-                            if item and item.widget() and isinstance(item.widget(), StockItem):
-                                stock_items.append(item.widget())
-        except (AttributeError, IndexError) as e:
-            print(f"Error finding stock items: {e}")
-        
-        return stock_items
-        
+        """Get all stock items (per-symbol row state) the view has made so far"""
+        return list(getattr(self.view, 'stock_items', {}).values())
+
     def get_active_sell_dialog(self):
-        """Find any stock item that has an open sell dialog"""
-        for stock_item in self.get_stock_items():
-            if stock_item.sell_dialog is not None:
-                return stock_item
-        return None
+        """Find the stock item that has an open sell dialog"""
+        return next(iter(self.current_stock_dialogs.values()), None)
     
     def on_stock_dialog_opened(self, stock_item):
         """Called when a stock item opens its dialog"""
         print(f"Dialog opened for {stock_item.get_stock_symbol()}")
-        self.current_stock_dialogs[stock_item] = True
+        self.current_stock_dialogs[stock_item.get_stock_symbol()] = stock_item
         
         # Connect the sell button
         if stock_item.sell_btn:
@@ -109,8 +156,8 @@ class PortfolioPresenter:
     def on_stock_dialog_closed(self, stock_item):
             """Called when a stock item closes its dialog"""
             print(f"Dialog closed for {stock_item.get_stock_symbol()}")
-            if stock_item in self.current_stock_dialogs:
-                del self.current_stock_dialogs[stock_item]
+            if self.current_stock_dialogs.get(stock_item.get_stock_symbol()) is stock_item:
+                del self.current_stock_dialogs[stock_item.get_stock_symbol()]
 
 
     def handle_sell_button_click(self, stock_item):
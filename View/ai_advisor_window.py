@@ -1,43 +1,405 @@
 # ai_advisor_window.py
 import sys
+from collections import OrderedDict
 from datetime import datetime
 from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton, QFrame, QHBoxLayout,
-                               QLabel, QScrollArea, QSizePolicy, QGraphicsDropShadowEffect,
-                               QLineEdit, QToolButton, QMenu, QSpacerItem)
-from PySide6.QtGui import (QColor, QPixmap, QPainter, QPen, QFont, QPainterPath, QCursor, QBrush, QIcon)
-from PySide6.QtCore import (Qt, QRect, QSize, QTimer, Signal, QPropertyAnimation, QEasingCurve)
+                               QLabel, QSizePolicy, QGraphicsDropShadowEffect, QLineEdit, QToolButton,
+                               QMenu, QListView, QAbstractItemView, QStyledItemDelegate)
+from PySide6.QtGui import (QColor, QPainter, QPen, QFont, QPainterPath, QTextDocument, QTextOption,
+                           QPalette, QAbstractTextDocumentLayout, QFontMetrics)
+from PySide6.QtCore import (Qt, QRect, QRectF, QSize, QTimer, Signal, QAbstractListModel, QModelIndex,
+                            QEvent)
 
 # Import shared components
 from View.shared_components import ColorPalette, GlobalStyle, AvatarWidget
 
 
-class ChatBubbleAnimation(QPropertyAnimation):
-    """Animation for chat bubbles when they appear"""
-    def __init__(self, target, duration=150):
-        super().__init__(target, b"maximumHeight")
-        self.setDuration(duration)
-        self.setStartValue(0)
-        self.setEndValue(target.sizeHint().height())
-        self.setEasingCurve(QEasingCurve.OutQuad)
+class ChatMessageModel(QAbstractListModel):
+    """Messages of the advisor chat, oldest first.
+
+    Each message is a dict with an `id`, its `sender` ("ai", "user", or
+    "typing" for the thinking indicator, which is always the last row), the
+    `text`, the `time` it was added and a `state`: for questions while they
+    wait for their answer ("queued", "sending") or if they were "cancelled",
+    for answers "cached" when they came from the response cache.
+    """
+    MessageRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.messages = []
+        self.typing_phase = 0
+        self._next_id = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.messages)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self.messages[index.row()]
+        if role == self.MessageRole:
+            return message
+        if role == Qt.DisplayRole:
+            return message["text"]
+        return None
+
+    def is_typing(self):
+        return bool(self.messages) and self.messages[-1]["sender"] == "typing"
+
+    def add_message(self, sender, text, state=None):
+        """Append a message (above the thinking indicator, if it's showing), returns its id"""
+        row = len(self.messages) - 1 if self.is_typing() else len(self.messages)
+        message = self._message(sender, text)
+        message["state"] = state
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.messages.insert(row, message)
+        self.endInsertRows()
+        return message["id"]
+
+    def set_state(self, message_id, state):
+        """Change the state of a question, only its row repaints"""
+        # Questions waiting for an answer are near the end
+        for row in range(len(self.messages) - 1, -1, -1):
+            if self.messages[row]["id"] == message_id:
+                self.messages[row]["state"] = state
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+                return
+
+    def set_typing(self, typing):
+        """Show or hide the thinking indicator at the end of the chat"""
+        if typing == self.is_typing():
+            return
+        row = len(self.messages) - 1 if not typing else len(self.messages)
+        if typing:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.messages.append(self._message("typing", ""))
+            self.endInsertRows()
+        else:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.messages.pop()
+            self.endRemoveRows()
+
+    def advance_typing(self):
+        """Next frame of the thinking dots - only the indicator's row repaints"""
+        if not self.is_typing():
+            return
+        self.typing_phase = (self.typing_phase + 1) % 3
+        index = self.index(len(self.messages) - 1)
+        self.dataChanged.emit(index, index)
+
+    def insert_messages(self, row, messages):
+        """Insert stored messages ({'sender', 'text', 'created'} dicts) at `row`"""
+        if not messages:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(messages) - 1)
+        self.messages[row:row] = [self._message(message["sender"], message["text"], message.get("created"))
+                                  for message in messages]
+        self.endInsertRows()
+
+    def clear(self, keep=0):
+        """Drop every message but the first `keep` ones"""
+        if len(self.messages) <= keep:
+            return
+        self.beginRemoveRows(QModelIndex(), keep, len(self.messages) - 1)
+        del self.messages[keep:]
+        self.endRemoveRows()
+
+    def _message(self, sender, text, created=None):
+        self._next_id += 1
+        sent = datetime.fromtimestamp(created) if created else datetime.now()
+        return {"id": self._next_id, "sender": sender, "text": text, "time": sent.strftime("%I:%M %p"),
+                "state": None}
+
+
+class ChatBubbleDelegate(QStyledItemDelegate):
+    """Paints chat bubbles like the old QFrame/QLabel ones, without any widgets per message.
+
+    The text of a message is laid out once per width in a QTextDocument
+    (markdown for the AI) and kept in a small LRU, so scrolling and repaints
+    don't lay it out again; heights are kept per message for the width they
+    were measured at, so a resize only measures each message once.
+    """
+    MARGIN = 20   # Around the transcript
+    SPACING = 20  # Above every bubble
+    AVATAR = 32
+    HEADER_SPACING = 10
+    TYPING_HEIGHT = 44
+    cancel_clicked = Signal(int)  # message id of a question whose Cancel was clicked
+
+    def __init__(self, parent=None, max_documents=64):
+        super().__init__(parent)
+        self.max_documents = max_documents
+        self._documents = OrderedDict()  # (message id, text width) -> QTextDocument
+        self._heights = {}  # message id -> (text width, text height)
+        self.text_font = self._font(14)
+        self.name_font = self._font(13, bold=True)
+        self.time_font = self._font(11)
+        self.typing_font = self._font(13)
+        self.status_font = self._font(12)
+        self.link_font = self._font(12, bold=True)
+        self.dot_font = self._font(18)
+        self.avatar_font = QFont()
+        self.avatar_font.setBold(True)
+
+    @staticmethod
+    def _font(pixel_size, bold=False):
+        font = QFont()
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+    @staticmethod
+    def _padding(message):
+        return 16 if message["sender"] == "user" else 15
+
+    def _view_width(self, option):
+        view = option.widget
+        return view.viewport().width() if view is not None else option.rect.width()
+
+    def _text_width(self, message, row_width):
+        return max(50, row_width - 2 * self.MARGIN - 2 * self._padding(message))
+
+    def _document(self, message, text_width):
+        key = (message["id"], text_width)
+        document = self._documents.get(key)
+        if document is not None:
+            self._documents.move_to_end(key)
+            return document
+
+        document = QTextDocument()
+        document.setDocumentMargin(0)
+        document.setDefaultFont(self.text_font)
+        if message["sender"] == "user":
+            option = QTextOption(Qt.AlignRight)
+            option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+            document.setDefaultTextOption(option)
+            document.setPlainText(message["text"])
+        else:
+            document.setMarkdown(message["text"])
+        document.setTextWidth(text_width)
+
+        self._documents[key] = document
+        while len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
+        self._heights[message["id"]] = (text_width, int(document.size().height() + 0.5))
+        return document
+
+    def _text_height(self, message, text_width):
+        measured = self._heights.get(message["id"])
+        if measured is None or measured[0] != text_width:
+            self._document(message, text_width)
+            measured = self._heights[message["id"]]
+        return measured[1]
+
+    def retain(self, message_ids):
+        """Drop the cached layouts of every message not in `message_ids`"""
+        message_ids = set(message_ids)
+        for key in [key for key in self._documents if key[0] not in message_ids]:
+            del self._documents[key]
+        for message_id in [message_id for message_id in self._heights if message_id not in message_ids]:
+            del self._heights[message_id]
+
+    def sizeHint(self, option, index):
+        message = index.data(ChatMessageModel.MessageRole)
+        width = self._view_width(option)
+        if not message:
+            return QSize(width, 0)
+        if message["sender"] == "typing":
+            return QSize(width, self.SPACING + self.TYPING_HEIGHT)
+        padding = self._padding(message)
+        text_height = self._text_height(message, self._text_width(message, width))
+        return QSize(width, self.SPACING + 2 * padding + self.AVATAR + self.HEADER_SPACING + text_height)
+
+    def paint(self, painter, option, index):
+        message = index.data(ChatMessageModel.MessageRole)
+        if not message:
+            return
+        bubble = option.rect.adjusted(self.MARGIN, self.SPACING, -self.MARGIN, 0)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        if message["sender"] == "typing":
+            self._paint_typing(painter, bubble, index.model().typing_phase)
+        elif message["sender"] == "user":
+            self._paint_user(painter, bubble, message)
+        else:
+            self._paint_ai(painter, bubble, message)
+        painter.restore()
+
+    def _cancel_rect(self, header):
+        """Where a waiting question's Cancel link is, at the left of its header"""
+        return QRect(header.left(), header.top(), QFontMetrics(self.link_font).horizontalAdvance("Cancel"),
+                     header.height())
+
+    def editorEvent(self, event, model, option, index):
+        message = index.data(ChatMessageModel.MessageRole)
+        if event.type() == QEvent.MouseButtonRelease and message and message["state"] in ("queued", "sending"):
+            padding = self._padding(message)
+            header = QRect(option.rect.left() + self.MARGIN + padding, option.rect.top() + self.SPACING + padding,
+                           option.rect.width() - 2 * (self.MARGIN + padding), self.AVATAR)
+            if self._cancel_rect(header).contains(event.position().toPoint()):
+                self.cancel_clicked.emit(message["id"])
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def _bubble_path(self, rect, top_left_radius=12):
+        """Rounded rect with a tighter top-left corner, like the AI bubbles' stylesheet"""
+        rect = QRectF(rect)
+        path = QPainterPath()
+        path.addRoundedRect(rect, 12, 12)
+        if top_left_radius != 12:
+            corner = QPainterPath()
+            corner.addRect(QRectF(rect.left(), rect.top(), 12, 12))
+            rounded = QPainterPath()
+            rounded.addRoundedRect(QRectF(rect.left(), rect.top(), 24, 24), top_left_radius, top_left_radius)
+            path = path.united(corner.intersected(rounded))
+        return path
+
+    def _paint_shadow(self, painter, path, alpha):
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(0, 0, 0, alpha))
+        painter.drawPath(path.translated(0, 2))
+
+    def _paint_avatar(self, painter, rect, initials, color):
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(color))
+        painter.drawEllipse(rect)
+        self.avatar_font.setPointSize(max(1, rect.width() // 3))
+        painter.setFont(self.avatar_font)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignCenter, initials)
+
+    def _paint_text(self, painter, message, content, color):
+        text_top = content.top() + self.AVATAR + self.HEADER_SPACING
+        document = self._document(message, max(50, content.width()))
+        painter.translate(content.left(), text_top)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.Text, QColor(color))
+        context.clip = QRectF(0, 0, content.width(), content.bottom() - text_top + 1)
+        document.documentLayout().draw(painter, context)
+        painter.translate(-content.left(), -text_top)
+
+    def _paint_ai(self, painter, bubble, message):
+        path = self._bubble_path(bubble, top_left_radius=4)
+        self._paint_shadow(painter, path, 30)
+        painter.setBrush(QColor(ColorPalette.CARD_BG_DARKER))
+        painter.drawPath(path)
+
+        padding = self._padding(message)
+        content = bubble.adjusted(padding, padding, -padding, -padding)
+        header = QRect(content.left(), content.top(), content.width(), self.AVATAR)
+
+        # Avatar, name and timestamp
+        self._paint_avatar(painter, QRect(header.left(), header.top(), self.AVATAR, self.AVATAR),
+                           "A", ColorPalette.ACCENT_INFO)
+        painter.setFont(self.name_font)
+        painter.setPen(QColor(ColorPalette.TEXT_PRIMARY))
+        painter.drawText(header.adjusted(self.AVATAR + 10, 0, 0, 0), Qt.AlignLeft | Qt.AlignVCenter,
+                         "Financial AI")
+
+        # Answered from the response cache
+        if message["state"] == "cached":
+            left = header.left() + self.AVATAR + 10 + painter.fontMetrics().horizontalAdvance("Financial AI") + 10
+            painter.setFont(self.status_font)
+            tag = QRect(left, header.center().y() - 10, painter.fontMetrics().horizontalAdvance("Cached") + 12, 20)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(255, 255, 255, 20))
+            painter.drawRoundedRect(tag, 4, 4)
+            painter.setPen(QColor(ColorPalette.TEXT_SECONDARY))
+            painter.drawText(tag, Qt.AlignCenter, "Cached")
+        painter.setFont(self.time_font)
+        painter.setPen(QColor(ColorPalette.TEXT_MUTED))
+        painter.drawText(header, Qt.AlignRight | Qt.AlignVCenter, message["time"])
+
+        self._paint_text(painter, message, content, ColorPalette.TEXT_PRIMARY)
+
+    def _paint_user(self, painter, bubble, message):
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(QColor(ColorPalette.BORDER_LIGHT), 1))
+        painter.drawPath(self._bubble_path(QRectF(bubble).adjusted(0.5, 0.5, -0.5, -0.5)))
+
+        padding = self._padding(message)
+        content = bubble.adjusted(padding, padding, -padding, -padding)
+        header = QRect(content.left(), content.top(), content.width(), self.AVATAR)
+
+        # Timestamp, name and avatar, right aligned
+        avatar = QRect(header.right() - self.AVATAR + 1, header.top(), self.AVATAR, self.AVATAR)
+        self._paint_avatar(painter, avatar, "J", ColorPalette.ACCENT_PRIMARY)
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("white"))
+        name_right = avatar.left() - 10
+        painter.drawText(QRect(header.left(), header.top(), name_right - header.left(), self.AVATAR),
+                         Qt.AlignRight | Qt.AlignVCenter, "You")
+        time_right = name_right - painter.fontMetrics().horizontalAdvance("You") - 10
+        painter.setFont(self.time_font)
+        painter.setPen(QColor(255, 255, 255, 204))
+        painter.drawText(QRect(header.left(), header.top(), time_right - header.left(), self.AVATAR),
+                         Qt.AlignRight | Qt.AlignVCenter, message["time"])
+
+        # Whether the question is still waiting for its answer
+        if message["state"] in ("queued", "sending"):
+            cancel = self._cancel_rect(header)
+            painter.setFont(self.link_font)
+            painter.setPen(QColor(ColorPalette.ACCENT_DANGER))
+            painter.drawText(cancel, Qt.AlignLeft | Qt.AlignVCenter, "Cancel")
+            if message["state"] == "queued":
+                painter.setFont(self.status_font)
+                painter.setPen(QColor(ColorPalette.TEXT_MUTED))
+                painter.drawText(header.adjusted(cancel.width() + 10, 0, 0, 0), Qt.AlignLeft | Qt.AlignVCenter,
+                                 "Queued")
+        elif message["state"] == "cancelled":
+            painter.setFont(self.status_font)
+            painter.setPen(QColor(ColorPalette.TEXT_MUTED))
+            painter.drawText(header, Qt.AlignLeft | Qt.AlignVCenter, "Cancelled")
+
+        self._paint_text(painter, message, content, "white")
+
+    def _paint_typing(self, painter, bubble, phase):
+        bubble = bubble.adjusted(0, 0, -200, 0)
+        path = self._bubble_path(bubble, top_left_radius=4)
+        self._paint_shadow(painter, path, 30)
+        painter.setBrush(QColor(ColorPalette.CARD_BG_DARKER))
+        painter.drawPath(path)
+
+        content = bubble.adjusted(15, 10, -15, -10)
+        self._paint_avatar(painter, QRect(content.left(), content.center().y() - 11, 24, 24),
+                           "A", ColorPalette.ACCENT_INFO)
+        left = content.left() + 34
+        painter.setFont(self.typing_font)
+        painter.setPen(QColor(ColorPalette.TEXT_SECONDARY))
+        painter.drawText(QRect(left, content.top(), content.width(), content.height()),
+                         Qt.AlignLeft | Qt.AlignVCenter, "Thinking")
+        left += painter.fontMetrics().horizontalAdvance("Thinking") + 6
+
+        # Three dots, the brightest one moving along
+        painter.setFont(self.dot_font)
+        dot_width = painter.fontMetrics().horizontalAdvance("•") + 2
+        for i in range(3):
+            color = QColor(ColorPalette.TEXT_SECONDARY)
+            color.setAlphaF((0.3, 0.6, 0.9)[(i - phase) % 3])
+            painter.setPen(color)
+            painter.drawText(QRect(left + i * dot_width, content.top(), dot_width, content.height()),
+                             Qt.AlignCenter, "•")
 
 
 class AIAdvisorWindow(QWidget):
-    message_sent = Signal(str)
+    message_sent = Signal(str, int)  # (text, message id)
+    question_cancelled = Signal(int)  # message id of a question the user cancelled
+    older_messages_requested = Signal()  # Scrolled near the top while older messages exist
+    chat_cleared = Signal()
     def __init__(self, parent=None): 
         super().__init__(parent)
         self.setWindowTitle("AI Financial Advisor - StockMaster Pro")
         self.setMinimumSize(1300, 650)
 
-        # Store chat message history
-        self.chat_history = []
+        # Chat messages, shown by the message list
+        self.chat_model = ChatMessageModel(self)
 
-        # Create typing indicator
-        self.typing_indicator = None
-        self.ai_thinking_timer = QTimer(self)
-        self.ai_thinking_timer.timeout.connect(self.add_ai_response)
-
-        self.typing_indicator = None
-        self.ai_thinking_timer = QTimer(self)
+        # Animates the dots of the thinking indicator
+        self.typing_timer = QTimer(self)
+        self.typing_timer.setInterval(300)
+        self.typing_timer.timeout.connect(self.chat_model.advance_typing)
 
         # Set dark theme with dashboard matching style
         self.setStyleSheet(f"""
@@ -244,38 +606,44 @@ class AIAdvisorWindow(QWidget):
         header_layout.addStretch()
         header_layout.addWidget(topic_btn)
 
-        # Messages area
-        self.messages_area = QScrollArea()
-        self.messages_area.setWidgetResizable(True)
-        self.messages_area.setFrameShape(QFrame.NoFrame)
-        self.messages_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.messages_area.setStyleSheet(f"""
-            QScrollArea {{
+        # Messages area - a list view only lays out and paints the bubbles in sight
+        self.message_list = QListView()
+        self.message_list.setModel(self.chat_model)
+        self.message_delegate = ChatBubbleDelegate(self.message_list)
+        self.message_list.setItemDelegate(self.message_delegate)
+        self.message_delegate.cancel_clicked.connect(self.question_cancelled)
+        self.message_list.setFrameShape(QFrame.NoFrame)
+        self.message_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.message_list.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.message_list.setSelectionMode(QAbstractItemView.NoSelection)
+        self.message_list.setFocusPolicy(Qt.NoFocus)
+        self.message_list.setResizeMode(QListView.Adjust)
+        self.message_list.setLayoutMode(QListView.Batched)
+        self.message_list.setBatchSize(50)
+        self.message_list.setViewportMargins(0, 0, 0, ChatBubbleDelegate.MARGIN)
+        self.message_list.setStyleSheet(f"""
+            QListView {{
                 background-color: {ColorPalette.BG_CARD};
                 border: none;
             }}
-            QScrollArea > QWidget > QWidget {{
-                background-color: {ColorPalette.BG_CARD};
-            }}
         """)
-
-        # Message container
-        self.message_container = QWidget()
-        self.message_layout = QVBoxLayout(self.message_container)
-        self.message_layout.setContentsMargins(20, 20, 20, 20)
-        self.message_layout.setSpacing(20)
+        self.chat_model.rowsRemoved.connect(self._forget_removed_messages)
+
+        # Long chats are laid out in batches, so stay at the bottom while the list grows
+        # (or, after older messages were put on top, at the same distance from it)
+        self._follow_bottom = True
+        self._anchor_offset = None
+        self._adjusting_scroll = False
+        self._has_older = False
+        self._loading_older = False
+        scroll_bar = self.message_list.verticalScrollBar()
+        scroll_bar.rangeChanged.connect(self._keep_at_bottom)
+        scroll_bar.valueChanged.connect(self._on_messages_scrolled)
 
         # Welcome message
-        welcome_message = self._create_ai_message(
-            "Hello! I'm your AI financial advisor. I can help you with investment strategies, portfolio analysis, market trends, and financial planning. How can I assist you today?"
+        self.chat_model.add_message(
+            "ai", "Hello! I'm your AI financial advisor. I can help you with investment strategies, portfolio analysis, market trends, and financial planning. How can I assist you today?"
         )
-        self.message_layout.addWidget(welcome_message)
-        self.chat_history.append(("ai", "Hello! I'm your AI financial advisor. I can help you with investment strategies, portfolio analysis, market trends, and financial planning. How can I assist you today?"))
-
-        # Add spacer to push messages up
-        self.message_layout.addStretch()
-
-        self.messages_area.setWidget(self.message_container)
 
         # Chat input area matching dashboard style
         input_area = QFrame()
@@ -311,129 +679,11 @@ class AIAdvisorWindow(QWidget):
 
         # Add all elements to chat layout
         chat_layout.addWidget(chat_header)
-        chat_layout.addWidget(self.messages_area, 1)  # 1 = stretch factor
+        chat_layout.addWidget(self.message_list, 1)  # 1 = stretch factor
         chat_layout.addWidget(input_area)
 
         return chat_card
 
-    def _create_ai_message(self, text):
-        """Create an AI message bubble matching dashboard style"""
-        message = QFrame()
-        message.setStyleSheet(f"""
-            background-color: {ColorPalette.CARD_BG_DARKER};
-            border-radius: 12px;
-            border-top-left-radius: 4px;
-        """)
-
-        # Add subtle shadow for depth
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setColor(QColor(0, 0, 0, 30))
-        shadow.setOffset(0, 2)
-        message.setGraphicsEffect(shadow)
-
-        message_layout = QVBoxLayout(message)
-        message_layout.setContentsMargins(15, 15, 15, 15)
-        message_layout.setSpacing(10)
-
-        # Header with avatar and timestamp
-        header_layout = QHBoxLayout()
-        header_layout.setContentsMargins(0, 0, 0, 0)
-        header_layout.setSpacing(10)
-
-        # AI avatar with accent color
-        avatar = AvatarWidget("AI", size=32, background_color=ColorPalette.ACCENT_INFO)
-
-        # AI name
-        name_label = QLabel("Financial AI")
-        name_label.setStyleSheet(f"color: {ColorPalette.TEXT_PRIMARY}; font-weight: bold; font-size: 13px;")
-
-        # Timestamp
-        time_label = QLabel(datetime.now().strftime("%I:%M %p"))
-        time_label.setStyleSheet(f"color: {ColorPalette.TEXT_MUTED}; font-size: 11px;")
-
-        header_layout.addWidget(avatar)
-        header_layout.addWidget(name_label)
-        header_layout.addStretch()
-        header_layout.addWidget(time_label)
-
-        # Message text
-        text_label = QLabel(text)
-        text_label.setStyleSheet(f"""
-            color: {ColorPalette.TEXT_PRIMARY};
-            font-size: 14px;
-            line-height: 1.5;
-        """)
-        text_label.setWordWrap(True)
-        text_label.setTextFormat(Qt.MarkdownText)
-
-        message_layout.addLayout(header_layout)
-        message_layout.addWidget(text_label)
-
-        return message
-
-    def _create_user_message(self, text):
-        """Create a more attractive user message bubble with solid styling"""
-        message = QFrame()
-        message.setStyleSheet(f"""
-            background-color: transparent;
-            border-radius: 12px;
-            border: 0.5px solid {ColorPalette.BORDER_LIGHT};
-        """)
-
-        # Add subtle shadow for depth
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        shadow.setOffset(0, 2)
-        message.setGraphicsEffect(shadow)
-
-        message_layout = QVBoxLayout(message)
-        message_layout.setContentsMargins(16, 16, 16, 16)
-        message_layout.setSpacing(10)
-
-        # Header with avatar and timestamp
-        header_layout = QHBoxLayout()
-        header_layout.setContentsMargins(0, 0, 0, 0)
-        header_layout.setSpacing(10)
-
-        # User name
-        name_label = QLabel("You")
-        name_label.setStyleSheet("color: white; font-weight: bold; font-size: 13px; border: none;")
-
-        # Timestamp
-        time_label = QLabel(datetime.now().strftime("%I:%M %p"))
-        time_label.setStyleSheet("color: rgba(255, 255, 255, 0.8); font-size: 11px; border: none;")
-
-        # User avatar - with solid dark blue border
-        avatar = AvatarWidget("JD", size=32)
-        avatar_layout = QHBoxLayout()
-        avatar_layout.setContentsMargins(0, 0, 0, 0)
-        avatar_layout.setSpacing(0)
-        avatar_layout.addWidget(avatar)
-
-        # Add items to header
-        header_layout.addStretch()
-        header_layout.addWidget(time_label)
-        header_layout.addWidget(name_label)
-        header_layout.addLayout(avatar_layout)
-
-        # Message text
-        text_label = QLabel(text)
-        text_label.setStyleSheet("""
-            color: white;
-            font-size: 14px;
-            line-height: 1.5;
-            border: none;
-        """)
-        text_label.setWordWrap(True)
-        text_label.setAlignment(Qt.AlignRight)
-
-        message_layout.addLayout(header_layout)
-        message_layout.addWidget(text_label)
-
-        return message
-
     def get_send_btn(self):
         """Return the send button for testing purposes"""
         return self.send_btn
@@ -442,148 +692,25 @@ class AIAdvisorWindow(QWidget):
         return self.input_field
 
 
-    def _create_typing_indicator(self):
-        """Create a typing indicator that shows AI is thinking with animated dots"""
-        message = QFrame()
-        message.setStyleSheet(f"""
-            background-color: {ColorPalette.CARD_BG_DARKER};
-            border-radius: 12px;
-            border-top-left-radius: 4px;
-            margin-right: 200px;
-        """)
-
-        # Add subtle shadow for depth
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setColor(QColor(0, 0, 0, 30))
-        shadow.setOffset(0, 2)
-        message.setGraphicsEffect(shadow)
-
-        message_layout = QHBoxLayout(message)
-        message_layout.setContentsMargins(15, 10, 15, 10)
-        message_layout.setSpacing(10)
-
-        # AI avatar with accent color
-        avatar = AvatarWidget("AI", size=24, background_color=ColorPalette.ACCENT_INFO)
-
-        # Create the typing animation container
-        typing_container = QWidget()
-        typing_container.setStyleSheet("background-color: transparent;")
-        typing_layout = QHBoxLayout(typing_container)
-        typing_layout.setContentsMargins(0, 0, 0, 0)
-        typing_layout.setSpacing(2)
-        
-        # "Thinking" label
-        thinking_label = QLabel("Thinking")
-        thinking_label.setStyleSheet(f"color: {ColorPalette.TEXT_SECONDARY}; font-size: 13px;")
-        
-        # Create dots for animation
-        self.animated_dots = []
-        for i in range(3):
-            dot = QLabel("•")
-            dot.setStyleSheet(f"""
-                color: {ColorPalette.TEXT_SECONDARY};
-                font-size: 18px;
-                opacity: 0.{3+i};
-            """)
-            typing_layout.addWidget(dot)
-            self.animated_dots.append(dot)
-        
-        # Create and start the animation timer
-        self.dot_animation_timer = QTimer(self)
-        self.dot_animation_timer.timeout.connect(self._animate_typing_dots)
-        self.dot_animation_timer.start(300)  # Update every 300ms
-        
-        # Add components to layout
-        message_layout.addWidget(avatar)
-        message_layout.addWidget(thinking_label)
-        message_layout.addWidget(typing_container)
-        message_layout.addStretch()
-
-        return message
-
-    def _animate_typing_dots(self):
-        """Animate the typing indicator dots with a pulsing effect"""
-        if not hasattr(self, 'animated_dots') or not self.animated_dots:
-            return
-            
-        # Get current opacities and cycle them
-        opacities = []
-        for dot in self.animated_dots:
-            style = dot.styleSheet()
-            if "opacity: 0.3" in style:
-                opacities.append(0.3)
-            elif "opacity: 0.6" in style:
-                opacities.append(0.6)
-            else:
-                opacities.append(0.9)
-        
-        # Rotate opacities (first becomes last)
-        opacities = opacities[1:] + [opacities[0]]
-        
-        # Apply new opacities
-        for i, dot in enumerate(self.animated_dots):
-            dot.setStyleSheet(f"""
-                color: {ColorPalette.TEXT_SECONDARY};
-                font-size: 18px;
-                opacity: {opacities[i]};
-            """)
-
     def _send_message(self):
         """Handle send button click or Enter key press"""
         message_text = self.input_field.text().strip()
         if not message_text:
             return
-        
+
         # Add user message to chat
-        user_message = self._create_user_message(message_text)
-        
-        # Remove stretch spacer if it exists
-        if self.message_layout.count() > 0 and isinstance(
-                self.message_layout.itemAt(self.message_layout.count()-1), 
-                QSpacerItem):
-            spacer = self.message_layout.itemAt(self.message_layout.count()-1)
-            self.message_layout.removeItem(spacer)
-        
-        self.message_layout.addWidget(user_message)
-        self.chat_history.append(("user", message_text))
-        
+        message_id = self.add_user_message(message_text)
+
         # Clear input field
         self.input_field.clear()
-        
+
         # Emit signal with the message - this will notify the presenter
-        self.message_sent.emit(message_text)
-        
-        # Scroll to bottom
-        QTimer.singleShot(50, self._scroll_to_bottom)
+        self.message_sent.emit(message_text, message_id)
 
     def add_ai_response(self, response):
         """Add AI response after thinking animation"""
-        # Remove typing indicator
-        if self.typing_indicator:
-            self.typing_indicator.setVisible(False)
-            self.message_layout.removeWidget(self.typing_indicator)
-            self.typing_indicator.deleteLater()
-            self.typing_indicator = None
-        
-        # Format the response if it's a dict
-        response_text = response
-        if isinstance(response, dict):
-            if 'advice' in response:
-                response_text = response['advice']
-            elif 'answer' in response:
-                response_text = response['answer']
-        
-        # Add AI response
-        ai_message = self._create_ai_message(response_text)
-        self.message_layout.addWidget(ai_message)
-        self.chat_history.append(("ai", response_text))
-        
-        # Add stretch spacer back
-        self.message_layout.addStretch()
-        
-        # Scroll to bottom
-        QTimer.singleShot(100, self._scroll_to_bottom)
+        self.hide_typing_indicator()
+        self.add_ai_message(response)
 
     def _generate_ai_response(self, user_message):
         """Generate an appropriate AI response based on the user message"""
@@ -631,78 +758,90 @@ class AIAdvisorWindow(QWidget):
 
     def _clear_chat(self):
         """Clear the chat history"""
-        # Remove all message widgets except the first welcome message
-        while self.message_layout.count() > 2:  # 1 for welcome message + 1 for stretch
-            item = self.message_layout.itemAt(1)  # Skip the first item (welcome message)
-            if item.widget():
-                widget = item.widget()
-                self.message_layout.removeWidget(widget)
-                widget.deleteLater()
-
-        # Reset chat history to just the welcome message
-        self.chat_history = [self.chat_history[0]] if self.chat_history else []
+        # Keep only the welcome message (and the thinking indicator of a pending answer)
+        typing = self.chat_model.is_typing()
+        self.chat_model.clear(keep=1)
+        self.chat_model.set_typing(typing)
+        self._has_older = False
+        self.chat_cleared.emit()
 
         # Clear the input field
         self.input_field.clear()
 
+    def _forget_removed_messages(self, parent, first, last):
+        """Removed messages' layouts aren't needed anymore"""
+        self.message_delegate.retain(message["id"] for message in self.chat_model.messages)
+
     def _scroll_to_bottom(self):
         """Scroll the message area to the bottom"""
-        self.messages_area.verticalScrollBar().setValue(
-            self.messages_area.verticalScrollBar().maximum()
-        )
+        self._follow_bottom = True
+        self.message_list.scrollToBottom()
+
+    def _keep_at_bottom(self, minimum, maximum):
+        if self._follow_bottom:
+            offset = 0
+        elif self._anchor_offset is not None:
+            offset = self._anchor_offset
+        else:
+            return
+        self._adjusting_scroll = True
+        self.message_list.verticalScrollBar().setValue(maximum - offset)
+        self._adjusting_scroll = False
+
+    def _on_messages_scrolled(self, value):
+        if self._adjusting_scroll:
+            return
+        # Scrolling up to read stops following new messages until the next one is added
+        self._follow_bottom = value >= self.message_list.verticalScrollBar().maximum() - 4
+        self._anchor_offset = None
+        if value < 200 and self._has_older and not self._loading_older:
+            self._loading_older = True
+            self.older_messages_requested.emit()
+
+    def show_history(self, messages, has_older):
+        """Show stored messages (the latest page of a session) below the welcome message"""
+        self.chat_model.clear(keep=1)
+        self.chat_model.insert_messages(1, messages)
+        self._has_older = has_older
+        self._loading_older = False
+        self._scroll_to_bottom()
+
+    def add_older_messages(self, messages, has_older):
+        """Put a page of older messages above the ones shown, without moving what's in view"""
+        scroll_bar = self.message_list.verticalScrollBar()
+        if not self._follow_bottom:
+            self._anchor_offset = scroll_bar.maximum() - scroll_bar.value()
+        self.chat_model.insert_messages(1, messages)
+        self._has_older = has_older
+        self._loading_older = False
 
     def add_user_message(self, message_text):
-        """Add a user message to the chat"""
-        # Create and add user message widget
-        user_message = self._create_user_message(message_text)
-        
-        # Remove stretch spacer if it exists
-        if self.message_layout.count() > 0 and isinstance(self.message_layout.itemAt(self.message_layout.count()-1), QSpacerItem):
-            spacer = self.message_layout.itemAt(self.message_layout.count()-1)
-            self.message_layout.removeItem(spacer)
-        
-        # Add the message
-        self.message_layout.addWidget(user_message)
-        self.chat_history.append(("user", message_text))
-        
+        """Add a user message to the chat, returns its id"""
+        message_id = self.chat_model.add_message("user", message_text)
+
         # Scroll to bottom
-        QTimer.singleShot(100, self._scroll_to_bottom)
+        QTimer.singleShot(50, self._scroll_to_bottom)
+        return message_id
+
+    def set_question_state(self, message_id, state):
+        """Show whether a question is queued, being answered (sending), cancelled, or done (None)"""
+        self.chat_model.set_state(message_id, state)
 
     def show_typing_indicator(self):
         """Show the typing indicator"""
-        # Remove existing indicator if any
-        self.hide_typing_indicator()
-        
-        # Remove stretch spacer if it exists
-        if self.message_layout.count() > 0 and isinstance(
-                self.message_layout.itemAt(self.message_layout.count()-1), 
-                QSpacerItem):
-            spacer = self.message_layout.itemAt(self.message_layout.count()-1)
-            self.message_layout.removeItem(spacer)
-        
-        # Create and add new typing indicator
-        self.typing_indicator = self._create_typing_indicator()
-        self.message_layout.addWidget(self.typing_indicator)
-        
+        self.chat_model.set_typing(True)
+        self.typing_timer.start()
+
         # Scroll to bottom
         QTimer.singleShot(50, self._scroll_to_bottom)
 
     def hide_typing_indicator(self):
         """Hide and remove the typing indicator"""
-        if self.typing_indicator:
-            # Stop the dot animation
-            if hasattr(self, 'dot_animation_timer') and self.dot_animation_timer.isActive():
-                self.dot_animation_timer.stop()
-            
-            # Clean up the indicator
-            self.typing_indicator.setVisible(False)
-            self.message_layout.removeWidget(self.typing_indicator)
-            self.typing_indicator.deleteLater()
-            self.typing_indicator = None
-            self.animated_dots = []
-
-    def add_ai_message(self, response):
-        """Add an AI message with the given response"""
+        self.typing_timer.stop()
+        self.chat_model.set_typing(False)
+
+    def add_ai_message(self, response, cached=False):
+        """Add an AI message with the given response (`cached` tags it as answered from the cache)"""
         # Format the response if needed
         formatted_response = response
         if isinstance(response, dict):
@@ -710,21 +849,11 @@ class AIAdvisorWindow(QWidget):
                 formatted_response = response['advice']
             elif 'answer' in response:
                 formatted_response = response['answer']
-        
-        # Create and add AI message
-        ai_message = self._create_ai_message(formatted_response)
-        self.message_layout.addWidget(ai_message)
-        self.chat_history.append(("ai", formatted_response))
-        
-        # Add stretch spacer back
-        self.message_layout.addStretch()
-        
+
+        self.chat_model.add_message("ai", formatted_response, state="cached" if cached else None)
+
         # Scroll to bottom
         QTimer.singleShot(100, self._scroll_to_bottom)
-        
-        # Animate the new message
-        animation = ChatBubbleAnimation(ai_message)
-        animation.start()
 
     def clear_input(self):
         """Clear the input field"""
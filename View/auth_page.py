@@ -832,24 +832,12 @@ class LoginWindow(QWidget):
         self._reset_input_style(page, "email_input")
         self._reset_input_style(page, "password_input")
 
-    def navigate_to_home(self, user, user_stocks, user_transactions, firebaseUserId, balance, stocks_the_user_has, ai_advice, history):
-        """Navigate to the home screen with the user's email"""
+    def navigate_to_home(self, user, firebaseUserId):
+        """Open the home screen right away, its cards load their data in the background"""
         from View.home_page import MainWindow
 
-        print("History in the view:", history)
-        
-        # Create the home window (don't show yet)
-        self.home_window = MainWindow(user, user_stocks, user_transactions, firebaseUserId, balance, stocks_the_user_has, ai_advice, history)
-        
-        # If loading overlay is active, update message
-        if self.loading_overlay and self.loading_overlay.isVisible():
-            self.loading_overlay.message_label.setText("Opening dashboard...")
-            
-            # Use a timer to show the home window after a brief delay
-            QTimer.singleShot(800, self._complete_navigation)
-        else:
-            # If no loading overlay, just show the home window
-            self._complete_navigation()
+        self.home_window = MainWindow(user=user, firebaseUserId=firebaseUserId)
+        self._complete_navigation()
     
     def _complete_navigation(self):
         """Complete the navigation to the home screen"""
@@ -0,0 +1,153 @@
+"""
+chart_utils.py - Helpers shared by the QPainter charts
+"""
+from collections import OrderedDict
+from itertools import count
+
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap, QPainter
+
+POINTS_PER_PIXEL = 0.5  # One sampled point every 2px is as much detail as a line can show
+
+
+def lttb_indices(values, threshold):
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the shape of the series.
+
+    The first and last points are always kept. The points in between are split
+    into threshold - 2 buckets and from each bucket we keep the point forming the
+    largest triangle with the previously kept point and the average of the next
+    bucket, so peaks and troughs survive. The triangle areas of a bucket are
+    computed in one numpy operation; only the walk over the buckets is a loop.
+    """
+    y = np.asarray(values, dtype=float)
+    count = len(y)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    # threshold - 2 buckets over the points 1 .. count - 2
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.intp)
+    sizes = np.diff(edges)
+
+    # Average point of every bucket, the "next bucket" corner of each triangle
+    avg_y = np.add.reduceat(y[:count - 1], edges[:-1]) / sizes
+    avg_x = (edges[:-1] + edges[1:] - 1) / 2.0
+    next_x = np.append(avg_x[1:], count - 1)
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = count - 1
+
+    a_x, a_y = 0.0, y[0]
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        xs = np.arange(start, end, dtype=float)
+        # Twice the triangle area, the constant factor doesn't change the argmax
+        areas = np.abs((a_x - next_x[bucket]) * (y[start:end] - a_y)
+                       - (a_x - xs) * (next_y[bucket] - a_y))
+        chosen = start + int(np.argmax(areas))
+        selected[bucket + 1] = chosen
+        a_x, a_y = float(chosen), y[chosen]
+
+    return selected
+
+
+def target_point_count(width):
+    """How many points a chart `width` pixels wide should plot"""
+    return max(3, int(width * POINTS_PER_PIXEL))
+
+
+class DownsampleCache:
+    """LTTB results per (series version, pixel width).
+
+    Charts bump their series version whenever the data changes, so resizing back
+    and forth or repainting never runs the downsampler twice for the same width.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def indices(self, version, width, values):
+        """Indices of the points to plot for a series drawn `width` pixels wide"""
+        key = (version, int(width))
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        indices = lttb_indices(values, target_point_count(width))
+        self._entries[key] = indices
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return indices
+
+    def clear(self):
+        self._entries.clear()
+
+
+class RenderCache:
+    """Finished chart pixmaps keyed by (owner, data version, size, device pixel ratio).
+
+    A chart asks for its pixmap on every paint; the render function only runs
+    when the data, the size or the screen's pixel ratio changed, otherwise the
+    paint is a plain blit. Entries are evicted least recently used first once
+    their total size goes over `max_bytes`.
+    """
+
+    def __init__(self, max_bytes=48 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict()
+        self._owner_ids = count(1)
+
+    def new_owner(self, widget):
+        """Unique key for a widget's entries, freed when the widget is destroyed (id() gets reused)"""
+        owner = next(self._owner_ids)
+        widget.destroyed.connect(lambda: self.discard(owner))
+        return owner
+
+    def pixmap(self, owner, version, width, height, device_pixel_ratio, render):
+        """Cached pixmap for the key, calling render(painter, width, height) on a miss"""
+        width, height = int(width), int(height)
+        key = (owner, version, width, height, device_pixel_ratio)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        pixmap = QPixmap(max(1, round(width * device_pixel_ratio)), max(1, round(height * device_pixel_ratio)))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        try:
+            render(painter, width, height)
+        finally:
+            painter.end()
+
+        # Same data at another size is stale once the widget has been resized
+        for stale in [other for other in self._entries if other[:2] == (owner, version)]:
+            self.used_bytes -= self._size_of(self._entries.pop(stale))
+        self._entries[key] = pixmap
+        self.used_bytes += self._size_of(pixmap)
+        while self.used_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.used_bytes -= self._size_of(evicted)
+        return pixmap
+
+    def discard(self, owner):
+        """Drop every entry of an owner (e.g. when its widget is destroyed)"""
+        for key in [key for key in self._entries if key[0] == owner]:
+            self.used_bytes -= self._size_of(self._entries.pop(key))
+
+    def clear(self):
+        self._entries.clear()
+        self.used_bytes = 0
+
+    @staticmethod
+    def _size_of(pixmap):
+        return pixmap.width() * pixmap.height() * 4
+
+
+# One cache for every chart so the memory cap applies to the whole app
+render_cache = RenderCache()
@@ -4,6 +4,8 @@ import os
 import random
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton, QFrame, QHBoxLayout,
                                QLabel, QGridLayout, QScrollArea, QSizePolicy, QGraphicsDropShadowEffect,
                                QLayout, QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit, QMenu,
@@ -13,15 +15,18 @@ from PySide6.QtGui import (QColor, QPalette, QIcon, QPixmap, QPainter, QLinearGr
 from PySide6.QtCore import (Qt, QSize, QRect, QTimer, QPointF, QEvent, QPoint, QEasingCurve,
                             QPropertyAnimation, Signal, QUrl, QMargins)
 from PySide6.QtSvg import QSvgRenderer
-from View.ai_advisor_window import AIAdvisorWindow
-from View.stock_search_window import StockSearchWindow
-from View.shared_components import ColorPalette, GlobalStyle, AvatarWidget
-from View.protofilio_view import PortfolioPage
-from View.transaction_view import TransactionsPage
-from View.profile_page import ProfilePage
+from View.shared_components import ColorPalette, GlobalStyle, AvatarWidget, SkeletonBlock
+from View.chart_utils import DownsampleCache, render_cache
+from View.page_manager import PageManager
+from View.keyed_rows import KeyedRows
+from View.theme import apply_theme, set_role, set_state
+from Model.Protofilio.positions_engine import PositionsEngine
+from Model.Protofilio.lots_engine import LotsEngine
+from Model.Protofilio.performance_engine import trade_key
+from Model.Stocks.symbol_metadata import symbol_metadata
 from PySide6.QtCore import (Qt, QSize, QRect, QTimer, QPointF, QEvent, QPoint, QEasingCurve,
                             QPropertyAnimation, Signal, QUrl, QMargins)
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+from View.image_loader import image_loader
 from PySide6.QtSvg import QSvgRenderer
 
 
@@ -33,6 +38,7 @@ class SidebarButton(QPushButton):
         self.is_active = is_active
         self.setCursor(Qt.PointingHandCursor)
         self.setFixedHeight(50)
+        set_role(self, "nav", active=is_active)
 
         # Set icon if provided and exists
         if icon_name and os.path.exists(icon_name):
@@ -72,35 +78,7 @@ class SidebarButton(QPushButton):
 
     def update_styles(self):
         """Update button styles based on active state"""
-        if self.is_active:
-            self.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {ColorPalette.ACCENT_PRIMARY};
-                    color: {ColorPalette.TEXT_PRIMARY};
-                    border: none;
-                    border-radius: 8px;
-                    text-align: left;
-                    padding: 10px 15px;
-                }}
-                QPushButton:hover {{
-                    background-color: {ColorPalette.ACCENT_PRIMARY};
-                }}
-            """)
-        else:
-            self.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {ColorPalette.TEXT_SECONDARY};
-                    border: none;
-                    border-radius: 8px;
-                    text-align: left;
-                    padding: 10px 15px;
-                }}
-                QPushButton:hover {{
-                    background-color: rgba(255, 255, 255, 0.1);
-                    color: {ColorPalette.TEXT_PRIMARY};
-                }}
-            """)
+        set_state(self, "active", self.is_active)
 
     def setActive(self, active):
         """Set the active state of the button"""
@@ -119,7 +97,7 @@ class Card(QFrame):
         self.content = content
 
         # Setup styling
-        self.setStyleSheet(GlobalStyle.CARD_STYLE)
+        set_role(self, "card")
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
         # Add shadow effect
@@ -137,13 +115,13 @@ class Card(QFrame):
         # Title
         if title:
             title_label = QLabel(title)
-            title_label.setStyleSheet(GlobalStyle.SUBHEADER_STYLE)
+            set_role(title_label, "subheader")
             self.layout.addWidget(title_label)
 
         # Content
         if content:
             content_label = QLabel(content)
-            content_label.setStyleSheet(GlobalStyle.BODY_STYLE)
+            set_role(content_label, "body")
             content_label.setWordWrap(True)
             self.layout.addWidget(content_label)
 
@@ -152,12 +130,25 @@ class Card(QFrame):
 
 # Improved portfolio summary card with better space utilization
 class PortfolioSummaryCard(QFrame):
-    def __init__(self, user_stocks=None, stocks_data=None, history=None, parent=None):
+    def __init__(self, user_stocks=None, stocks_data=None, history=None, parent=None, positions=None,
+                 transactions=None, lots=None, loading=False):
         super().__init__(parent)
+        # While loading the value and the graph show skeletons, each is filled in when its data arrives
+        self.value_loading = loading
+        self.history_loading = loading
         self.user_stocks = user_stocks or []
         self.stocks_data = stocks_data or {}
         self.history = history or []
+        self.transactions = transactions or []
+        # Shared with the dashboard so the holdings are only aggregated once
+        self.positions = positions if positions is not None else PositionsEngine()
+        # Tax lots replayed from the ledger, for the cost basis and realized gains
+        self.lots = lots if lots is not None else LotsEngine()
         
+        # Downsampled chart points and the rendered graph, reused until the trend data or the size changes
+        self._downsample_cache = DownsampleCache()
+        self._render_owner = render_cache.new_owner(self)
+
         # Calculate portfolio values
         self.calculate_portfolio_data()
         
@@ -181,29 +172,34 @@ class PortfolioSummaryCard(QFrame):
 
     def calculate_portfolio_data(self):
         """Calculate portfolio value, change, and historical trend"""
-        self.total_value = 0
-        self.total_cost_basis = 0  # Total amount user paid to buy stocks
         self.weighted_change_pct = 0
-        
-        # Calculate current value and cost basis
-        if self.user_stocks and self.stocks_data:
-            for stock in self.user_stocks:
-                symbol = stock.get('stockSymbol')
-                quantity = float(stock.get('quantity', 0))
-                purchase_price = float(stock.get('price', 0))  # Price user paid
-                
-                # Cost basis (what user paid)
-                self.total_cost_basis += purchase_price * quantity
-                
-                if symbol in self.stocks_data:
-                    # Current value
-                    current_price = self.stocks_data[symbol].get('currentPrice', 0)
-                    self.total_value += current_price * quantity
+        self.realized_pnl = 0
+        
+        # Current value is kept by the positions engine
+        self.positions.sync(self.user_stocks, self.stocks_data)
+        self.total_value = self.positions.total_value if self.stocks_data else 0
+
+        self.total_cost_basis = 0
+        if self.transactions:
+            # Cost basis of the lots still open, as matched from the ledger
+            self.lots.sync_ledger(self.transactions)
+            holdings = self.positions.holdings()
+            prices = {position['symbol']: position['price'] for position in holdings}
+            self.total_cost_basis, self.unrealized_pnl = self.lots.summary(prices)
+            self.realized_pnl = self.lots.total_realized
+            # Holdings the ledger has no lots for keep their purchase price
+            for position in holdings:
+                if self.lots.open_quantity.get(position['symbol'], 0) <= 1e-9:
+                    self.total_cost_basis += position['cost']
+                    self.unrealized_pnl += position['quantity'] * position['price'] - position['cost']
+        if not self.total_cost_basis:
+            # No ledger for these holdings - fall back to their purchase price
+            self.total_cost_basis = self.positions.total_cost if self.stocks_data else 0
+            self.unrealized_pnl = self.total_value - self.total_cost_basis
         
         # Calculate percentage change from purchase price to current value
         if self.total_cost_basis > 0:
-            self.weighted_change_pct = ((self.total_value - self.total_cost_basis) / 
-                                        self.total_cost_basis) * 100
+            self.weighted_change_pct = (self.unrealized_pnl / self.total_cost_basis) * 100
             
         # Format values for display
         self.balance = f"${self.total_value:,.2f}"
@@ -211,6 +207,13 @@ class PortfolioSummaryCard(QFrame):
         
         # Generate trend data based on history if available
         self.trend_data = self._generate_trend_data()
+        self.trend_array = np.asarray(self.trend_data, dtype=float)
+        self.trend_version = getattr(self, 'trend_version', 0) + 1
+
+    def _pnl_tooltip(self):
+        """Unrealized and realized gains behind the change figure"""
+        return (f"Unrealized P&L: ${self.unrealized_pnl:+,.2f}\n"
+                f"Realized P&L: ${self.realized_pnl:+,.2f}")
 
     def _generate_trend_data(self):
         """Generate trend data for the chart based on history data if available"""
@@ -261,22 +264,21 @@ class PortfolioSummaryCard(QFrame):
 
         # Change percentage with background
         change_str = self.change
-        is_positive = not change_str.startswith("-")
-        bg_opacity = "0.2" if is_positive else "0.15"
-
         self.change_label = QLabel(change_str)
-        self.change_label.setStyleSheet(f"""
-            color: white;
-            font-size: 16px;
-            font-weight: bold;
-            background: rgba(255, 255, 255, {bg_opacity});
-            border-radius: 4px;
-            padding: 4px 10px;
-        """)
+        set_role(self.change_label, "summary-change", trend="down" if change_str.startswith("-") else "up")
+
+        self.change_label.setToolTip(self._pnl_tooltip())
+
+        # Placeholders for the two labels until the holdings' prices are in
+        self.balance_skeleton = SkeletonBlock(200, 40, QColor(255, 255, 255, 110))
+        self.change_skeleton = SkeletonBlock(90, 28, QColor(255, 255, 255, 110), radius=4)
 
         value_section.addWidget(self.balance_label)
+        value_section.addWidget(self.balance_skeleton)
         value_section.addWidget(self.change_label)
+        value_section.addWidget(self.change_skeleton)
         value_section.setAlignment(self.change_label, Qt.AlignLeft)
+        self._show_value_state()
 
         # Add value section to top section
         top_section.addLayout(value_section)
@@ -288,7 +290,36 @@ class PortfolioSummaryCard(QFrame):
         main_layout.addLayout(top_section)
 
         # Graph takes the remaining space - only if we have history data
-        if self.trend_data:
+        self._set_graph_area()
+
+    def _show_value_state(self):
+        """Skeletons or the value labels, depending on whether the prices have loaded"""
+        self.balance_label.setVisible(not self.value_loading)
+        self.change_label.setVisible(not self.value_loading)
+        self.balance_skeleton.setVisible(self.value_loading)
+        self.change_skeleton.setVisible(self.value_loading)
+
+    def _graph_state(self):
+        if self.history_loading:
+            return "loading"
+        return "graph" if self.trend_data else "empty"
+
+    def _set_graph_area(self):
+        """(Re)build the part under the value: graph skeleton, graph or the no-history message"""
+        main_layout = self.layout()
+        # Everything after the top section belongs to the graph area
+        while main_layout.count() > 1:
+            item = main_layout.takeAt(1)
+            if item.widget():
+                item.widget().deleteLater()
+        if hasattr(self, 'graph_label'):
+            del self.graph_label
+        self.graph_state = self._graph_state()
+
+        if self.graph_state == "loading":
+            graph_skeleton = SkeletonBlock(None, 150, QColor(255, 255, 255, 70), radius=8)
+            main_layout.addWidget(graph_skeleton, 1)
+        elif self.graph_state == "graph":
             self.graph_label = QLabel()
             self.graph_label.setMinimumHeight(150)
             self.graph_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
@@ -299,7 +330,6 @@ class PortfolioSummaryCard(QFrame):
             self._update_graph()
         else:
             # No graph area if we don't have history data
-            # Add a message or leave blank depending on preference
             message_label = QLabel("No historical data available")
             message_label.setStyleSheet("""
                 color: rgba(255, 255, 255, 0.7);
@@ -338,163 +368,106 @@ class PortfolioSummaryCard(QFrame):
             if width <= 0 or height <= 0:
                 return
 
-            pixmap = QPixmap(width, height)
-            pixmap.fill(Qt.transparent)
-
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.Antialiasing)
-                
-            min_val = min(self.trend_data)
-            max_val = max(self.trend_data)
-            value_range = max(0.1, max_val - min_val)  # Avoid division by zero
-
-            # Create points for the chart
-            points = []
-            num_points = len(self.trend_data)
-
-            # Adjust number of points based on width to avoid overcrowding
-            step = max(1, int(num_points / (width / 4)))
-            visible_points = [self.trend_data[i] for i in range(0, num_points, step)]
-
-            # Add the last point to ensure the graph goes all the way
-            if (num_points - 1) % step != 0:
-                visible_points.append(self.trend_data[-1])
-
-            # Create point coordinates
-            if len(visible_points) > 0:  # Check if we have points
-                for i, val in enumerate(visible_points):
-                    x = i * (width / (len(visible_points) - 1)) if len(visible_points) > 1 else width/2
-                    y = height - ((val - min_val) / value_range * height * 0.8) - (height * 0.1)
-                    points.append(QPointF(x, y))
-
-                if points:  # Check if we have valid points
-                    # Create line path
-                    path = QPainterPath()
-                    path.moveTo(points[0])
-                    for point in points[1:]:
-                        path.lineTo(point)
-
-                    # Create fill path
-                    fill_path = QPainterPath(path)
-                    fill_path.lineTo(width, height)
-                    fill_path.lineTo(0, height)
-                    fill_path.closeSubpath()
-
-                    # Use weighted_change_pct for determining color as in the original code
-                    is_positive = self.weighted_change_pct >= 0
-
-                    # Draw fill with gradient - adjust opacity based on change
-                    gradient = QLinearGradient(0, 0, 0, height)
-                    gradient.setColorAt(0, QColor(255, 255, 255, 80))
-                    gradient.setColorAt(1, QColor(255, 255, 255, 0))
-                    painter.fillPath(fill_path, gradient)
-
-                    # Draw the line
-                    pen = QPen(QColor(255, 255, 255, 230))
-                    pen.setWidth(2)
-                    painter.setPen(pen)
-                    painter.drawPath(path)
-
-                    # Draw points at data locations - only if we have enough space
-                    if width > 300 and len(points) < 20:
-                        painter.setPen(Qt.NoPen)
-                        painter.setBrush(QBrush(QColor(255, 255, 255)))
-                        for point in points:
-                            painter.drawEllipse(point, 2, 2)
-
-                    # Draw a larger highlight point at the last data point
-                    if points:
-                        painter.drawEllipse(points[-1], 4, 4)
-
-            painter.end()
+            # Only repaints when the trend data, the size or the screen's pixel ratio changed
+            pixmap = render_cache.pixmap(self._render_owner, self.trend_version, width, height,
+                                         self.graph_label.devicePixelRatioF(), self._paint_graph)
             self.graph_label.setPixmap(pixmap)
         finally:
             self._is_updating_graph = False
+
+    def _paint_graph(self, painter, width, height):
+        """Draw the trend line and its fill for a width x height graph"""
+        min_val = self.trend_array.min()
+        max_val = self.trend_array.max()
+        value_range = max(0.1, max_val - min_val)  # Avoid division by zero
+
+        # Keep the shape-defining points for this width (LTTB, cached per data version and width)
+        num_points = len(self.trend_data)
+        indices = self._downsample_cache.indices(self.trend_version, width, self.trend_array)
+
+        # Create point coordinates
+        if len(indices) == 0:  # Check if we have points
+            return
+        xs = indices * (width / (num_points - 1)) if num_points > 1 else np.full(len(indices), width / 2)
+        ys = height - ((self.trend_array[indices] - min_val) / value_range * height * 0.8) - (height * 0.1)
+        points = [QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+        # Create line path
+        path = QPainterPath()
+        path.moveTo(points[0])
+        for point in points[1:]:
+            path.lineTo(point)
+
+        # Create fill path
+        fill_path = QPainterPath(path)
+        fill_path.lineTo(width, height)
+        fill_path.lineTo(0, height)
+        fill_path.closeSubpath()
+
+        # Draw fill with gradient
+        gradient = QLinearGradient(0, 0, 0, height)
+        gradient.setColorAt(0, QColor(255, 255, 255, 80))
+        gradient.setColorAt(1, QColor(255, 255, 255, 0))
+        painter.fillPath(fill_path, gradient)
+
+        # Draw the line
+        pen = QPen(QColor(255, 255, 255, 230))
+        pen.setWidth(2)
+        painter.setPen(pen)
+        painter.drawPath(path)
+
+        # Draw points at data locations - only if we have enough space
+        if width > 300 and len(points) < 20:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(QColor(255, 255, 255)))
+            for point in points:
+                painter.drawEllipse(point, 2, 2)
+
+        # Draw a larger highlight point at the last data point
+        painter.drawEllipse(points[-1], 4, 4)
             
-    def update_data(self, user_stocks=None, stocks_data=None, history=None):
+    def update_data(self, user_stocks=None, stocks_data=None, history=None, transactions=None):
         """Update the card with new data"""
         if user_stocks is not None:
             self.user_stocks = user_stocks
         if stocks_data is not None:
             self.stocks_data = stocks_data
+            self.value_loading = False
         if history is not None:
             self.history = history
+            self.history_loading = False
+        if transactions is not None:
+            self.transactions = transactions
             
         # Recalculate portfolio data
         self.calculate_portfolio_data()
         
-        # Store old trend data to check if we need to rebuild UI
-        had_trend_data = bool(hasattr(self, 'trend_data') and self.trend_data)
-        has_trend_data_now = bool(self.trend_data)
-        
         # Update UI elements
         if hasattr(self, 'balance_label'):
             self.balance_label.setText(self.balance)
             
         if hasattr(self, 'change_label'):
             # Update the style based on the new change value
-            change_str = self.change
-            is_positive = not change_str.startswith("-")
-            bg_opacity = "0.2" if is_positive else "0.15"
-            self.change_label.setStyleSheet(f"""
-                color: white;
-                font-size: 16px;
-                font-weight: bold;
-                background: rgba(255, 255, 255, {bg_opacity});
-                border-radius: 4px;
-                padding: 4px 10px;
-            """)
+            set_state(self.change_label, "trend", "down" if self.change.startswith("-") else "up")
             self.change_label.setText(self.change)
+            self.change_label.setToolTip(self._pnl_tooltip())
+            self._show_value_state()
         
-        # Handle transition between having data and not having data
-        if had_trend_data != has_trend_data_now:
-            # Clear existing layout except for the top section
-            while self.layout().count() > 1:
-                item = self.layout().takeAt(1)
-                if item.widget():
-                    item.widget().deleteLater()
-                
-            # Rebuild the graph or message part
-            if has_trend_data_now:
-                # Add graph
-                self.graph_label = QLabel()
-                self.graph_label.setMinimumHeight(150)
-                self.graph_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                self.graph_label.setStyleSheet("background: transparent;")
-                self.layout().addWidget(self.graph_label, 1)
-                self._update_graph()
-            else:
-                # Add message
-                message_label = QLabel("No historical data available")
-                message_label.setStyleSheet("""
-                    color: rgba(255, 255, 255, 0.7);
-                    font-size: 14px;
-                    font-style: italic;
-                    background: transparent;
-                    padding: 40px 0;
-                """)
-                message_label.setAlignment(Qt.AlignCenter)
-                self.layout().addWidget(message_label, 1)
-                self.message_label = message_label
-        elif has_trend_data_now and hasattr(self, 'graph_label'):
+        # Handle transition between loading, having data and not having data
+        if self._graph_state() != self.graph_state:
+            self._set_graph_area()
+        elif hasattr(self, 'graph_label'):
             # Just update the existing graph
             self._update_graph()
 
 
 # Improved stock item with responsive design
 class StockItem(QFrame):
-    def __init__(self, stock_data, is_last=False):
+    def __init__(self, stock_data=None, is_last=False):
         super().__init__()
-        self.stock_data = stock_data
-        self.is_last = is_last
-
-        # Style with only bottom border when needed
-        border_style = "none" if is_last else f"1px solid {ColorPalette.BORDER_DARK}"
-        self.setStyleSheet(f"""
-            background-color: transparent;
-            border: none;
-            border-bottom: {border_style};
-        """)
+        self.stock_data = None
+        self.is_last = None
+        set_role(self, "row")
 
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         self.setFixedHeight(65)  # Slightly reduced height
@@ -506,28 +479,23 @@ class StockItem(QFrame):
 
         # Create and add components
         self._setup_ui()
+        if stock_data is not None:
+            self.set_data(stock_data, is_last)
 
         # For responsive design
         self.installEventFilter(self)
 
     def _setup_ui(self):
-        # Icon with company initials
-        initials = self._get_stock_initials(self.stock_data["name"])
-        #Pick random color from color palette
-        random_color = random.choice(ColorPalette.CHART_COLORS)
-        color = self._get_stock_color(self.stock_data["name"])
-        self.icon = AvatarWidget(initials, size=38, background_color=random_color)  # Slightly smaller
+        # Icon with company initials (filled in by set_data)
+        self.icon = AvatarWidget("", size=38)  # Slightly smaller
         self.layout.addWidget(self.icon)
 
         # Stock info (name and shares)
         info_layout = QVBoxLayout()
         info_layout.setSpacing(2)  # Tighter spacing
 
-        self.name_label = QLabel(self.stock_data["name"])
-        self.name_label.setStyleSheet(f"color: {ColorPalette.TEXT_PRIMARY}; font-weight: bold; font-size: 14px;")
-
-        self.shares_label = QLabel(f"{self.stock_data['amount']} shares")
-        self.shares_label.setStyleSheet(f"color: {ColorPalette.TEXT_SECONDARY}; font-size: 12px;")
+        self.name_label = set_role(QLabel(), "row-title")
+        self.shares_label = set_role(QLabel(), "row-subtitle")
 
         info_layout.addWidget(self.name_label)
         info_layout.addWidget(self.shares_label)
@@ -539,34 +507,42 @@ class StockItem(QFrame):
         value_layout.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
         # Price
-        self.price_label = QLabel(f"${self.stock_data['price']}")
-        self.price_label.setStyleSheet(f"color: {ColorPalette.TEXT_PRIMARY}; font-weight: bold; font-size: 15px;")
+        self.price_label = set_role(QLabel(), "row-value")
         self.price_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
         # Change with colored background
-        change_value = self.stock_data["change"]
-        change_color = ColorPalette.ACCENT_SUCCESS if change_value > 0 else ColorPalette.ACCENT_DANGER
-        # Get first tow characters of the change value
-        change_value = str(change_value)[:5]
-        # Convert to float
-        change_value = float(change_value)
-        change_text = f"+{change_value}%" if change_value > 0 else f"{change_value}%"
-
-        self.change_label = QLabel(change_text)
-        self.change_label.setStyleSheet(f"""
-            color: {change_color}; 
-            font-weight: bold; 
-            font-size: 13px;
-            background-color: {change_color}10; 
-            padding: 2px 6px; 
-            border-radius: 4px;
-        """)
+        self.change_label = set_role(QLabel(), "change")
         self.change_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
         value_layout.addWidget(self.price_label)
         value_layout.addWidget(self.change_label)
         self.layout.addLayout(value_layout)
 
+    def set_data(self, stock_data, is_last=False):
+        """Show a stock in this row, only the labels and styles that changed are touched"""
+        # Only bottom border when needed
+        set_state(self, "last", is_last)
+        self.is_last = is_last
+        if stock_data == self.stock_data:
+            return
+        old = self.stock_data or {}
+        self.stock_data = stock_data
+
+        if stock_data["name"] != old.get("name"):
+            #Pick random color from color palette
+            self.icon.set_text(self._get_stock_initials(stock_data["name"]), random.choice(ColorPalette.CHART_COLORS))
+            self.name_label.setText(stock_data["name"])
+        self.shares_label.setText(f"{stock_data['amount']} shares")
+        self.price_label.setText(f"${stock_data['price']}")
+
+        change_value = stock_data["change"]
+        set_state(self.change_label, "trend", "up" if change_value > 0 else "down")
+        # Get first tow characters of the change value
+        change_value = str(change_value)[:5]
+        # Convert to float
+        change_value = float(change_value)
+        self.change_label.setText(f"+{change_value}%" if change_value > 0 else f"{change_value}%")
+
     def _get_stock_initials(self, name):
         """Get initials from stock name"""
         parts = name.split()
@@ -618,11 +594,36 @@ class StockItem(QFrame):
         return super(StockItem, self).eventFilter(obj, event)
 
 
+# Placeholder row for a list whose data is still loading
+class SkeletonRow(QFrame):
+    def __init__(self, height=65, is_last=False):
+        super().__init__()
+        set_role(self, "row", last=is_last)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setFixedHeight(height)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(15, 10, 15, 10)
+        layout.setSpacing(12)
+        layout.addWidget(SkeletonBlock(36, 36, radius=18))
+
+        text_layout = QVBoxLayout()
+        text_layout.setSpacing(6)
+        text_layout.addWidget(SkeletonBlock(120, 12))
+        text_layout.addWidget(SkeletonBlock(70, 10))
+        layout.addLayout(text_layout)
+        layout.addStretch()
+        layout.addWidget(SkeletonBlock(60, 12))
+
+
 # Optimized owned stocks widget with better space utilization
 # Optimized owned stocks widget with better space utilization and dynamic height
 class OwnedStocksWidget(Card):
-    def __init__(self, parent=None, stocks=None, stocks_the_user_has=None):
+    SKELETON_ROWS = 3
+
+    def __init__(self, parent=None, stocks=None, stocks_the_user_has=None, loading=False):
         super().__init__(title="", parent=parent)
+        self.loading = loading
         self.stocks = stocks or []
         self.stocks_the_user_has = stocks_the_user_has or []
 
@@ -636,12 +637,7 @@ class OwnedStocksWidget(Card):
         header_layout.setContentsMargins(20, 20, 20, 0)  # Top padding only
 
         # Title
-        title = QLabel("Your Portfolio")
-        title.setStyleSheet(f"""
-            color: {ColorPalette.TEXT_PRIMARY};
-            font-size: 18px;
-            font-weight: bold;
-        """)
+        title = set_role(QLabel("Your Portfolio"), "subheader")
 
         header_layout.addWidget(title)
         header_layout.addStretch()
@@ -657,22 +653,20 @@ class OwnedStocksWidget(Card):
                 background: transparent;
                 border: none;
             }
-            QScrollArea > QWidget > QWidget {
-                background: transparent;
-            }
         """)
 
         # Container for stocks
-        self.stocks_container = QWidget()
-        self.stocks_container.setStyleSheet(f"""
-            background-color: {ColorPalette.CARD_BG_DARKER};
-            border-radius: 8px;
-        """)
+        self.stocks_container = set_role(QWidget(), "list")
+        self.stocks_container.setAttribute(Qt.WA_StyledBackground)
 
         # Set up stocks list
         self.stocks_layout = QVBoxLayout(self.stocks_container)
         self.stocks_layout.setContentsMargins(0, 0, 0, 0)
         self.stocks_layout.setSpacing(0)
+
+        # One row per symbol, updated in place on refresh
+        self.stock_rows = KeyedRows(self.stocks_layout, StockItem)
+        self.placeholders = []  # Skeleton rows or the empty state label
         
         # Calculate height based on number of stocks
         # Each stock item is 65px high, minimum height for empty state
@@ -688,13 +682,13 @@ class OwnedStocksWidget(Card):
         action_layout.setContentsMargins(15, 15, 15, 15)
 
         add_btn = QPushButton("+ Add Stock")
-        add_btn.setStyleSheet(GlobalStyle.SECONDARY_BUTTON)
+        set_role(add_btn, "secondary")
         add_btn.setCursor(Qt.PointingHandCursor)
         add_btn.setFixedHeight(36)
         self.add_btn = add_btn
 
         view_all_btn = QPushButton("View All")
-        view_all_btn.setStyleSheet(GlobalStyle.SECONDARY_BUTTON)
+        set_role(view_all_btn, "secondary")
         view_all_btn.setCursor(Qt.PointingHandCursor)
         view_all_btn.setFixedHeight(36)
 
@@ -710,7 +704,7 @@ class OwnedStocksWidget(Card):
         self.stocks_scroll.setWidget(self.stocks_container)
         
         # Calculate total content height: content + action buttons + some buffer
-        content_height = len(self.stocks) * stock_item_height if self.stocks else min_content_height
+        content_height = self._row_count() * stock_item_height if self._row_count() else min_content_height
         total_height = content_height + action_height + 20
         
         # Set a reasonable height - not too large when we have few stocks
@@ -733,37 +727,39 @@ class OwnedStocksWidget(Card):
         # Set layout to the card
         self.layout.addLayout(main_layout)
 
+    def _row_count(self):
+        return self.SKELETON_ROWS if self.loading else len(self.stocks)
+
     def update_stock_items(self):
         """Update the stock items in the container"""
-        # Clear existing stock items and empty state message (if any)
-        for i in reversed(range(self.stocks_layout.count())):
-            item = self.stocks_layout.itemAt(i)
-            if item.widget() and (isinstance(item.widget(), StockItem) or isinstance(item.widget(), QLabel)):
-                item.widget().deleteLater()
-            elif item.layout():
-                # Skip layouts (like the action buttons layout)
-                continue
-        
-        if not self.stocks:
+        # Skeleton rows and the empty state message (if any) make way for whatever comes now
+        for widget in self.placeholders:
+            self.stocks_layout.removeWidget(widget)
+            widget.deleteLater()
+        self.placeholders = []
+        
+        if self.loading:
+            # Holdings still loading - keep their place with skeleton rows
+            self.stock_rows.clear()
+            for i in range(self.SKELETON_ROWS):
+                self.placeholders.append(SkeletonRow(65, is_last=(i == self.SKELETON_ROWS - 1)))
+        elif not self.stocks:
+            self.stock_rows.clear()
             # Show empty state
-            empty_label = QLabel("You don't have any stocks yet")
-            empty_label.setStyleSheet(f"""
-                color: {ColorPalette.TEXT_SECONDARY};
-                font-size: 14px;
-                text-align: center;
-                padding: 30px;
-            """)
+            empty_label = set_role(QLabel("You don't have any stocks yet"), "empty")
             empty_label.setAlignment(Qt.AlignCenter)
-            self.stocks_layout.insertWidget(0, empty_label)
+            self.placeholders.append(empty_label)
         else:
-            # Show actual stocks
-            for i, stock in enumerate(self.stocks):
-                item = StockItem(stock, is_last=(i == len(self.stocks) - 1))
-                self.stocks_layout.insertWidget(i, item)
+            # Existing rows are updated, only new or sold symbols add or remove a row
+            self.stock_rows.reconcile([(stock.get("symbol", stock["name"]), stock) for stock in self.stocks])
+
+        for i, widget in enumerate(self.placeholders):
+            self.stocks_layout.insertWidget(i, widget)
 
     def update_stocks(self, new_stocks):
         """Update the widget with new stock data"""
         self.stocks = new_stocks
+        self.loading = False
         self.update_stock_items()
         
         # Recalculate appropriate height
@@ -771,7 +767,7 @@ class OwnedStocksWidget(Card):
         stock_item_height = 65
         action_height = 66
         
-        content_height = len(self.stocks) * stock_item_height if self.stocks else min_content_height
+        content_height = self._row_count() * stock_item_height if self._row_count() else min_content_height
         total_height = content_height + action_height + 20
         
         # Update height based on content
@@ -852,16 +848,13 @@ class StockTable(QTableWidget):
 
 # Space-efficient AI Advice Card
 class AIAdviceCard(Card):
-    def __init__(self, parent=None, ai_advice=None):
+    def __init__(self, parent=None, ai_advice=None, loading=False):
         super().__init__(title="", parent=parent)
-        self.setStyleSheet(f"""
-            background-color: {ColorPalette.BG_CARD};
-            border-radius: 12px;
-            border: none;
-        """)
 
         # Keep references to sub-widgets for responsive adjustments
         self.content_widgets = []
+        # Skeleton lines stand in for the insight until the daily advice arrives
+        self.loading = loading
         self.ai_advice = ai_advice or {}
         print("The ai advice before fromating in the card", self.ai_advice)
         self.ai_advice = self.parse_ai_advice(self.ai_advice)
@@ -885,12 +878,7 @@ class AIAdviceCard(Card):
         header_layout.setSpacing(10)
 
         # Title
-        title = QLabel("AI Investment Insights")
-        title.setStyleSheet(f"""
-            color: {ColorPalette.TEXT_PRIMARY};
-            font-size: 18px;
-            font-weight: bold;
-        """)
+        title = set_role(QLabel("AI Investment Insights"), "subheader")
 
         header_layout.addWidget(title)
         header_layout.addStretch()
@@ -935,7 +923,35 @@ class AIAdviceCard(Card):
         content_layout = QVBoxLayout(content_frame)
         content_layout.setContentsMargins(15, 15, 15, 15)
         content_layout.setSpacing(12)
+        self.content_layout = content_layout
+        self._populate_content()
 
+        main_layout.addWidget(content_frame)
+
+        # Add button at the bottom
+        view_btn = QPushButton("Chat with an AI Advisor")
+        view_btn.setCursor(Qt.PointingHandCursor)
+        set_role(view_btn, "primary")
+        view_btn.setFixedHeight(36)
+        main_layout.addWidget(view_btn)
+        self.view_button = view_btn
+
+        # Set the main layout
+        self.layout.addLayout(main_layout)
+
+    def _populate_content(self):
+        """Fill the content frame with the insight, or skeleton lines while it loads"""
+        for widget in self.content_widgets:
+            self.content_layout.removeWidget(widget)
+            widget.deleteLater()
+        self.content_widgets = []
+
+        if self.loading:
+            for width in (180, None, None, 220):
+                skeleton = SkeletonBlock(width, 14)
+                self.content_layout.addWidget(skeleton)
+                self.content_widgets.append(skeleton)
+            return
 
         # Main insight title
         insight_title = QLabel(self.ai_advice["title"])
@@ -944,7 +960,7 @@ class AIAdviceCard(Card):
             font-weight: bold;
             font-size: 14px;
         """)
-        content_layout.addWidget(insight_title)
+        self.content_layout.addWidget(insight_title)
         self.content_widgets.append(insight_title)
 
         # Main insight content
@@ -955,28 +971,19 @@ class AIAdviceCard(Card):
             font-size: 13px;
             line-height: 1.4;
         """)
-        content_layout.addWidget(insight_content)
+        self.content_layout.addWidget(insight_content)
         self.content_widgets.append(insight_content)
 
-
-
         for point in self.ai_advice["points"]:
             point_widget = self._create_key_point(point["text"], point["color"])
-            content_layout.addWidget(point_widget)
+            self.content_layout.addWidget(point_widget)
             self.content_widgets.append(point_widget)
 
-        main_layout.addWidget(content_frame)
-
-        # Add button at the bottom
-        view_btn = QPushButton("Chat with an AI Advisor")
-        view_btn.setCursor(Qt.PointingHandCursor)
-        view_btn.setStyleSheet(GlobalStyle.PRIMARY_BUTTON)
-        view_btn.setFixedHeight(36)
-        main_layout.addWidget(view_btn)
-        self.view_button = view_btn
-
-        # Set the main layout
-        self.layout.addLayout(main_layout)
+    def set_advice(self, ai_advice):
+        """Show the daily advice once it has been fetched"""
+        self.loading = False
+        self.ai_advice = self.parse_ai_advice(ai_advice or {})
+        self._populate_content()
 
     def _create_ai_icon(self):
         """Create the AI icon"""
@@ -1232,10 +1239,7 @@ class Sidebar(QFrame):
         super().__init__(parent)
         self.setMinimumWidth(240)
         self.setMaximumWidth(240)
-        self.setStyleSheet(f"""
-            background-color: {ColorPalette.BG_SIDEBAR};
-            border-right: 1px solid {ColorPalette.BORDER_DARK};
-        """)
+        set_role(self, "sidebar")
 
         self.user = user
 
@@ -1412,67 +1416,42 @@ class AvatarWidget(QFrame):
             self.text_label.setStyleSheet("color: white; background: transparent;")
             self.layout.addWidget(self.text_label)
     
+    def set_text(self, text, background_color=None):
+        """Show other initials (and color) on a text avatar that is being reused"""
+        self.text = text
+        self.text_label.setText(text[:2].upper())
+        if background_color and background_color != self.bg_color:
+            self.bg_color = background_color
+            self.setStyleSheet(f"""
+                background-color: {self.bg_color};
+                border-radius: {self.size // 2}px;
+                color: white;
+                font-weight: bold;
+            """)
+
     def load_image_from_url(self):
-        """Load image from URL and set as avatar background"""
-        try:
-            # Use a network manager to download the image
-            self.network_manager = QNetworkAccessManager()
-            self.network_manager.finished.connect(self.on_image_downloaded)
-            self.network_manager.get(QNetworkRequest(QUrl(self.image_url)))
-        except Exception as e:
-            print(f"Error loading image from URL: {e}")
-            # Fallback to text-based avatar if URL loading fails
-            self.image_url = None
-    
-    def on_image_downloaded(self, reply):
-        """Process downloaded image and apply to the avatar"""
-        try:
-            if reply.error() == QNetworkReply.NoError:
-                data = reply.readAll()
-                pixmap = QPixmap()
-                pixmap.loadFromData(data)
-                
-                # Create a circular mask for the image
-                if not pixmap.isNull():
-                    self.pixmap = self.create_circular_pixmap(pixmap)
-                    self.update()  # Trigger repaint
-                else:
-                    self.image_url = None  # Fallback if pixmap is null
-            else:
-                print(f"Error downloading image: {reply.errorString()}")
-                self.image_url = None  # Fallback if download failed
-        except Exception as e:
-            print(f"Error processing downloaded image: {e}")
-            self.image_url = None
-    
-    def create_circular_pixmap(self, source_pixmap):
-        """Create a circular version of the pixmap"""
-        target = QPixmap(self.size, self.size)
-        target.fill(Qt.transparent)
-        
-        painter = QPainter(target)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Create circular path
-        path = QPainterPath()
-        path.addEllipse(0, 0, self.size, self.size)
-        
-        # Clip to circle
-        painter.setClipPath(path)
-        
-        # Scale and center the image
-        scaled_pixmap = source_pixmap.scaled(self.size, self.size, 
-                                            Qt.KeepAspectRatioByExpanding, 
-                                            Qt.SmoothTransformation)
-        
-        # Calculate position to center the image if aspect ratio is not 1:1
-        x = (self.size - scaled_pixmap.width()) // 2 if scaled_pixmap.width() > self.size else 0
-        y = (self.size - scaled_pixmap.height()) // 2 if scaled_pixmap.height() > self.size else 0
-        
-        painter.drawPixmap(x, y, scaled_pixmap)
-        painter.end()
-        
-        return target
+        """Show the image of the URL, from the shared loader's caches or once it's downloaded"""
+        if image_loader.load(self.image_url):
+            self._show_image()
+            return
+        image_loader.image_ready.connect(self._on_image_loaded)
+        image_loader.image_failed.connect(self._on_image_loaded)
+
+    def _on_image_loaded(self, url):
+        if url != self.image_url:
+            return
+        image_loader.image_ready.disconnect(self._on_image_loaded)
+        image_loader.image_failed.disconnect(self._on_image_loaded)
+        if image_loader.has_failed(url):
+            self.image_url = None  # Fallback if download failed
+        else:
+            self._show_image()
+
+    def _show_image(self):
+        pixmap = image_loader.circular_pixmap(self.image_url, self.size, self.devicePixelRatioF())
+        if pixmap is not None:
+            self.pixmap = pixmap
+            self.update()  # Trigger repaint
     
     def paintEvent(self, event):
         """Custom paint event to draw the pixmap if available"""
@@ -1510,7 +1489,7 @@ class Header(QFrame):
         title_layout.setSpacing(4)
 
         title = QLabel("Dashboard")
-        title.setStyleSheet(GlobalStyle.HEADER_STYLE)
+        set_role(title, "header")
 
 
         title_layout.addWidget(title)
@@ -1567,18 +1546,11 @@ class Header(QFrame):
 
 # Improved Transaction Item with better styling
 class TransactionItem(QFrame):
-    def __init__(self, transaction_data, is_last=False):
+    def __init__(self, transaction_data=None, is_last=False):
         super().__init__()
-        self.transaction_data = transaction_data
-        self.is_last = is_last
-
-        # Style - only use divider when needed
-        border_style = "none" if is_last else f"1px solid {ColorPalette.BORDER_DARK}"
-        self.setStyleSheet(f"""
-            background-color: transparent;
-            border: none;
-            border-bottom: {border_style};
-        """)
+        self.transaction_data = None
+        self.is_last = None
+        set_role(self, "row")
 
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         self.setFixedHeight(70)
@@ -1588,26 +1560,18 @@ class TransactionItem(QFrame):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(15)
 
-        # Icon based on stock initials
-        stocks_initials = "".join([word[0] for word in transaction_data["name"].split()])
-
-        icon_text = "B" if transaction_data["type"] == "buy" else "S"
-        # Random color from palette
-        random_color = random.choice(ColorPalette.CHART_COLORS)
-        icon = AvatarWidget(stocks_initials, size=40, background_color=random_color)
+        # Icon based on stock initials (filled in by set_data)
+        self.icon = AvatarWidget("", size=40)
 
         # Name and date info
         info_layout = QVBoxLayout()
         info_layout.setSpacing(4)
 
-        name_label = QLabel(transaction_data["name"])
-        name_label.setStyleSheet(f"color: {ColorPalette.TEXT_PRIMARY}; font-weight: bold; font-size: 14px; border: none;")
-
-        date_label = QLabel(transaction_data["date"])
-        date_label.setStyleSheet(f"color: {ColorPalette.TEXT_SECONDARY}; font-size: 12px; border: none;")
+        self.name_label = set_role(QLabel(), "row-title")
+        self.date_label = set_role(QLabel(), "row-subtitle")
 
-        info_layout.addWidget(name_label)
-        info_layout.addWidget(date_label)
+        info_layout.addWidget(self.name_label)
+        info_layout.addWidget(self.date_label)
 
         # Price and shares in vertical layout
         value_layout = QVBoxLayout()
@@ -1615,38 +1579,53 @@ class TransactionItem(QFrame):
         value_layout.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
         # Price
-        price_label = QLabel(f"${transaction_data['price']}")
-        price_label.setStyleSheet(f"color: {ColorPalette.TEXT_PRIMARY}; font-weight: bold; font-size: 16px; border: none;")
-        price_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.price_label = set_role(QLabel(), "row-value")
+        self.price_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
         # Shares
-        shares_text = f"{transaction_data['shares']} shares"
-        shares_color = ColorPalette.ACCENT_SUCCESS if transaction_data["type"] == "buy" else ColorPalette.ACCENT_DANGER
-        shares_label = QLabel(shares_text)
-        shares_label.setStyleSheet(f"""
-            color: {shares_color}; 
-            border: none;
-            font-size: 14px;
-            
-            padding: 2px 6px;
-            border-radius: 4px;
-            
-        """)
-        shares_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.shares_label = set_role(QLabel(), "trade")
+        self.shares_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
-        value_layout.addWidget(price_label)
-        value_layout.addWidget(shares_label)
+        value_layout.addWidget(self.price_label)
+        value_layout.addWidget(self.shares_label)
 
         # Add all elements to layout
-        layout.addWidget(icon)
+        layout.addWidget(self.icon)
         layout.addLayout(info_layout, 1)
         layout.addLayout(value_layout)
 
+        if transaction_data is not None:
+            self.set_data(transaction_data, is_last)
+
+    def set_data(self, transaction_data, is_last=False):
+        """Show a transaction in this row, only the labels and styles that changed are touched"""
+        # Style - only use divider when needed
+        set_state(self, "last", is_last)
+        self.is_last = is_last
+        if transaction_data == self.transaction_data:
+            return
+        old = self.transaction_data or {}
+        self.transaction_data = transaction_data
+
+        if transaction_data["name"] != old.get("name"):
+            stocks_initials = "".join([word[0] for word in transaction_data["name"].split()])
+            # Random color from palette
+            self.icon.set_text(stocks_initials, random.choice(ColorPalette.CHART_COLORS))
+            self.name_label.setText(transaction_data["name"])
+        self.date_label.setText(transaction_data["date"])
+        self.price_label.setText(f"${transaction_data['price']}")
+        self.shares_label.setText(f"{transaction_data['shares']} shares")
+
+        set_state(self.shares_label, "side", "buy" if transaction_data["type"] == "buy" else "sell")
+
 # Improved responsive dashboard layout
 class DashboardPage(QWidget):
-    def __init__(self, parent=None, user=None, user_stocks=None, user_transactions=None, stocks_the_user_has=None, firebaseUserId=None, ai_advice=None, history=None):
+    def __init__(self, parent=None, user=None, user_stocks=None, user_transactions=None, stocks_the_user_has=None, firebaseUserId=None, ai_advice=None, history=None, loading=False):
         super().__init__(parent)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        # Cards start as skeletons and are filled in one by one as the presenter's fetches resolve
+        self.loading = loading
+        self.transactions_loading = loading
 
 
 
@@ -1663,6 +1642,10 @@ class DashboardPage(QWidget):
         self.ai_advice = ai_advice
         self.history = history
 
+        # Holdings aggregated once and shared by the portfolio card and the owned stocks list
+        self.positions = PositionsEngine()
+        self.lots = LotsEngine()
+
 
         user_name = self.user.get('username', 'User').split()[0] if self.user else 'User'
 
@@ -1675,19 +1658,20 @@ class DashboardPage(QWidget):
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setFrameShape(QFrame.NoFrame)
         self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        # Only its own content is made transparent, nested lists keep their theme background
+        self.scroll_area.setObjectName("dashboardScroll")
         self.scroll_area.setStyleSheet("""
             QScrollArea {
                 background: transparent;
                 border: none;
             }
-            QScrollArea > QWidget > QWidget {
+            #dashboardScroll > QWidget > QWidget {
                 background: transparent;
             }
         """)
 
         # Container for all dashboard content
         self.content_widget = QWidget()
-        self.content_widget.setStyleSheet("background: transparent;")
         self.content_layout = QVBoxLayout(self.content_widget)
         self.content_layout.setContentsMargins(0, 0, 0, 0)
         self.content_layout.setSpacing(20)  # Reduced spacing between sections
@@ -1714,7 +1698,11 @@ class DashboardPage(QWidget):
         self.portfolio_card = PortfolioSummaryCard(
             user_stocks=self.user_stocks,
             stocks_data=self.stocks_the_user_has,
-            history = self.history
+            history = self.history,
+            positions=self.positions,
+            transactions=self.user_transactions,
+            lots=self.lots,
+            loading=self.loading
         )
         
         # Reduce the minimum height and make it less dominant
@@ -1723,7 +1711,7 @@ class DashboardPage(QWidget):
         self.portfolio_card.setMaximumHeight(450)  # Limit height to avoid stretching
 
         # AI Advice card with adjusted size
-        self.ai_advice = AIAdviceCard(parent=self, ai_advice=self.ai_advice)
+        self.ai_advice = AIAdviceCard(parent=self, ai_advice=self.ai_advice, loading=self.loading)
         self.ai_advice.setMinimumHeight(200)  # Consistent height with portfolio card
         self.ai_advice.setMaximumHeight(450)  # Limit height to avoid stretching
 
@@ -1760,13 +1748,14 @@ class DashboardPage(QWidget):
                 tx_date = datetime.datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S.%f")
                 formatted_date = tx_date.strftime("%b %d, %Y")
                 
-                # Get full name if available
+                # Get full name if available (the metadata store also knows symbols that were sold)
                 symbol = tx['stockSymbol']
-                name = symbol
+                name = symbol_metadata.name(symbol)
                 if hasattr(self, 'stocks_the_user_has') and self.stocks_the_user_has and symbol in self.stocks_the_user_has:
-                    name = self.stocks_the_user_has[symbol].get('name', symbol)
+                    name = self.stocks_the_user_has[symbol].get('name', name)
                 
                 ui_transactions.append({
+                    "key": tx.get('id') or trade_key(tx),
                     "name": name,
                     "type": tx['transactionType'].lower(),
                     "date": formatted_date,
@@ -1781,24 +1770,18 @@ class DashboardPage(QWidget):
 
     def convert_stock_data(self, user_stocks, stocks_details):
         """Convert API stock format to UI format with aggregated quantities"""
-        from collections import defaultdict
-        
-        stock_quantities = defaultdict(int)
-        for stock in user_stocks:
-            symbol = stock['stockSymbol']
-            stock_quantities[symbol] += stock['quantity']
+        self.positions.sync(user_stocks, stocks_details)
         
         ui_stocks = []
-        for symbol, total_quantity in stock_quantities.items():
-            if symbol in stocks_details:
-                details = stocks_details[symbol]
-                
-                ui_stocks.append({
-                    "name": details['name'],
-                    "amount": str(total_quantity),  # Total quantity across all transactions
-                    "price": f"{details['currentPrice']:.2f}",
-                    "change": details['changePercent']
-                })
+        for position in self.positions.holdings():
+            quantity = position['quantity']
+            ui_stocks.append({
+                "symbol": position['symbol'],
+                "name": position['name'],
+                "amount": str(int(quantity) if float(quantity).is_integer() else quantity),  # Total quantity across all lots
+                "price": f"{position['price']:.2f}",
+                "change": position['change_percent']
+            })
         
         return ui_stocks
 
@@ -1811,7 +1794,8 @@ class DashboardPage(QWidget):
 
         # Owned stocks widget - reduced size
         ui_stocks = self.convert_stock_data(self.user_stocks, self.stocks_the_user_has)
-        self.owned_stocks = OwnedStocksWidget(stocks=ui_stocks, stocks_the_user_has=self.stocks_the_user_has)
+        self.owned_stocks = OwnedStocksWidget(stocks=ui_stocks, stocks_the_user_has=self.stocks_the_user_has,
+                                              loading=self.loading)
         self.owned_stocks.setMinimumHeight(350)
         
 
@@ -1827,32 +1811,15 @@ class DashboardPage(QWidget):
         transaction_layout = QVBoxLayout(transaction_container)
         transaction_layout.setContentsMargins(0, 0, 0, 0)
         transaction_layout.setSpacing(0)
+        self.transaction_layout = transaction_layout
 
-        if not self.user_transactions:
-            # Show empty state
-            empty_label = QLabel("No recent transactions")
-            empty_label.setStyleSheet(f"""
-                color: {ColorPalette.TEXT_SECONDARY};
-                font-size: 14px;
-                text-align: center;
-                padding: 30px;
-            """)
-            empty_label.setAlignment(Qt.AlignCenter)
-            transaction_layout.addWidget(empty_label)
-        else:
-            # Show actual transactions (limited to most recent 3)
-            # Get 4 latest transactions
-            recent_transactions = self.user_transactions[-4:]
-            
-            # Convert all transactions at once
-            ui_transactions = self.convert_transaction_data(recent_transactions)
-            
-            for i, tx_data in enumerate(ui_transactions):
-                item = TransactionItem(tx_data, is_last=(i == len(ui_transactions) - 1))
-                transaction_layout.addWidget(item)
+        # One row per transaction, kept across refreshes
+        self.transaction_rows = KeyedRows(transaction_layout, TransactionItem)
+        self.transaction_placeholders = []
 
         # Add spacer to push transactions to the top if fewer than max
         transaction_layout.addStretch(1)
+        self._update_recent_transactions()
 
         # Wrap transaction container in a scroll area
         transactions_scroll = QScrollArea()
@@ -1875,7 +1842,7 @@ class DashboardPage(QWidget):
 
         # Add "View All" button
         view_all_btn = QPushButton("View All Transactions")
-        view_all_btn.setStyleSheet(GlobalStyle.SECONDARY_BUTTON)
+        set_role(view_all_btn, "secondary")
         recent_layout.addWidget(view_all_btn)
 
         self.view_all_btn = view_all_btn
@@ -1957,6 +1924,7 @@ class DashboardPage(QWidget):
             self.user_stocks = user_stocks
         if user_transactions is not None:
             self.user_transactions = user_transactions
+            self.transactions_loading = False
         if stocks_the_user_has is not None:
             self.stocks_the_user_has = stocks_the_user_has
         
@@ -1964,7 +1932,8 @@ class DashboardPage(QWidget):
         if hasattr(self, 'portfolio_card'):
             self.portfolio_card.update_data(
                 user_stocks=self.user_stocks,
-                stocks_data=self.stocks_the_user_has
+                stocks_data=self.stocks_the_user_has,
+                transactions=self.user_transactions
             )
         
         # Update owned stocks widget
@@ -1990,57 +1959,72 @@ class DashboardPage(QWidget):
     
     def _update_recent_transactions(self):
         """Update the recent transactions widget with new data"""
-        
-        # Find the transaction container within the recent activity card
-        transaction_scroll = self.recent_activity.findChild(QScrollArea)
-        
-        if not transaction_scroll:
-            print("Warning: Could not find scroll area in recent activity")
-            return
-        
-        transaction_container = transaction_scroll.widget()
-        if not transaction_container:
-            print("Warning: Could not find transaction container")
-            return
-        
-        # Get the layout of the transaction container
-        transaction_layout = transaction_container.layout()
-        if not transaction_layout:
-            print("Warning: Transaction container has no layout")
-            return
-        
-        # Clear existing items
-        for i in reversed(range(transaction_layout.count())):
-            widget = transaction_layout.itemAt(i).widget()
-            if isinstance(widget, TransactionItem) or isinstance(widget, QLabel):
-                transaction_layout.removeWidget(widget)
-                widget.deleteLater()
+        transaction_layout = self.transaction_layout
+
+        # Skeleton rows and the empty state message (if any) make way for whatever comes now
+        for widget in self.transaction_placeholders:
+            transaction_layout.removeWidget(widget)
+            widget.deleteLater()
+        self.transaction_placeholders = []
         
         # Add new transaction items
-        if not self.user_transactions:
+        if self.transactions_loading:
+            self.transaction_rows.clear()
+            for i in range(3):
+                self.transaction_placeholders.append(SkeletonRow(70, is_last=(i == 2)))
+        elif not self.user_transactions:
+            self.transaction_rows.clear()
             # Show empty state
-            empty_label = QLabel("No recent transactions")
-            empty_label.setStyleSheet(f"""
-                color: {ColorPalette.TEXT_SECONDARY};
-                font-size: 14px;
-                text-align: center;
-                padding: 30px;
-            """)
+            empty_label = set_role(QLabel("No recent transactions"), "empty")
             empty_label.setAlignment(Qt.AlignCenter)
-            transaction_layout.addWidget(empty_label)
+            self.transaction_placeholders.append(empty_label)
         else:
             # Show actual transactions (limited to most recent 4)
             recent_transactions = self.user_transactions[-4:]
             
             # Convert all transactions at once
             ui_transactions = self.convert_transaction_data(recent_transactions)
-            
-            for i, tx_data in enumerate(ui_transactions):
-                item = TransactionItem(tx_data, is_last=(i == len(ui_transactions) - 1))
-                transaction_layout.addWidget(item)
-        
-        # Add spacer to push transactions to the top if fewer than max
-        transaction_layout.addStretch(1)
+
+            # Rows are keyed by transaction, identical entries are told apart by their count
+            items = []
+            seen = {}
+            for tx_data in ui_transactions:
+                key = tx_data["key"]
+                seen[key] = seen.get(key, 0) + 1
+                items.append(((key, seen[key]), tx_data))
+            self.transaction_rows.reconcile(items)
+
+        for i, widget in enumerate(self.transaction_placeholders):
+            transaction_layout.insertWidget(i, widget)
+
+    # Filled in one at a time by the presenter as each fetch resolves
+
+    def set_holdings(self, user_stocks, stocks_the_user_has):
+        """Holdings and their prices arrived - fills the portfolio value and the owned stocks list"""
+        self.user_stocks = user_stocks
+        self.stocks_the_user_has = stocks_the_user_has
+        self.portfolio_card.update_data(user_stocks=self.user_stocks, stocks_data=self.stocks_the_user_has)
+        self._update_owned_stocks_widget(self.convert_stock_data(self.user_stocks, self.stocks_the_user_has))
+        if not self.transactions_loading:
+            # Transactions came first - their names can now come from the prices payload
+            self._update_recent_transactions()
+
+    def set_transactions(self, user_transactions):
+        """The ledger arrived - fills the recent activity and the portfolio card's cost basis"""
+        self.user_transactions = user_transactions
+        self.transactions_loading = False
+        self.portfolio_card.update_data(transactions=self.user_transactions)
+        self._update_recent_transactions()
+
+    def set_history(self, history):
+        self.history = history
+        self.portfolio_card.update_data(history=history)
+
+    def set_ai_advice(self, ai_advice):
+        # A failed fetch leaves advice that is already on screen alone
+        if ai_advice is None and not self.ai_advice.loading:
+            return
+        self.ai_advice.set_advice(ai_advice)
 
 
 # Responsive main application window
@@ -2068,55 +2052,15 @@ class MainWindow(QWidget):
         self.history = history
         print("The history the card got is:" + str(self.history)) 
 
+        # Nothing handed over from the login - the dashboard opens with skeletons and fetches in the background
+        self.loading = user_stocks is None
+
 
         # Track sidebar state for narrow screens
         self.sidebar_visible = True
 
-        # Set dark theme with improved styling
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {ColorPalette.BG_DARK};
-                color: {ColorPalette.TEXT_PRIMARY};
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }}
-            QScrollBar:vertical {{
-                background: {ColorPalette.BG_DARK};
-                width: 8px;  /* Thinner scrollbar */
-                margin: 0px;
-                border-radius: 4px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {ColorPalette.BORDER_LIGHT};
-                min-height: 30px;
-                border-radius: 4px;
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-            QScrollBar:horizontal {{
-                background: {ColorPalette.BG_DARK};
-                height: 8px;  /* Thinner scrollbar */
-                margin: 0px;
-                border-radius: 4px;
-            }}
-            QScrollBar::handle:horizontal {{
-                background: {ColorPalette.BORDER_LIGHT};
-                min-width: 30px;
-                border-radius: 4px;
-            }}
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{
-                width: 0px;
-            }}
-            /* Tooltip styling */
-            QToolTip {{
-                background-color: {ColorPalette.BG_CARD};
-                color: {ColorPalette.TEXT_PRIMARY};
-                border: none;
-                border-radius: 4px;
-                padding: 6px;
-                font-size: 12px;
-            }}
-        """)
+        # Dark theme, scrollbars and tooltips come from the application stylesheet
+        apply_theme()
 
         # Main layout
         self.main_layout = QHBoxLayout(self)
@@ -2127,15 +2071,15 @@ class MainWindow(QWidget):
         self.sidebar = Sidebar(user=self.user)
         self.main_layout.addWidget(self.sidebar)
 
+        # Secondary windows are built on first open and reused after that
+        self.pages = PageManager()
+        self._register_pages()
+
         self._connect_sidebar_buttons()
         
 
         # Content area with shadow separation
-        self.content_area = QFrame()
-        self.content_area.setStyleSheet(f"""
-            background-color: {ColorPalette.BG_DARK}; 
-            border: none;
-        """)
+        self.content_area = set_role(QFrame(), "content")
 
         # Add subtle left shadow to content area
         shadow = QGraphicsDropShadowEffect()
@@ -2159,7 +2103,8 @@ class MainWindow(QWidget):
             stocks_the_user_has=self.stocks_the_user_has,
             firebaseUserId=self.firebaseUserId,
             ai_advice=self.ai_advice,
-            history = self.history
+            history = self.history,
+            loading=self.loading
         )
 
         # Create model and presenter for dashboard
@@ -2167,7 +2112,8 @@ class MainWindow(QWidget):
         from Presenter.Dashboard.dashboard_presenter import DashboardPresenter
 
         dashboard_model = DashboardModel()
-        self.dashboard_presenter = DashboardPresenter(self.dashboard, dashboard_model)
+        self.dashboard_presenter = DashboardPresenter(self.dashboard, dashboard_model,
+                                                      on_loaded=self._on_dashboard_loaded)
 
         # Load initial data through the presenter
         self.dashboard_presenter.load_initial_data()
@@ -2196,6 +2142,15 @@ class MainWindow(QWidget):
         event_system.data_updated.connect(self.update_values)
         print("Connection established")
 
+        # Names and sectors of everything the user holds or ever traded, fetched in one request
+        self._update_symbol_metadata()
+
+        # Latest risk figures of the portfolio page, handed to the AI advisor
+        self.risk_report = None
+        event_system.risk_updated.connect(self._store_risk_report)
+        # Portfolio summary sent with the advisor's questions, made on the first question
+        self.advisor_context = None
+
 
     def _create_mobile_header(self):
         """Create a mobile header with menu button for narrow screens"""
@@ -2331,6 +2286,8 @@ class MainWindow(QWidget):
             self.user_transactions = user_transactions
         if stocks_the_user_has is not None:
             self.stocks_the_user_has = stocks_the_user_has
+        self._update_symbol_metadata()
+        self.pages.refresh_open_pages()
             
         # Update dashboard if it exists
         if hasattr(self, 'dashboard') and self.dashboard:
@@ -2455,14 +2412,54 @@ class MainWindow(QWidget):
         from View.ai_advisor_window import AIAdvisorWindow
         from Model.Ai_chat.ai_chat_model import AiChatModel
         from Presenter.Ai_chat.ai_chat_presenter import AiChatPresenter
+        from Model.Ai_chat.chat_history import chat_history
 
         model = AiChatModel()
 
         view = AIAdvisorWindow()
-        presenter = AiChatPresenter(view, model)
+        presenter = AiChatPresenter(view, model, context_provider=self._advisor_context,
+                                    history=chat_history, user_id=self.firebaseUserId)
         view.presenter = presenter
         return view
 
+    def _update_symbol_metadata(self):
+        """Learn names/sectors from the latest prices and refresh missing or old ones in the background"""
+        if isinstance(self.stocks_the_user_has, dict):
+            symbol_metadata.learn(self.stocks_the_user_has)
+        symbols = {tx.get('stockSymbol') for tx in self.user_transactions or []}
+        symbols.update(stock.get('stockSymbol') for stock in self.user_stocks or [])
+        symbol_metadata.refresh_in_background(symbols)
+
+    def _on_dashboard_loaded(self, source, data):
+        """Keep the window's copy of the data current as the dashboard's fetches resolve"""
+        if source == "details":
+            self.user_stocks, self.stocks_the_user_has = data
+        elif source == "transactions":
+            self.user_transactions = data
+        elif source == "balance":
+            if data is not None:
+                self.balance = data
+        elif source == "history":
+            self.history = data
+        else:
+            return
+        if source in ("details", "transactions"):
+            self._update_symbol_metadata()
+        self.pages.refresh_open_pages()
+
+    def _store_risk_report(self, report):
+        self.risk_report = report
+
+    def _advisor_context(self):
+        """Extra fields sent with every question to the AI advisor"""
+        from Model.Protofilio.risk_engine import risk_summary
+        from Model.Ai_chat.portfolio_context import PortfolioContextBuilder
+
+        if self.advisor_context is None:
+            self.advisor_context = PortfolioContextBuilder()
+        return self.advisor_context.build(self.user_stocks, self.stocks_the_user_has, self.user_transactions,
+                                          self.balance, risk_summary(self.risk_report))
+
     def create_protofilio_page(self, user, user_stocks, stocks_the_user_has, balance, firebaseUserId):
         from View.protofilio_view import PortfolioPage
         from Model.Protofilio.protofilio_model import PortfolioModel
@@ -2474,6 +2471,40 @@ class MainWindow(QWidget):
         view.presenter = presenter
         return view
 
+    def _register_pages(self):
+        """How each secondary window is built and how a cached one is brought up to date"""
+        self.pages.register("stocks", self.create_stock_search_window)
+        self.pages.register("ai_advisor", self.create_ai_caht_page)
+        self.pages.register("portfolio", lambda: self.create_protofilio_page(
+            user=self.user,
+            user_stocks=self.user_stocks,
+            stocks_the_user_has=self.stocks_the_user_has,
+            balance=self.balance,
+            firebaseUserId=self.firebaseUserId
+        ), self._refresh_portfolio_page)
+        self.pages.register("transactions", self.create_transactions_page, self._refresh_transactions_page)
+        # The profile presenter keeps its page's balance up to date itself
+        self.pages.register("profile", self.create_profile_page)
+
+    def create_transactions_page(self):
+        from View.transaction_view import TransactionsPage
+
+        return TransactionsPage(
+            user=self.user,
+            user_transactions=self.user_transactions,
+            stocks_the_user_has=self.stocks_the_user_has,
+            balance=self.balance
+        )
+
+    def _refresh_portfolio_page(self, page):
+        page.update_data(user_stocks=self.user_stocks, stocks_the_user_has=self.stocks_the_user_has,
+                         balance=self.balance)
+
+    def _refresh_transactions_page(self, page):
+        page.update_data(user_transactions=self.user_transactions,
+                         stocks_the_user_has=self.stocks_the_user_has,
+                         balance=self.balance)
+
     def _connect_sidebar_buttons(self):
         """Connect sidebar buttons to their actions"""
         # AI Advisor button - opens a separate window
@@ -2496,54 +2527,24 @@ class MainWindow(QWidget):
         self.dashboard.view_all_btn.clicked.connect(self._open_transactions)
 
     def _open_stock_page(self):
-        print("Open stock page")
-        """Open a stock page for the selected stock"""
-        # Store a reference to prevent garbage collection
-        stock_window = self.create_stock_search_window()
-        stock_window.show()
-        
-        # Store reference to prevent garbage collection
-        self.stock_window = stock_window
+        """Open the stock search window"""
+        self.pages.open("stocks")
         
     def _open_ai_advisor(self):
         """Open the AI Advisor window"""
-        # Store a reference to prevent garbage collection
-        ai_advisor_window = self.create_ai_caht_page()
-        ai_advisor_window.show()
-        self.ai_advisor_window = ai_advisor_window
+        self.pages.open("ai_advisor")
 
     def _open_portfolio(self):
         """Open the Portfolio window with real data"""
-        # Store a reference to prevent garbage collection
-        portfolio_window = self.create_protofilio_page(
-            user=self.user, 
-            user_stocks=self.user_stocks, 
-            stocks_the_user_has=self.stocks_the_user_has,
-            balance=self.balance,
-            firebaseUserId=self.firebaseUserId
-        )
-        portfolio_window.show()
-        self.portfolio_window = portfolio_window
-
+        self.pages.open("portfolio")
 
     def _open_transactions(self):
-        
         """Open the Transactions window"""
-        # Store a reference to prevent garbage collection
-        self.transactions_window = TransactionsPage(
-            user=self.user, 
-            user_transactions=self.user_transactions, 
-            stocks_the_user_has=self.stocks_the_user_has,
-            balance=self.balance
-        )
-        self.transactions_window.show()
+        self.pages.open("transactions")
 
-    
     def _open_profile(self):
         """Open the Profile window"""
-        profile_window = self.create_profile_page()
-        profile_window.show()
-        self.profile_window = profile_window
+        self.pages.open("profile")
 
 
 if __name__ == "__main__":
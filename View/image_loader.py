@@ -0,0 +1,240 @@
+"""
+image_loader.py - Downloads, caches and masks the images shown in avatars
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, Signal, Qt, QUrl
+from PySide6.QtGui import QImage, QPixmap, QPainter, QPainterPath
+
+from app_paths import data_path
+
+DISK_MAX_AGE = 24 * 3600  # After a day the server is asked whether the image changed
+
+
+def circular_pixmap(source, size, device_pixel_ratio=1.0):
+    """`source` (QImage) scaled to cover a size x size circle, crisp at the given pixel ratio"""
+    pixels = max(1, round(size * device_pixel_ratio))
+    target = QPixmap(pixels, pixels)
+    target.fill(Qt.transparent)
+
+    painter = QPainter(target)
+    painter.setRenderHint(QPainter.Antialiasing)
+
+    # Clip to circle
+    path = QPainterPath()
+    path.addEllipse(0, 0, pixels, pixels)
+    painter.setClipPath(path)
+
+    # Scale and center the image if the aspect ratio is not 1:1
+    scaled = QPixmap.fromImage(source).scaled(pixels, pixels, Qt.KeepAspectRatioByExpanding,
+                                              Qt.SmoothTransformation)
+    painter.drawPixmap((pixels - scaled.width()) // 2, (pixels - scaled.height()) // 2, scaled)
+    painter.end()
+
+    target.setDevicePixelRatio(device_pixel_ratio)
+    return target
+
+
+class ImageLoader(QObject):
+    """One loader for every image URL the app shows.
+
+    All downloads go through a single QNetworkAccessManager and a URL that is
+    already downloading isn't requested again. Downloaded files are kept on
+    disk with their ETag/Last-Modified: for a day they're used as they are,
+    after that a conditional request asks the server whether they changed
+    (a 304 costs no download). Decoded images and the circular pixmaps made
+    from them, keyed by (url, size, device pixel ratio), stay in memory and
+    are evicted least recently used first.
+    """
+    image_ready = Signal(str)   # url - the image is in memory now
+    image_failed = Signal(str)  # url - it could not be loaded
+
+    def __init__(self, cache_dir=None, max_bytes=8 * 1024 * 1024, max_sources=16, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_sources = max_sources
+        self.used_bytes = 0
+        self._pixmaps = OrderedDict()  # (url, size, device pixel ratio) -> circular QPixmap
+        self._sources = OrderedDict()  # url -> decoded QImage
+        self._pending = {}  # url -> (reply, cached file data or None)
+        self._failed = set()
+        self._network = None
+
+    # Lookups
+
+    def circular_pixmap(self, url, size, device_pixel_ratio=1.0):
+        """The circular pixmap of a loaded image, None until load(url) has brought it in"""
+        key = (url, size, device_pixel_ratio)
+        if key in self._pixmaps:
+            self._pixmaps.move_to_end(key)
+            return self._pixmaps[key]
+
+        source = self._sources.get(url)
+        if source is None:
+            return None
+        self._sources.move_to_end(url)
+        pixmap = circular_pixmap(source, size, device_pixel_ratio)
+        self._pixmaps[key] = pixmap
+        self.used_bytes += self._size_of(pixmap)
+        while self.used_bytes > self.max_bytes and len(self._pixmaps) > 1:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self.used_bytes -= self._size_of(evicted)
+        return pixmap
+
+    def load(self, url):
+        """Bring the image of a URL into memory.
+
+        Returns True when it's already there (memory or a fresh disk copy),
+        otherwise a download is started - or joined, if one is running - and
+        image_ready/image_failed fires once it's done.
+        """
+        if url in self._sources:
+            return True
+        if url in self._pending:
+            return False
+
+        cached = self._read_disk(url)
+        if cached and time.time() - cached["meta"].get("fetched", 0) < DISK_MAX_AGE:
+            if self._set_source(url, cached["data"]):
+                return True
+            cached = None  # Unreadable file, download it again
+
+        from PySide6.QtNetwork import QNetworkRequest
+        request = QNetworkRequest(QUrl(url))
+        if cached:
+            # Only send the image again if it changed
+            if cached["meta"].get("etag"):
+                request.setRawHeader(b"If-None-Match", cached["meta"]["etag"].encode())
+            if cached["meta"].get("last_modified"):
+                request.setRawHeader(b"If-Modified-Since", cached["meta"]["last_modified"].encode())
+        reply = self._network_manager().get(request)
+        self._pending[url] = (reply, cached)
+        reply.finished.connect(lambda: self._on_finished(url))
+        return False
+
+    def has_failed(self, url):
+        return url in self._failed
+
+    def clear(self):
+        """Forget the images in memory (the disk cache stays)"""
+        self._pixmaps.clear()
+        self._sources.clear()
+        self.used_bytes = 0
+
+    # Network
+
+    def _network_manager(self):
+        if self._network is None:
+            from PySide6.QtNetwork import QNetworkAccessManager
+            self._network = QNetworkAccessManager(self)
+        return self._network
+
+    def _on_finished(self, url):
+        from PySide6.QtNetwork import QNetworkReply, QNetworkRequest
+        reply, cached = self._pending.pop(url)
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        loaded = False
+        try:
+            if cached and status == 304:
+                # Unchanged - the disk copy is good for another day
+                self._write_meta(url, dict(cached["meta"], fetched=time.time()))
+                loaded = self._set_source(url, cached["data"])
+            elif reply.error() == QNetworkReply.NoError:
+                data = bytes(reply.readAll())
+                loaded = self._set_source(url, data)
+                if loaded:
+                    self._write_disk(url, data, reply)
+            else:
+                print(f"Error downloading image: {reply.errorString()}")
+                # Offline or server trouble - an old copy is better than none
+                loaded = bool(cached) and self._set_source(url, cached["data"])
+        except Exception as e:
+            print(f"Error processing downloaded image: {e}")
+        finally:
+            reply.deleteLater()
+
+        if loaded:
+            self._failed.discard(url)
+            self.image_ready.emit(url)
+        else:
+            self._failed.add(url)
+            self.image_failed.emit(url)
+
+    def _set_source(self, url, data):
+        image = QImage.fromData(data)
+        if image.isNull():
+            return False
+        self._sources[url] = image
+        while len(self._sources) > self.max_sources:
+            self._sources.popitem(last=False)
+        # Pixmaps of an older version of the image are stale now
+        for stale in [key for key in self._pixmaps if key[0] == url]:
+            self.used_bytes -= self._size_of(self._pixmaps.pop(stale))
+        return True
+
+    # Disk cache
+
+    def _paths(self, url):
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        if self.cache_dir is None:
+            self.cache_dir = os.path.dirname(data_path("images", "index"))
+        return os.path.join(self.cache_dir, f"{name}.img"), os.path.join(self.cache_dir, f"{name}.json")
+
+    def _read_disk(self, url):
+        """{'data': bytes, 'meta': {...}} of the cached file, None if there is none"""
+        image_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as file:
+                meta = json.load(file)
+            with open(image_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Could not read cached image for {url}: {e}")
+            return None
+        if meta.get("url") != url:
+            return None
+        return {"data": data, "meta": meta}
+
+    def _write_disk(self, url, data, reply):
+        image_path, _ = self._paths(url)
+        headers = {bytes(name).decode("latin-1").lower(): bytes(value).decode("latin-1")
+                   for name, value in reply.rawHeaderPairs()}
+        meta = {
+            "url": url,
+            "etag": headers.get("etag", ""),
+            "last_modified": headers.get("last-modified", ""),
+            "fetched": time.time(),
+        }
+        try:
+            # Temporary file first so a crash can't leave half an image
+            with open(f"{image_path}.tmp", "wb") as file:
+                file.write(data)
+            os.replace(f"{image_path}.tmp", image_path)
+        except OSError as e:
+            print(f"Could not cache image for {url}: {e}")
+            return
+        self._write_meta(url, meta)
+
+    def _write_meta(self, url, meta):
+        _, meta_path = self._paths(url)
+        try:
+            with open(f"{meta_path}.tmp", "w", encoding="utf-8") as file:
+                json.dump(meta, file)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except OSError as e:
+            print(f"Could not cache image for {url}: {e}")
+
+    @staticmethod
+    def _size_of(pixmap):
+        return pixmap.width() * pixmap.height() * 4
+
+
+# One loader (and one network manager) for the whole app
+image_loader = ImageLoader()
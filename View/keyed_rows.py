@@ -0,0 +1,60 @@
+"""
+keyed_rows.py - Keyed list of row widgets that is updated in place
+"""
+
+
+class KeyedRows:
+    """Keeps one row widget per key at the top of a box layout.
+
+    `reconcile(items)` takes the wanted rows as (key, data) pairs. Rows whose
+    key is still there get `set_data(data, is_last)` (which only touches what
+    changed), rows whose key is gone are taken out of the layout and parked in
+    a small pool, and new keys reuse a pooled row before a new one is built
+    with `create_row()`. Rows are only moved when their position changed.
+    """
+
+    def __init__(self, layout, create_row, pool_size=4):
+        self.layout = layout
+        self.create_row = create_row
+        self.pool_size = pool_size
+        self.rows = {}  # key -> row widget, in display order
+        self.pool = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def reconcile(self, items):
+        """Show exactly `items` ([(key, data)]) in this order, returns the number of rows built"""
+        wanted = dict(items)
+        for key in [key for key in self.rows if key not in wanted]:
+            self._release(self.rows.pop(key))
+
+        built = 0
+        rows = {}
+        for index, (key, data) in enumerate(items):
+            row = self.rows.get(key)
+            if row is None:
+                if self.pool:
+                    row = self.pool.pop()
+                else:
+                    row = self.create_row()
+                    built += 1
+            row.set_data(data, is_last=(index == len(items) - 1))
+            if self.layout.indexOf(row) != index:
+                self.layout.removeWidget(row)
+                self.layout.insertWidget(index, row)
+            row.show()
+            rows[key] = row
+        self.rows = rows
+        return built
+
+    def clear(self):
+        self.reconcile([])
+
+    def _release(self, row):
+        self.layout.removeWidget(row)
+        row.hide()
+        if len(self.pool) < self.pool_size:
+            self.pool.append(row)
+        else:
+            row.deleteLater()
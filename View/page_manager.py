@@ -0,0 +1,52 @@
+"""
+page_manager.py - Builds each secondary window once and reuses it
+"""
+from PySide6.QtCore import Qt
+
+
+class PageManager:
+    """Keeps one instance per page and shows it again instead of rebuilding it.
+
+    Every page is registered with a `build()` function (view + model + presenter,
+    run the first time the page is opened) and an optional `refresh(page)` that
+    brings a cached page up to date with the data the main window has. Closing a
+    page only hides it, so opening it again is a refresh plus show().
+    """
+
+    def __init__(self):
+        self._builders = {}
+        self._pages = {}
+
+    def register(self, key, build, refresh=None):
+        self._builders[key] = (build, refresh)
+
+    def page(self, key):
+        """The cached page, None if it hasn't been opened yet"""
+        return self._pages.get(key)
+
+    def open(self, key):
+        """Show the page, building it on first use"""
+        build, refresh = self._builders[key]
+        page = self._pages.get(key)
+        if page is None:
+            page = build()
+            # Closing must hide the window, not destroy the cached instance
+            page.setAttribute(Qt.WA_DeleteOnClose, False)
+            self._pages[key] = page
+        elif refresh is not None:
+            refresh(page)
+
+        if page.isMinimized():
+            page.showNormal()
+        else:
+            page.show()
+        page.raise_()
+        page.activateWindow()
+        return page
+
+    def refresh_open_pages(self):
+        """Bring every visible cached page up to date (e.g. after the main window got new data)"""
+        for key, page in self._pages.items():
+            refresh = self._builders[key][1]
+            if refresh is not None and page.isVisible():
+                refresh(page)
@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton,
                                QLabel, QSizePolicy, QGraphicsDropShadowEffect, QLineEdit, QFormLayout)
 from PySide6.QtGui import QColor, QFont
 from PySide6.QtCore import Qt, QUrl
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+from View.image_loader import image_loader
 
 
 # Define color palette and style constants for dark theme
@@ -119,66 +119,28 @@ class AvatarWidget(QFrame):
             self.layout.addWidget(self.text_label)
     
     def load_image_from_url(self):
-        """Load image from URL and set as avatar background"""
-        try:
-            # Use a network manager to download the image
-            self.network_manager = QNetworkAccessManager()
-            self.network_manager.finished.connect(self.on_image_downloaded)
-            self.network_manager.get(QNetworkRequest(QUrl(self.image_url)))
-        except Exception as e:
-            print(f"Error loading image from URL: {e}")
-            # Fallback to text-based avatar if URL loading fails
-            self.image_url = None
-    
-    def on_image_downloaded(self, reply):
-        """Process downloaded image and apply to the avatar"""
-        try:
-            if reply.error() == QNetworkReply.NoError:
-                data = reply.readAll()
-                pixmap = QPixmap()
-                pixmap.loadFromData(data)
-                
-                # Create a circular mask for the image
-                if not pixmap.isNull():
-                    self.pixmap = self.create_circular_pixmap(pixmap)
-                    self.update()  # Trigger repaint
-                else:
-                    self.image_url = None  # Fallback if pixmap is null
-            else:
-                print(f"Error downloading image: {reply.errorString()}")
-                self.image_url = None  # Fallback if download failed
-        except Exception as e:
-            print(f"Error processing downloaded image: {e}")
-            self.image_url = None
-    
-    def create_circular_pixmap(self, source_pixmap):
-        """Create a circular version of the pixmap"""
-        target = QPixmap(self.size, self.size)
-        target.fill(Qt.transparent)
-        
-        painter = QPainter(target)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Create circular path
-        path = QPainterPath()
-        path.addEllipse(0, 0, self.size, self.size)
-        
-        # Clip to circle
-        painter.setClipPath(path)
-        
-        # Scale and center the image
-        scaled_pixmap = source_pixmap.scaled(self.size, self.size, 
-                                            Qt.KeepAspectRatioByExpanding, 
-                                            Qt.SmoothTransformation)
-        
-        # Calculate position to center the image if aspect ratio is not 1:1
-        x = (self.size - scaled_pixmap.width()) // 2 if scaled_pixmap.width() > self.size else 0
-        y = (self.size - scaled_pixmap.height()) // 2 if scaled_pixmap.height() > self.size else 0
-        
-        painter.drawPixmap(x, y, scaled_pixmap)
-        painter.end()
-        
-        return target
+        """Show the image of the URL, from the shared loader's caches or once it's downloaded"""
+        if image_loader.load(self.image_url):
+            self._show_image()
+            return
+        image_loader.image_ready.connect(self._on_image_loaded)
+        image_loader.image_failed.connect(self._on_image_loaded)
+
+    def _on_image_loaded(self, url):
+        if url != self.image_url:
+            return
+        image_loader.image_ready.disconnect(self._on_image_loaded)
+        image_loader.image_failed.disconnect(self._on_image_loaded)
+        if image_loader.has_failed(url):
+            self.image_url = None  # Fallback if download failed
+        else:
+            self._show_image()
+
+    def _show_image(self):
+        pixmap = image_loader.circular_pixmap(self.image_url, self.size, self.devicePixelRatioF())
+        if pixmap is not None:
+            self.pixmap = pixmap
+            self.update()  # Trigger repaint
     
     def paintEvent(self, event):
         """Custom paint event to draw the pixmap if available"""
@@ -1,17 +1,25 @@
 import sys
-import math
-import random
 from datetime import datetime, timedelta
 
 from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton, QGridLayout,
                              QFrame, QHBoxLayout, QLabel, QScrollArea, 
-                             QSizePolicy, QGraphicsDropShadowEffect, QTableWidget, 
-                             QTableWidgetItem, QHeaderView, QSpacerItem)
+                             QGraphicsDropShadowEffect, QTableWidget, 
+                             QTableWidgetItem, QHeaderView, QSpacerItem, QListView,
+                             QAbstractItemView, QStyledItemDelegate, QStyle)
 from PySide6.QtGui import (QColor, QFont, QIcon, QPainter, QPen, QBrush, 
                           QLinearGradient, QRadialGradient, QPainterPath)
-from PySide6.QtCore import Qt, QSize, QRect, QTimer, QPointF, QEvent, QPropertyAnimation
+from PySide6.QtCore import (Qt, QSize, QRect, QTimer, QPointF, QPropertyAnimation, QObject,
+                           QAbstractListModel, QModelIndex)
 
-from View.shared_components import ColorPalette, GlobalStyle, AvatarWidget
+from View.shared_components import ColorPalette, GlobalStyle, ExportProgressDialog
+from View.chart_utils import DownsampleCache, render_cache
+from Model.Protofilio.performance_engine import PerformanceEngine
+from Model.Protofilio.positions_engine import PositionsEngine
+from Model.Protofilio.lots_engine import LotsEngine
+from Model.Protofilio.risk_engine import RiskEngine
+from Model.Stocks.symbol_metadata import symbol_metadata
+from event_system import event_system
+from Export.export_service import ExportService, file_dialog_filter, format_for_path, portfolio_export_job
 
 class PortfolioCard(QFrame):
     """Custom card widget with shadow effect and rounded corners"""
@@ -37,173 +45,206 @@ class PortfolioCard(QFrame):
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(20, 20, 20, 20)
         self.layout.setSpacing(15)
-class StockItem(QFrame):
-    """Custom stock item widget matching the home page design with sell option"""
-    def __init__(self, stock_data, is_last=False, parent=None):
-        super().__init__(parent)
-        self.stock_data = stock_data
-        self.is_last = is_last
-        self.sell_dialog = None
-        self.presenter = None  # Reference to the presenter
-        self.sell_btn = None   # Reference to the sell button
-        self.quantity_spinner = None  # Reference to the quantity spinner
 
-        # Make widget clickable
-        self.setCursor(Qt.PointingHandCursor)
-        
-        # Style with only bottom border when needed
-        border_style = "none" if is_last else f"1px solid {ColorPalette.BORDER_DARK}"
-        self.setStyleSheet(f"""
-            background-color: transparent;
-            border: none;
-            border-bottom: {border_style};
-        """)
 
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        self.setFixedHeight(65)  # Slightly reduced height
+def _stock_initials(name):
+    """Get initials from stock name"""
+    if not name:
+        return "S"
+        
+    parts = name.split()
+    if len(parts) >= 2:
+        return f"{parts[0][0]}{parts[1][0]}".upper()
+    elif name:
+        return name[0].upper()
+    return "S"
 
-        # Main layout
-        self.layout = QHBoxLayout(self)
-        self.layout.setContentsMargins(10, 8, 10, 8)  # Reduced margins
-        self.layout.setSpacing(12)
 
-        # Create and add components
-        self._setup_ui()
+def _stock_color(symbol):
+    """Get a deterministic color for a stock based on symbol"""
+    # Define a list of colors from the palette to use
+    colors = [
+        ColorPalette.ACCENT_PRIMARY,
+        ColorPalette.ACCENT_SUCCESS,
+        ColorPalette.ACCENT_INFO,
+        ColorPalette.ACCENT_WARNING,
+        ColorPalette.ACCENT_INFO,
+        ColorPalette.ACCENT_DANGER
+    ]
+    
+    # Use the symbol to pick a consistent color
+    if not symbol:
+        return colors[0]
         
-        # Connect mouse events
-        self.installEventFilter(self)
+    # Simple hash function to get a consistent index
+    index = sum(ord(c) for c in symbol) % len(colors)
+    return colors[index]
 
-    def _setup_ui(self):
-        # Get stock data
-        symbol = self.stock_data.get("symbol", "")
-        name = self.stock_data.get("name", "")
-        quantity = self.stock_data.get("quantity", 0)
-        price = self.stock_data.get("price", 0)
-        total_value = self.stock_data.get("value", 0)
-        change = self.stock_data.get("change", 0)
-        
-        # Icon with stock initials
-        initials = self._get_stock_initials(name)
-        random_color = self._get_stock_color(symbol)  # Deterministic color based on symbol
-        self.icon = AvatarWidget(initials, size=38, background_color=random_color)
-        self.layout.addWidget(self.icon)
 
-        # Stock info (name and shares)
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(2)  # Tighter spacing
+class HoldingsListModel(QAbstractListModel):
+    """Holdings shown by StocksListWidget, one row per symbol"""
+    StockRole = Qt.UserRole + 1
 
-        self.name_label = QLabel(name)
-        self.name_label.setStyleSheet(f"color: {ColorPalette.TEXT_PRIMARY}; font-weight: bold; font-size: 14px;")
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stocks = []
+        self.rows = {}  # symbol -> row
 
-        self.shares_label = QLabel(f"{quantity} shares")
-        self.shares_label.setStyleSheet(f"color: {ColorPalette.TEXT_SECONDARY}; font-size: 12px;")
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.stocks)
 
-        info_layout.addWidget(self.name_label)
-        info_layout.addWidget(self.shares_label)
-        self.layout.addLayout(info_layout, 1)  # 1 = stretch factor
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        stock = self.stocks[index.row()]
+        if role == self.StockRole:
+            return stock
+        if role == Qt.DisplayRole:
+            return stock["name"]
+        return None
 
-        # Price and total value in middle
-        value_layout = QVBoxLayout()
-        value_layout.setSpacing(2)
-        value_layout.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+    def stock(self, symbol):
+        row = self.rows.get(symbol)
+        return self.stocks[row] if row is not None else None
 
-        # Price
-        self.price_label = QLabel(f"${price:.2f}")
-        self.price_label.setStyleSheet(f"color: {ColorPalette.TEXT_PRIMARY}; font-weight: bold; font-size: 14px;")
-        self.price_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        
-        # Total value
-        self.total_label = QLabel(f"${total_value:.2f}")
-        self.total_label.setStyleSheet(f"color: {ColorPalette.TEXT_SECONDARY}; font-size: 12px;")
-        self.total_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+    def set_stocks(self, stocks_data):
+        """Show new figures - with the same symbols in the same order only the changed rows repaint"""
+        symbols = [stock["symbol"] for stock in stocks_data]
+        if len(symbols) == len(self.stocks) and all(symbol in self.rows and self.rows[symbol] == row
+                                                    for row, symbol in enumerate(symbols)):
+            old_stocks = self.stocks
+            self.stocks = list(stocks_data)
+            for row, (old, new) in enumerate(zip(old_stocks, self.stocks)):
+                if old != new:
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+            return
 
-        value_layout.addWidget(self.price_label)
-        value_layout.addWidget(self.total_label)
-        self.layout.addLayout(value_layout)
+        self.beginResetModel()
+        self.stocks = list(stocks_data)
+        self.rows = {symbol: row for row, symbol in enumerate(symbols)}
+        self.endResetModel()
 
-        # Change percentage with colored background
-        change_layout = QVBoxLayout()
-        change_layout.setSpacing(2)
-        change_layout.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        
-        change_color = ColorPalette.ACCENT_SUCCESS if change >= 0 else ColorPalette.ACCENT_DANGER
+
+class HoldingDelegate(QStyledItemDelegate):
+    """Paints a holding row like the home page's stock items, without any widgets per row"""
+    ROW_HEIGHT = 65
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = self._font(14, bold=True)
+        self.small_font = self._font(12)
+        self.price_font = self._font(14, bold=True)
+        self.change_font = self._font(13, bold=True)
+        self.avatar_font = self._font(13, bold=True)
+
+    @staticmethod
+    def _font(pixel_size, bold=False):
+        font = QFont()
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        stock = index.data(HoldingsListModel.StockRole)
+        if not stock:
+            return
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Hover highlight, otherwise a divider under every row but the last
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(ColorPalette.ACCENT_PRIMARY))
+            painter.drawRoundedRect(rect, 8, 8)
+        elif index.row() < index.model().rowCount() - 1:
+            painter.setPen(QPen(QColor(ColorPalette.BORDER_DARK), 1))
+            painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+
+        narrow = rect.width() < 300  # Like the old rows: no avatar and tighter margins when narrow
+        content = rect.adjusted(5 if narrow else 10, 8, -(5 if narrow else 10), -8)
+        left = content.left()
+
+        # Icon with stock initials
+        if not narrow:
+            avatar = QRect(left, content.center().y() - 19, 38, 38)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(_stock_color(stock["symbol"])))
+            painter.drawEllipse(avatar)
+            painter.setPen(QColor("white"))
+            painter.setFont(self.avatar_font)
+            painter.drawText(avatar, Qt.AlignCenter, _stock_initials(stock["name"])[:2])
+            left = avatar.right() + 13
+
+        # Change percentage with colored background (right)
+        change = stock["change"]
+        change_color = QColor(ColorPalette.ACCENT_SUCCESS if change >= 0 else ColorPalette.ACCENT_DANGER)
         change_text = f"+{change:.2f}%" if change >= 0 else f"{change:.2f}%"
+        painter.setFont(self.change_font)
+        change_width = painter.fontMetrics().horizontalAdvance(change_text) + 12
+        change_rect = QRect(content.right() - change_width, content.top(), change_width, 22)
+        background = QColor(change_color)
+        background.setAlpha(16)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(change_rect, 4, 4)
+        painter.setPen(change_color)
+        painter.drawText(change_rect, Qt.AlignCenter, change_text)
 
-        self.change_label = QLabel(change_text)
-        self.change_label.setStyleSheet(f"""
-            color: {change_color}; 
-            font-weight: bold; 
-            font-size: 13px;
-            background-color: {change_color}10; 
-            padding: 2px 6px; 
-            border-radius: 4px;
-        """)
-        self.change_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        # Price and total value
+        value_right = change_rect.left() - 12
+        value_width = 110
+        value_rect = QRect(value_right - value_width, content.top(), value_width, content.height())
+        painter.setFont(self.price_font)
+        painter.setPen(QColor(ColorPalette.TEXT_PRIMARY))
+        painter.drawText(value_rect, Qt.AlignRight | Qt.AlignTop, f"${stock['price']:.2f}")
+        painter.setFont(self.small_font)
+        painter.setPen(QColor(ColorPalette.TEXT_SECONDARY))
+        painter.drawText(value_rect, Qt.AlignRight | Qt.AlignBottom, f"${stock['value']:.2f}")
 
-        # Add spacer to align change at the top-right
-        change_layout.addWidget(self.change_label)
-        change_layout.addStretch()
-        
-        self.layout.addLayout(change_layout)
+        # Stock info (name and shares)
+        info_rect = QRect(left, content.top(), max(0, value_rect.left() - 12 - left), content.height())
+        painter.setFont(self.name_font)
+        painter.setPen(QColor(ColorPalette.TEXT_PRIMARY))
+        name = painter.fontMetrics().elidedText(stock["name"], Qt.ElideRight, info_rect.width())
+        painter.drawText(info_rect, Qt.AlignLeft | Qt.AlignTop, name)
+        painter.setFont(self.small_font)
+        painter.setPen(QColor(ColorPalette.TEXT_SECONDARY))
+        painter.drawText(info_rect, Qt.AlignLeft | Qt.AlignBottom, f"{stock['quantity']} shares")
 
-    def _get_stock_initials(self, name):
-        """Get initials from stock name"""
-        if not name:
-            return "S"
-            
-        parts = name.split()
-        if len(parts) >= 2:
-            return f"{parts[0][0]}{parts[1][0]}".upper()
-        elif name:
-            return name[0].upper()
-        return "S"
+        painter.restore()
 
-    def _get_stock_color(self, symbol):
-        """Get a deterministic color for a stock based on symbol"""
-        # Define a list of colors from the palette to use
-        colors = [
-            ColorPalette.ACCENT_PRIMARY,
-            ColorPalette.ACCENT_SUCCESS,
-            ColorPalette.ACCENT_INFO,
-            ColorPalette.ACCENT_WARNING,
-            ColorPalette.ACCENT_INFO,
-            ColorPalette.ACCENT_DANGER
-        ]
-        
-        # Use the symbol to pick a consistent color
-        if not symbol:
-            return colors[0]
-            
-        # Simple hash function to get a consistent index
-        index = sum(ord(c) for c in symbol) % len(colors)
-        return colors[index]
-    
-    def eventFilter(self, obj, event):
-        """Handle mouse events"""
-        if obj == self:
-            if event.type() == QEvent.Enter:
-                # Mouse enter - highlight
-                self.setStyleSheet(f"""
-                    background-color: {ColorPalette.ACCENT_PRIMARY};
-                    border: none;
-                    
-                    border-radius: 8px;
-                """)
-                return True
-            elif event.type() == QEvent.Leave:
-                # Mouse leave - restore
-                self.setStyleSheet(f"""
-                    background-color: transparent;
-                    border: none;
-                    
-                """)
-                return True
-            elif event.type() == QEvent.MouseButtonPress:
-                # Mouse click - show options
-                self._show_stock_options()
-                return True
-        
-        return super().eventFilter(obj, event)
+
+class StockItem(QObject):
+    """State of one holding row, kept per symbol by StocksListWidget.
+
+    Rows are painted by HoldingDelegate, so this only exists for holdings the
+    user clicked: it owns the sell dialog, which stays open (and is kept up to
+    date) while the list refreshes or scrolls.
+    """
+    def __init__(self, stock_data, parent=None):
+        super().__init__(parent)
+        self.stock_data = stock_data
+        self.sell_dialog = None
+        self.presenter = None  # Reference to the presenter
+        self.sell_btn = None   # Reference to the sell button
+        self.quantity_spinner = None  # Reference to the quantity spinner
+        self.dialog_labels = {}
+
+    def set_data(self, stock_data):
+        """New figures for the holding, an open sell dialog shows them right away"""
+        self.stock_data = stock_data
+        if self.sell_dialog is None:
+            return
+        self.dialog_labels["price"].setText(f"Current Price: ${stock_data.get('price', 0):.2f}")
+        self.dialog_labels["shares"].setText(f"Shares Owned: {stock_data.get('quantity', 0)}")
+        self.dialog_labels["value"].setText(f"Total Value: ${stock_data.get('value', 0):.2f}")
+        self.quantity_spinner.setMaximum(max(1, int(stock_data.get('quantity', 1))))
+        self.dialog_labels["update_proceeds"]()
     
     def register_presenter(self, presenter):
         """Register the presenter for this stock item"""
@@ -234,7 +275,7 @@ class StockItem(QFrame):
             return
         
         # Create dialog for stock actions
-        self.sell_dialog = QDialog(self.window())
+        self.sell_dialog = QDialog(self.parent().window())
         self.sell_dialog.setWindowTitle(f"Sell {self.stock_data.get('name', 'Stock')}")
         self.sell_dialog.setMinimumWidth(300)
         self.sell_dialog.setStyleSheet(f"""
@@ -273,7 +314,7 @@ class StockItem(QFrame):
             font-size: 14px;
         """)
         self.quantity_spinner.setMinimum(1)
-        self.quantity_spinner.setMaximum(self.stock_data.get('quantity', 1))
+        self.quantity_spinner.setMaximum(max(1, int(self.stock_data.get('quantity', 1))))
         self.quantity_spinner.setValue(1)
         
         quantity_layout.addWidget(quantity_label)
@@ -290,6 +331,8 @@ class StockItem(QFrame):
             proceeds_label.setText(f"Estimated Proceeds: ${price * qty:.2f}")
         
         self.quantity_spinner.valueChanged.connect(update_proceeds)
+        self.dialog_labels = {"price": price_label, "shares": shares_owned, "value": total_value,
+                              "update_proceeds": update_proceeds}
         
         dialog_layout.addWidget(proceeds_label)
 
@@ -324,6 +367,7 @@ class StockItem(QFrame):
         self.sell_dialog = None
         self.sell_btn = None
         self.quantity_spinner = None
+        self.dialog_labels = {}
     
     def _execute_sell(self, quantity):
         """Execute the sell order"""
@@ -336,7 +380,7 @@ class StockItem(QFrame):
         price = self.stock_data.get("price", 0)
         
         # Display confirmation message
-        confirmation = QMessageBox(self.window())
+        confirmation = QMessageBox(self.parent().window())
         confirmation.setWindowTitle("Order Executed")
         confirmation.setText(f"Successfully sold {quantity} shares of {name} ({symbol}) at ${price:.2f}")
         confirmation.setIcon(QMessageBox.Information)
@@ -386,14 +430,32 @@ class StockTableWidget(QTableWidget):
         font.setPointSize(11)
         self.setFont(font)
 
-class StocksListWidget(QScrollArea):
-    """Custom scrollable list of stocks matching home page design with clickable stocks"""
+class StocksListWidget(QListView):
+    """Scrollable list of holdings matching home page design with clickable stocks.
+
+    Rows are painted by HoldingDelegate from HoldingsListModel, so only the
+    visible ones cost anything and thousands of holdings scroll smoothly.
+    Clicking a row opens its sell dialog, which lives in a StockItem kept per
+    symbol so it survives refreshes.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWidgetResizable(True)
+        self.holdings_model = HoldingsListModel(self)
+        self.setModel(self.holdings_model)
+        self.setItemDelegate(HoldingDelegate(self))
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(16)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+        self.viewport().setCursor(Qt.PointingHandCursor)
         self.setFrameShape(QFrame.NoFrame)
         self.setStyleSheet("""
-            QScrollArea {
+            QListView {
                 background: transparent;
                 border: none;
             }
@@ -411,51 +473,63 @@ class StocksListWidget(QScrollArea):
                 height: 0px;
             }
         """)
-        
-        # Container widget
-        self.container = QWidget()
-        self.container.setStyleSheet("background: transparent;")
-        
-        # Layout for stock items
-        self.layout = QVBoxLayout(self.container)
-        self.layout.setContentsMargins(0, 0, 0, 0)
-        self.layout.setSpacing(0)
-        
-        # Set the container as the scroll area widget
-        self.setWidget(self.container)
+
+        self.presenter = None
+        self.items = {}  # symbol -> StockItem, made when a row is first clicked
+        self.clicked.connect(self._on_row_clicked)
         
     def set_stocks(self, stocks_data):
-        """Set the stocks to display in the list"""
-        # Clear existing items
-        self._clear_layout()
-        
-        # Add stock items
-        if not stocks_data:
+        """Set the stocks to display in the list (one dict per symbol)"""
+        self.holdings_model.set_stocks(stocks_data)
+
+        # Open dialogs follow their holding, or close once it's gone
+        for symbol, item in list(self.items.items()):
+            stock_data = self.holdings_model.stock(symbol)
+            if stock_data is not None:
+                item.set_data(stock_data)
+                continue
+            del self.items[symbol]
+            if item.sell_dialog is not None:
+                item.sell_dialog.close()
+            item.deleteLater()
+        self.viewport().update()
+
+    def register_presenter(self, presenter):
+        """Register the presenter for every row, including the ones made later"""
+        self.presenter = presenter
+        for item in self.items.values():
+            item.register_presenter(presenter)
+
+    def stock_item(self, symbol):
+        """The StockItem of a listed symbol, made on first use"""
+        item = self.items.get(symbol)
+        if item is None:
+            stock_data = self.holdings_model.stock(symbol)
+            if stock_data is None:
+                return None
+            item = StockItem(stock_data, parent=self)
+            if self.presenter:
+                item.register_presenter(self.presenter)
+            self.items[symbol] = item
+        return item
+
+    def _on_row_clicked(self, index):
+        stock_data = index.data(HoldingsListModel.StockRole)
+        if stock_data:
+            self.stock_item(stock_data["symbol"])._show_stock_options()
+
+    def paintEvent(self, event):
+        if self.holdings_model.rowCount() == 0:
             # Show empty state
-            empty_label = QLabel("You don't have any stocks yet")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet(f"""
-                color: {ColorPalette.TEXT_SECONDARY};
-                font-size: 16px;
-                padding: 30px;
-            """)
-            self.layout.addWidget(empty_label)
-        else:
-            # Add each stock item
-            for i, stock_data in enumerate(stocks_data):
-                # Use our updated StockItem class with click functionality
-                item = StockItem(stock_data, is_last=(i == len(stocks_data) - 1), parent=self)
-                self.layout.addWidget(item)
-                
-        # Add stretch to push items to the top
-        self.layout.addStretch(1)
-        
-    def _clear_layout(self):
-        """Clear all widgets from the layout"""
-        while self.layout.count():
-            item = self.layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+            painter = QPainter(self.viewport())
+            font = QFont()
+            font.setPixelSize(16)
+            painter.setFont(font)
+            painter.setPen(QColor(ColorPalette.TEXT_SECONDARY))
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter, "You don't have any stocks yet")
+            painter.end()
+            return
+        super().paintEvent(event)
 
 
 class PortfolioSummaryWidget(QFrame):
@@ -523,6 +597,8 @@ class AssetAllocationWidget(QFrame):
     def __init__(self, allocations, parent=None):
         super().__init__(parent)
         self.allocations = allocations
+        self.allocations_version = 0
+        self._render_owner = render_cache.new_owner(self)
         self.setMinimumHeight(300)
         self.setStyleSheet(f"""
             background-color: transparent;
@@ -624,14 +700,22 @@ class AssetAllocationWidget(QFrame):
         
         # Only draw in the chart area
         chart_area = self.chart_area.geometry()
+        if chart_area.width() <= 0 or chart_area.height() <= 0:
+            return
         
+        # The pie is only redrawn when the allocations or the chart size change
+        pixmap = render_cache.pixmap(self._render_owner, self.allocations_version, chart_area.width(),
+                                     chart_area.height(), self.devicePixelRatioF(), self._paint_pie)
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
+        painter.drawPixmap(chart_area.topLeft(), pixmap)
+        painter.end()
+
+    def _paint_pie(self, painter, width, height):
+        """Draw the donut chart into a width x height area"""
         # Define the pie chart dimensions
-        center_x = chart_area.x() + chart_area.width() // 2
-        center_y = chart_area.y() + chart_area.height() // 2
-        radius = min(chart_area.width(), chart_area.height()) // 2 - 20
+        center_x = width // 2
+        center_y = height // 2
+        radius = min(width, height) // 2 - 20
         
         # Draw pie slices
         start_angle = 0
@@ -648,10 +732,6 @@ class AssetAllocationWidget(QFrame):
             path = QPainterPath()
             path.moveTo(center_x, center_y)
             
-            # Convert degrees to radians for the arc
-            start_rad = math.radians(start_angle)
-            end_rad = math.radians(start_angle + angle)
-            
             # Add arc to path
             path.arcTo(center_x - radius, center_y - radius, radius * 2, radius * 2, 
                       start_angle, angle)
@@ -676,9 +756,12 @@ class PerformanceChartWidget(QFrame):
             background-color: transparent;
             border: none;
         """)
+        self._render_owner = render_cache.new_owner(self)
+        self._downsample_cache = DownsampleCache()
         
-        # Generate sample data
-        self.generate_sample_data()
+        # Filled in by set_series once the performance engine has the ledger and prices
+        self.performance_data = {}
+        self.data_version = 0
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -717,50 +800,11 @@ class PerformanceChartWidget(QFrame):
         period_layout.addStretch()
         layout.addLayout(period_layout)
     
-    def generate_sample_data(self):
-        """Generate sample performance data"""
-        # Base value and ranges for different periods
-        self.performance_data = {
-            "1D": self._generate_points(24, 5, 2),
-            "1W": self._generate_points(7, 10, 5),
-            "1M": self._generate_points(30, 15, 8),
-            "3M": self._generate_points(90, 20, 12),
-            "YTD": self._generate_points(180, 25, 15),
-            "1Y": self._generate_points(365, 30, 20),
-            "All": self._generate_points(1000, 40, 25)
-        }
-    
-    def _generate_points(self, num_points, max_change, volatility):
-        """Generate realistic looking stock chart data"""
-        points = []
-        base_value = 100
-        current = base_value
-        
-        # Start with base value
-        points.append((0, current))
-        
-        # Generate data with some trends and volatility
-        trend = random.uniform(-max_change, max_change)
-        trend_change_chance = 0.1  # Chance to change trend direction
-        
-        for i in range(1, num_points):
-            # Maybe change the trend
-            if random.random() < trend_change_chance:
-                trend = random.uniform(-max_change, max_change)
-            
-            # Daily change with trend influence
-            change = random.uniform(-volatility, volatility) + (trend / num_points)
-            
-            # Apply change percentage
-            current += current * (change / 100)
-            
-            # Ensure we don't go below a floor value
-            current = max(current, base_value * 0.5)
-            
-            # Add point
-            points.append((i, current))
-        
-        return points
+    def set_series(self, series_by_period, version):
+        """Show the value series of each period ({period: (days, values)}) from the performance engine"""
+        self.performance_data = {period: values for period, (_, values) in series_by_period.items()}
+        self.data_version = version
+        self.update()
     
     def select_period(self, period):
         """Handle period selection"""
@@ -781,20 +825,29 @@ class PerformanceChartWidget(QFrame):
         """Paint the performance chart"""
         super().paintEvent(event)
         
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
         # Get chart area
         chart_rect = self.chart_area.geometry()
+        if chart_rect.width() <= 0 or chart_rect.height() <= 0:
+            return
         
+        # Each period keeps its own cached render, so switching back and forth is a blit
+        pixmap = render_cache.pixmap(self._render_owner, (self.data_version, self.selected_period),
+                                     chart_rect.width(), chart_rect.height(), self.devicePixelRatioF(),
+                                     self._paint_chart)
+        painter = QPainter(self)
+        painter.drawPixmap(chart_rect.topLeft(), pixmap)
+        painter.end()
+
+    def _paint_chart(self, painter, width, height):
+        """Draw the line and fill of the selected period into a width x height area"""
         # Get data for selected period
-        data = self.performance_data.get(self.selected_period, [])
-        if not data:
+        data = self.performance_data.get(self.selected_period)
+        if data is None or len(data) < 2:
             return
         
         # Determine min/max values
-        min_value = min(point[1] for point in data)
-        max_value = max(point[1] for point in data)
+        min_value = data.min()
+        max_value = data.max()
         value_range = max_value - min_value
         
         # Add padding to value range
@@ -804,25 +857,21 @@ class PerformanceChartWidget(QFrame):
         value_range = max_value - min_value
         
         # Calculate scaling factors
-        x_scale = chart_rect.width() / (len(data) - 1) if len(data) > 1 else 1
-        y_scale = chart_rect.height() / value_range if value_range > 0 else 1
+        x_scale = width / (len(data) - 1)
+        y_scale = height / value_range if value_range > 0 else 1
         
-        # Create points for the line
-        points = []
-        for i, (x, y) in enumerate(data):
-            px = chart_rect.x() + i * x_scale
-            # Invert Y coordinates (0 at top)
-            py = chart_rect.y() + chart_rect.height() - ((y - min_value) * y_scale)
-            points.append(QPointF(px, py))
+        # Create points for the line (LTTB keeps the shape of long periods at this width)
+        indices = self._downsample_cache.indices((self.data_version, self.selected_period), width, data)
+        xs = indices * x_scale
+        # Invert Y coordinates (0 at top)
+        ys = height - ((data[indices] - min_value) * y_scale)
+        points = [QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
         
         # Create gradient for the area under the line
-        gradient = QLinearGradient(
-            chart_rect.x(), chart_rect.y(), 
-            chart_rect.x(), chart_rect.y() + chart_rect.height()
-        )
+        gradient = QLinearGradient(0, 0, 0, height)
         
         # Determine if trend is positive or negative
-        is_positive = data[-1][1] >= data[0][1]
+        is_positive = data[-1] >= data[0]
         
         if is_positive:
             gradient.setColorAt(0, QColor(ColorPalette.ACCENT_SUCCESS + "40"))  # 25% opacity
@@ -833,32 +882,24 @@ class PerformanceChartWidget(QFrame):
             gradient.setColorAt(1, QColor(ColorPalette.ACCENT_DANGER + "00"))  # Transparent
             line_color = QColor(ColorPalette.ACCENT_DANGER)
         
-        # Create fill path
-        fill_path = QPainterPath()
-        
-        if points:
-            fill_path.moveTo(points[0])
-            for point in points[1:]:
-                fill_path.lineTo(point)
-                
-            # Complete the path for filling
-            fill_path.lineTo(chart_rect.x() + chart_rect.width(), chart_rect.y() + chart_rect.height())
-            fill_path.lineTo(chart_rect.x(), chart_rect.y() + chart_rect.height())
-            fill_path.closeSubpath()
-            
-            # Fill the area under the line
-            painter.fillPath(fill_path, gradient)
-            
-            # Draw the line
-            painter.setPen(QPen(line_color, 2))
-            
-            # Draw the line path
-            line_path = QPainterPath()
-            line_path.moveTo(points[0])
-            for point in points[1:]:
-                line_path.lineTo(point)
-                
-            painter.drawPath(line_path)
+        # Line path, reused as the top edge of the fill
+        line_path = QPainterPath()
+        line_path.moveTo(points[0])
+        for point in points[1:]:
+            line_path.lineTo(point)
+        
+        # Complete the path for filling
+        fill_path = QPainterPath(line_path)
+        fill_path.lineTo(width, height)
+        fill_path.lineTo(0, height)
+        fill_path.closeSubpath()
+        
+        # Fill the area under the line
+        painter.fillPath(fill_path, gradient)
+        
+        # Draw the line
+        painter.setPen(QPen(line_color, 2))
+        painter.drawPath(line_path)
 
 class PortfolioHeaderWidget(QFrame):
     """Custom header for portfolio page to match dashboard style"""
@@ -917,6 +958,19 @@ class PortfolioPage(QWidget):
         self.user_transactions = []  # Placeholder for transaction history
         self.firebaseUserId = firebaseUserId
         
+        # Exports are written by a background worker
+        self.export_service = ExportService(self)
+        
+        # Holdings per symbol with running totals, and the daily value from the ledger and price history
+        self.positions = PositionsEngine()
+        self.performance_engine = PerformanceEngine()
+        self.lots = LotsEngine()  # Tax lots for the export's cost basis and realized P&L
+        self.risk = RiskEngine()
+        self.risk_report = None
+        # Sectors/names that arrive later are picked up on the next sync
+        # (through a method of the page, so the connection goes away with it)
+        symbol_metadata.updated.connect(self._on_symbol_metadata_updated)
+        
         # Set up basic styling
         self.setStyleSheet(f"""
             background-color: {ColorPalette.BG_DARK};
@@ -979,36 +1033,25 @@ class PortfolioPage(QWidget):
         """
         self.presenter = presenter
 
+    def _synced_positions(self):
+        """Positions engine updated with the current holdings and prices (a no-op when nothing changed)"""
+        self.positions.sync(self.user_stocks, self.stocks_the_user_has)
+        return self.positions
+
     def _calculate_daily_change(self):
         """Calculate total daily change in portfolio value"""
-        total_change = 0
-        for stock in self.user_stocks:
-            symbol = stock['stockSymbol']
-            quantity = stock['quantity']
-            
-            if symbol in self.stocks_the_user_has:
-                stock_details = self.stocks_the_user_has[symbol]
-                current_price = stock_details.get('currentPrice', 0)
-                previous_close = stock_details.get('previousClose', current_price * 0.99)  # Fallback
-                
-                total_change += (current_price - previous_close) * quantity
-        
-        return total_change  # Add this return statement
+        return self._synced_positions().daily_change
 
     def _calculate_daily_change_percent(self):
         """Calculate percentage change of portfolio"""
-        total_value = self._calculate_total_portfolio_value()
-        daily_change = self._calculate_daily_change()
-        
-        
-        return (daily_change / total_value * 100) if total_value > 0 else 0
+        return self._synced_positions().daily_change_percent
     
     def _calculate_asset_allocation(self):
         """Calculate asset allocation percentages"""
-        total_value = self._calculate_total_portfolio_value()
+        positions = self._synced_positions()
         
         # If no stocks, return default allocation
-        if not self.user_stocks or total_value == 0:
+        if not self.user_stocks or positions.total_value == 0:
             return {
                 "Stocks": (65, "ACCENT_PRIMARY"),
                 "Bonds": (20, "ACCENT_SUCCESS"),
@@ -1016,20 +1059,6 @@ class PortfolioPage(QWidget):
                 "Cash": (5, "ACCENT_WARNING")
             }
         
-        # Group stocks by sector
-        sector_allocation = {}
-        for stock in self.user_stocks:
-            symbol = stock['stockSymbol']
-            quantity = stock['quantity']
-            
-            if symbol in self.stocks_the_user_has:
-                stock_details = self.stocks_the_user_has[symbol]
-                sector = stock_details.get('sector', 'Other')
-                current_price = stock_details.get('currentPrice', 0)
-                stock_value = current_price * quantity
-                
-                sector_allocation[sector] = sector_allocation.get(sector, 0) + stock_value
-        
         # Convert to percentages
         color_mapping = {
             "Technology": "ACCENT_PRIMARY",
@@ -1040,8 +1069,7 @@ class PortfolioPage(QWidget):
         }
         
         result = {}
-        for sector, value in sector_allocation.items():
-            percentage = (value / total_value) * 100
+        for sector, percentage in positions.allocation().items():
             color = color_mapping.get(sector, "ACCENT_SECONDARY")
             result[sector] = (round(percentage, 1), color)
         
@@ -1078,16 +1106,21 @@ class PortfolioPage(QWidget):
         change_type = "positive" if daily_change >= 0 else "negative"
         
         # Define metrics to display - with proper formatting for the UI
-        metrics = [
-            ("Portfolio Value", f"${total_value:,.2f}", "", change_text, change_type),
-            ("Cash Balance", f"${self.balance:,.2f}", "", "", ""),
-            ("Annual Return", "18.5%", "+2.3% MTD", "", ""),
-            ("Total Assets", f"${total_value + self.balance:,.2f}", "", "", "")
-        ]
+        metrics = self._summary_metrics(total_value, change_text, change_type)
         
         # Create and add the summary metrics widget
-        summary_metrics = PortfolioSummaryWidget(metrics)
-        summary_layout.addWidget(summary_metrics)
+        self.summary_metrics = PortfolioSummaryWidget(metrics)
+        self.summary_card_layout = summary_layout
+        summary_layout.addWidget(self.summary_metrics)
+
+        # Risk figures, filled in once the price history is loaded
+        self.risk_label = QLabel(self._risk_text())
+        self.risk_label.setWordWrap(True)
+        self.risk_label.setStyleSheet(f"""
+            color: {ColorPalette.TEXT_SECONDARY};
+            font-size: 13px;
+        """)
+        summary_layout.addWidget(self.risk_label)
         
         # Asset allocation
         asset_allocation_card = PortfolioCard()
@@ -1124,13 +1157,20 @@ class PortfolioPage(QWidget):
         performance_card = PortfolioCard()
         performance_layout = performance_card.layout
         
-
+        performance_title = QLabel("Performance")
+        performance_title.setStyleSheet(f"""
+            color: {ColorPalette.TEXT_PRIMARY};
+            font-size: 18px;
+            font-weight: bold;
+        """)
+        performance_layout.addWidget(performance_title)
         
-
+        self.performance_chart = PerformanceChartWidget()
+        performance_layout.addWidget(self.performance_chart)
         
         # Add to section layout
         section_layout.addWidget(holdings_card, 5)      # More space for holdings
-  # Less space for performance
+        section_layout.addWidget(performance_card, 3)   # Less space for performance
         
         self.content_layout.addWidget(section)
         
@@ -1138,22 +1178,80 @@ class PortfolioPage(QWidget):
         self.details_section = section
         self.details_section_layout = section_layout
 
+    def _on_symbol_metadata_updated(self):
+        self.positions.invalidate_details()
+
+    def set_performance_data(self, transactions, histories):
+        """Feed the performance and lots engines, only new bars and new trades are applied"""
+        for symbol, history in histories.items():
+            self.performance_engine.sync_price_history(symbol, history)
+        self.performance_engine.sync_ledger(transactions)
+        self.lots.sync_ledger(transactions)
+        self.performance_chart.set_series(self.performance_engine.all_series(),
+                                          self.performance_engine.version)
+        if self._update_risk():
+            self._update_summary_section(self._calculate_total_portfolio_value(),
+                                         self._calculate_daily_change(),
+                                         self._calculate_daily_change_percent())
+
+    def _update_risk(self):
+        """Recompute the risk figures (cached until the holdings or the history change), True if they changed"""
+        report = self.risk.report(self.performance_engine, self._synced_positions())
+        if report is self.risk_report:
+            return False
+        self.risk_report = report
+        if hasattr(self, 'risk_label'):
+            self.risk_label.setText(self._risk_text())
+        event_system.risk_updated.emit(report)
+        return True
+
+    def _summary_metrics(self, total_value, change_text, change_type):
+        """Metrics for the PortfolioSummaryWidget"""
+        report = self.risk_report or {}
+        annual_return = report.get('annual_return')
+        mtd_return = report.get('mtd_return')
+        return [
+            ("Portfolio Value", f"${total_value:,.2f}", "", change_text, change_type),
+            ("Cash Balance", f"${self.balance:,.2f}", "", "", ""),
+            ("Annual Return",
+             f"{annual_return * 100:.1f}%" if annual_return is not None else "--",
+             f"{mtd_return * 100:+.1f}% MTD" if mtd_return is not None else "", "", ""),
+            ("Total Assets", f"${total_value + self.balance:,.2f}", "", "", "")
+        ]
+
+    def _risk_text(self):
+        """One line with the risk figures of the current holdings"""
+        report = self.risk_report
+        if not report or report['volatility'] is None:
+            return "Risk: not enough price history yet"
+        parts = [f"Volatility {report['volatility'] * 100:.1f}%"]
+        if report['beta'] is not None:
+            parts.append(f"Beta {report['beta']:.2f} vs {report['benchmark']}")
+        parts.append(f"Max drawdown {report['max_drawdown'] * 100:.1f}%")
+        if report['var_historical'] is not None:
+            parts.append(f"1-day VaR ({report['confidence'] * 100:.0f}%) "
+                         f"${report['var_historical']:,.0f} hist / ${report['var_parametric']:,.0f} param")
+        return "Risk:  " + "  ·  ".join(parts)
+
     def _calculate_total_portfolio_value(self):
         """Calculate total current value of portfolio"""
-        total = 0
-        for stock in self.user_stocks:
-            symbol = stock['stockSymbol']
-            quantity = stock['quantity']
-            
-            if symbol in self.stocks_the_user_has:
-                current_price = self.stocks_the_user_has[symbol].get('currentPrice', 0)
-                total += current_price * quantity
-        
-        return total
+        return self._synced_positions().total_value
+
+    def update_data(self, user_stocks=None, stocks_the_user_has=None, balance=None):
+        """Bring a cached page up to date, nothing is redrawn when the data didn't change"""
+        changed = False
+        for name, value in (("user_stocks", user_stocks), ("stocks_the_user_has", stocks_the_user_has),
+                            ("balance", balance)):
+            if value is not None and value != getattr(self, name):
+                setattr(self, name, value)
+                changed = True
+        if changed:
+            self.update_after_transaction()
 
     def update_after_transaction(self):
         """Update the view after a successful transaction"""
         # Recalculate portfolio metrics
+        self._update_risk()
         total_value = self._calculate_total_portfolio_value()
         daily_change = self._calculate_daily_change()
         daily_change_percent = self._calculate_daily_change_percent()
@@ -1166,48 +1264,61 @@ class PortfolioPage(QWidget):
         
     def _update_summary_section(self, total_value, daily_change, daily_change_percent):
         """Update the summary section with new values"""
-        # Find and update the PortfolioSummaryWidget
-        try:
-            for i in range(self.summary_section_layout.count()):
-                widget = self.summary_section_layout.itemAt(i).widget()
-                if isinstance(widget, PortfolioCard):
-                    for j in range(widget.layout.count()):
-                        item = widget.layout.itemAt(j).widget()
-                        if isinstance(item, PortfolioSummaryWidget):
-                            # Create updated metrics
-                            change_sign = "+" if daily_change >= 0 else ""
-                            change_text = f"{change_sign}${daily_change:.2f} ({change_sign}{daily_change_percent:.2f}%)"
-                            change_type = "positive" if daily_change >= 0 else "negative"
-                            
-                            metrics = [
-                                ("Portfolio Value", f"${total_value:,.2f}", "", change_text, change_type),
-                                ("Cash Balance", f"${self.balance:,.2f}", "", "", ""),
-                                ("Annual Return", "18.5%", "+2.3% MTD", "", ""),
-                                ("Total Assets", f"${total_value + self.balance:,.2f}", "", "", "")
-                            ]
-                            
-                            # Replace with a new widget
-                            widget.layout.removeWidget(item)
-                            item.deleteLater()
-                            widget.layout.addWidget(PortfolioSummaryWidget(metrics))
-        except (AttributeError, IndexError) as e:
-            print(f"Error updating summary section: {e}")
+        if not hasattr(self, 'summary_metrics'):
+            return
+        change_sign = "+" if daily_change >= 0 else ""
+        change_text = f"{change_sign}${daily_change:.2f} ({change_sign}{daily_change_percent:.2f}%)"
+        change_type = "positive" if daily_change >= 0 else "negative"
+        metrics = self._summary_metrics(total_value, change_text, change_type)
+
+        # Swap the figures at the same spot, above the risk line
+        layout = self.summary_card_layout
+        index = layout.indexOf(self.summary_metrics)
+        layout.removeWidget(self.summary_metrics)
+        self.summary_metrics.deleteLater()
+        self.summary_metrics = PortfolioSummaryWidget(metrics)
+        layout.insertWidget(index, self.summary_metrics)
 
     def _refresh_holdings(self):
-        """Refresh the holdings section with updated stock data"""
+        """Refresh the holdings list in place with updated stock data"""
         try:
-            # Find the holdings card and replace it
-            holdings_card = self.details_section_layout.itemAt(0).widget()
-            if holdings_card:
-                self.details_section_layout.removeWidget(holdings_card)
-                holdings_card.deleteLater()
-                
-                # Create new holdings card
-                new_holdings_card = self._create_portfolio_holdings_updated()
-                self.details_section_layout.insertWidget(0, new_holdings_card, 3)
-        except (AttributeError, IndexError) as e:
+            self._update_stock_list()
+        except AttributeError as e:
             print(f"Error refreshing holdings: {e}")
 
+    def _holdings_list_data(self):
+        """One row per held symbol for the holdings list"""
+        stocks_data = []
+        for position in self._synced_positions().holdings():
+            current_price = position['price']
+            previous_price = position['previous_close']
+            quantity = position['quantity']
+            if quantity == int(quantity):
+                quantity = int(quantity)
+
+            # Calculate daily change
+            daily_change = ((current_price - previous_price) / previous_price) * 100 if previous_price else 0
+
+            stocks_data.append({
+                "symbol": position['symbol'],
+                "name": position['name'],
+                "quantity": quantity,
+                "price": current_price,
+                "value": current_price * quantity,
+                "change": daily_change
+            })
+        return stocks_data
+
+    def _update_stock_list(self):
+        stocks_data = self._holdings_list_data()
+        self.stock_list.set_stocks(stocks_data)
+
+        # Set a reasonable height - not too large when we have few stocks
+        min_height = 180
+        ideal_height = min(350, max(min_height, len(stocks_data) * HoldingDelegate.ROW_HEIGHT + 20))
+        self.stock_list.setMinimumHeight(ideal_height)
+        self.stock_list.setMaximumHeight(ideal_height)
+
     def _create_portfolio_holdings_updated(self):
         """Create an enhanced section to display user's stock holdings with the home page design"""
         # Create a card for holdings
@@ -1236,42 +1347,12 @@ class PortfolioPage(QWidget):
         
         holdings_layout.addLayout(title_row)
         
-        # Prepare data for stock list
-        stocks_data = []
-        for stock in self.user_stocks:
-            symbol = stock['stockSymbol']
-            quantity = stock['quantity']
-            
-            if symbol in self.stocks_the_user_has:
-                stock_details = self.stocks_the_user_has[symbol]
-                name = stock_details.get('name', symbol)
-                current_price = stock_details.get('currentPrice', 0)
-                previous_price = stock_details.get('previousClose', current_price * 0.99)
-                total_value = current_price * quantity
-                
-                # Calculate daily change
-                daily_change = ((current_price - previous_price) / previous_price) * 100
-                
-                stocks_data.append({
-                    "symbol": symbol,
-                    "name": name,
-                    "quantity": quantity,
-                    "price": current_price,
-                    "value": total_value,
-                    "change": daily_change
-                })
-        
-        # Create and add the stock list widget
-        stock_list = StocksListWidget()
-        stock_list.set_stocks(stocks_data)
-        
-        # Set a reasonable height - not too large when we have few stocks
-        min_height = 180
-        ideal_height = min(350, max(min_height, len(stocks_data) * 65 + 20))
-        stock_list.setMinimumHeight(ideal_height)
-        stock_list.setMaximumHeight(ideal_height)
+        # Create and add the stock list widget, refreshes update it in place
+        self.stock_list = StocksListWidget()
+        self.stock_items = self.stock_list.items  # symbol -> StockItem, kept current by the list
+        self._update_stock_list()
         
-        holdings_layout.addWidget(stock_list)
+        holdings_layout.addWidget(self.stock_list)
         
         # Action row at the bottom
         action_row = QHBoxLayout()
@@ -1279,7 +1360,7 @@ class PortfolioPage(QWidget):
         
 
         
-        export_btn = QPushButton("Export to csv")
+        export_btn = QPushButton("Export")
         export_btn.setStyleSheet(GlobalStyle.SECONDARY_BUTTON)
         export_btn.setFixedHeight(35)
 
@@ -1296,124 +1377,31 @@ class PortfolioPage(QWidget):
     
 
     def _export_portfolio_to_csv(self):
-        """Export portfolio data to a CSV file"""
+        """Export portfolio data (CSV, JSON Lines or Parquet) in a background worker"""
         from PySide6.QtWidgets import QFileDialog
-        import csv
         from datetime import datetime
+
+        if self.export_service.is_running():
+            return
         
         # Get save location from user
-        file_name, _ = QFileDialog.getSaveFileName(
+        file_name, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Export Portfolio Data",
             f"portfolio_export_{datetime.now().strftime('%Y%m%d')}.csv",
-            "CSV Files (*.csv)"
+            file_dialog_filter()
         )
         
         # If user cancels, return
         if not file_name:
             return
-        
-        try:
-            # Prepare data for export
-            rows = []
-            
-            # Add header row
-            rows.append([
-                "Symbol", 
-                "Name", 
-                "Quantity", 
-                "Current Price ($)", 
-                "Total Value ($)", 
-                "Daily Change (%)",
-                "Sector"
-            ])
-            
-            # Add data rows
-            for stock in self.user_stocks:
-                symbol = stock['stockSymbol']
-                quantity = stock['quantity']
-                
-                if symbol in self.stocks_the_user_has:
-                    stock_details = self.stocks_the_user_has[symbol]
-                    name = stock_details.get('name', symbol)
-                    current_price = stock_details.get('currentPrice', 0)
-                    previous_price = stock_details.get('previousClose', current_price * 0.99)
-                    total_value = current_price * quantity
-                    sector = stock_details.get('sector', 'N/A')
-                    
-                    # Calculate daily change
-                    daily_change = ((current_price - previous_price) / previous_price) * 100
-                    
-                    rows.append([
-                        symbol,
-                        name,
-                        quantity,
-                        f"{current_price:.2f}",
-                        f"{total_value:.2f}",
-                        f"{daily_change:.2f}",
-                        sector
-                    ])
-            
-            # Add summary row
-            total_portfolio_value = self._calculate_total_portfolio_value()
-            rows.append([])  # Empty row for separation
-            rows.append([
-                "TOTAL",
-                "",
-                "",
-                "",
-                f"{total_portfolio_value:.2f}",
-                "",
-                ""
-            ])
-            
-            # Add cash balance
-            rows.append([
-                "CASH",
-                "Cash Balance",
-                "",
-                "",
-                f"{self.balance:.2f}",
-                "",
-                ""
-            ])
-            
-            # Add total assets
-            rows.append([
-                "TOTAL ASSETS",
-                "",
-                "",
-                "",
-                f"{total_portfolio_value + self.balance:.2f}",
-                "",
-                ""
-            ])
-            
-            # Add export timestamp
-            rows.append([])  # Empty row for separation
-            rows.append([f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
-            
-            # Write to CSV file
-            with open(file_name, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerows(rows)
-                
-            # Show success message
-            from PySide6.QtWidgets import QMessageBox
-            QMessageBox.information(
-                self,
-                "Export Successful",
-                f"Portfolio data has been exported to:\n{file_name}"
-            )
-            
-        except Exception as e:
-            # Show error message
-            from PySide6.QtWidgets import QMessageBox
-            QMessageBox.critical(
-                self,
-                "Export Failed",
-                f"An error occurred while exporting the data:\n{str(e)}"
-            )
+
+        file_format, file_name = format_for_path(file_name, selected_filter)
+        job = portfolio_export_job(file_name, file_format, self.user_stocks,
+                                   self.stocks_the_user_has, self.balance, self.lots)
+
+        ExportProgressDialog(self.export_service, "Export Portfolio Data", self)
+        self.export_service.start(job)
 
     def _connect_button_actions(self):
         """Connect button actions in the portfolio page"""
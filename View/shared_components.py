@@ -211,4 +211,104 @@ class AvatarWidget(QLabel):
         painter.drawText(QRect(0, 0, size, size), Qt.AlignCenter, self.initials)
 
         painter.end()
-        self.setPixmap(pixmap)
\ No newline at end of file
+        self.setPixmap(pixmap)
+
+from PySide6.QtWidgets import QProgressDialog, QMessageBox
+
+
+class ExportProgressDialog(QProgressDialog):
+    """Progress dialog for an ExportService run - Cancel stops the worker and removes the partial file"""
+    def __init__(self, service, title, parent=None):
+        super().__init__("Exporting...", "Cancel", 0, 0, parent)
+        self.service = service
+        self.setWindowTitle(title)
+        self.setMinimumDuration(300)  # Quick exports finish without flashing a dialog
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setStyleSheet(f"""
+            background-color: {ColorPalette.BG_CARD};
+            color: {ColorPalette.TEXT_PRIMARY};
+        """)
+
+        self.canceled.connect(self.service.cancel)
+        self.service.progress.connect(self._on_progress)
+        self.service.finished.connect(self._on_finished)
+        self.service.failed.connect(self._on_failed)
+        self.service.cancelled.connect(self._on_cancelled)
+
+    def _on_progress(self, written, total):
+        if total:
+            self.setMaximum(total)
+            self.setValue(min(written, total))
+        self.setLabelText(f"Exported {written:,} rows...")
+
+    def _disconnect_service(self):
+        for signal, slot in ((self.service.progress, self._on_progress),
+                             (self.service.finished, self._on_finished),
+                             (self.service.failed, self._on_failed),
+                             (self.service.cancelled, self._on_cancelled)):
+            signal.disconnect(slot)
+        self.close()
+        self.deleteLater()
+
+    def _on_finished(self, file_path):
+        parent = self.parentWidget()
+        self._disconnect_service()
+        QMessageBox.information(parent, "Export Successful", f"Data has been exported to:\n{file_path}")
+
+    def _on_failed(self, message):
+        parent = self.parentWidget()
+        self._disconnect_service()
+        QMessageBox.critical(parent, "Export Failed", f"An error occurred while exporting the data:\n{message}")
+
+    def _on_cancelled(self):
+        self._disconnect_service()
+
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QVariantAnimation
+
+
+class SkeletonBlock(QWidget):
+    """Pulsing placeholder bar shown where a value goes until its data has loaded"""
+    def __init__(self, width=None, height=14, color=ColorPalette.BORDER_LIGHT, radius=6, parent=None):
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.radius = radius
+        self.level = 0.0
+        self.setFixedHeight(height)
+        if width:
+            self.setFixedWidth(width)
+        else:
+            self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+        # Fades in and out while visible, stops once hidden so idle skeletons cost nothing
+        self.animation = QVariantAnimation(self)
+        self.animation.setStartValue(0.0)
+        self.animation.setKeyValueAt(0.5, 1.0)
+        self.animation.setEndValue(0.0)
+        self.animation.setDuration(1400)
+        self.animation.setLoopCount(-1)
+        self.animation.valueChanged.connect(self._set_level)
+
+    def _set_level(self, level):
+        self.level = level
+        self.update()
+
+    def showEvent(self, event):
+        self.animation.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.animation.stop()
+        super().hideEvent(event)
+
+    def paintEvent(self, event):
+        color = QColor(self.color)
+        color.setAlphaF(color.alphaF() * (0.45 + 0.35 * self.level))
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(self.rect(), self.radius, self.radius)
+        painter.end()
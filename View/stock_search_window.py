@@ -14,14 +14,12 @@ from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequ
 
 # Import shared components - adjust these imports based on your project structure
 from View.shared_components import ColorPalette, GlobalStyle, AvatarWidget
+from View.time_series_chart import TimeSeriesChart
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QPushButton, QFrame, QSpinBox, QDoubleSpinBox, 
                              QFormLayout, QDialogButtonBox, QMessageBox)
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QColor
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 
 class PurchaseDialog(QDialog):
@@ -362,14 +360,9 @@ class StockChartWidget(QWidget):
         """)
         self.layout.addWidget(self.chart_title)
         
-        # Create matplotlib figure
-        self.figure = Figure(figsize=(5, 3), dpi=100)
-        self.figure.patch.set_facecolor('none')  # Transparent background
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setStyleSheet("background-color: transparent;")
-        
-        # Add to layout
-        self.layout.addWidget(self.canvas)
+        # QPainter chart - paths are cached, so repaints don't rebuild anything
+        self.chart = TimeSeriesChart()
+        self.layout.addWidget(self.chart)
         
         # Empty message when no data available
         self.no_data_label = QLabel("No historical data available")
@@ -381,97 +374,29 @@ class StockChartWidget(QWidget):
         """)
         self.no_data_label.setVisible(False)
         self.layout.addWidget(self.no_data_label)
-        
-        # Initialize empty plot
-        self.ax = self.figure.add_subplot(111)
-        self.ax.set_facecolor('none')  # Transparent plot background
-        
-        # Set grid and tick colors for dark theme
-        self.ax.grid(True, color=ColorPalette.BORDER_DARK, linestyle='-', linewidth=0.5, alpha=0.5)
-        self.ax.tick_params(colors=ColorPalette.TEXT_SECONDARY, which='both')
-        for spine in self.ax.spines.values():
-            spine.set_color(ColorPalette.BORDER_DARK)
             
         # Empty initial state
         self.reset_chart()
     
     def reset_chart(self):
         """Reset the chart to empty state"""
-        self.ax.clear()
-        self.ax.set_facecolor('none')
-        self.ax.grid(True, color=ColorPalette.BORDER_DARK, linestyle='-', linewidth=0.5, alpha=0.5)
-        self.ax.tick_params(colors=ColorPalette.TEXT_SECONDARY, which='both')
-        for spine in self.ax.spines.values():
-            spine.set_color(ColorPalette.BORDER_DARK)
-        self.canvas.draw()
+        self.chart.clear()
         
     def update_chart(self, history_data):
         """Update the chart with new stock history data"""
         if not history_data or len(history_data) == 0:
             self.no_data_label.setVisible(True)
-            self.canvas.setVisible(False)
+            self.chart.setVisible(False)
             return
         
         self.no_data_label.setVisible(False)
-        self.canvas.setVisible(True)
-        
-        # Reset chart
-        self.ax.clear()
+        self.chart.setVisible(True)
         
         # Extract dates and closing prices
-        dates = [item['date'] for item in history_data]
+        dates = [str(item.get('date', ''))[:10] for item in history_data]  # Just the yyyy-mm-dd part
         close_prices = [item['close'] for item in history_data]
         
-        # Determine line color based on price trend
-        line_color = ColorPalette.ACCENT_SUCCESS if close_prices[-1] >= close_prices[0] else ColorPalette.ACCENT_DANGER
-        
-        # Plot the data
-        self.ax.plot(dates, close_prices, marker='o', linestyle='-', color=line_color, linewidth=2, markersize=4)
-        
-        # Fill the area under the plot with a transparent color
-        self.ax.fill_between(dates, close_prices, color=line_color, alpha=0.1)
-        
-        # Customize the chart
-        self.ax.set_facecolor('none')
-        self.ax.grid(True, color=ColorPalette.BORDER_DARK, linestyle='-', linewidth=0.5, alpha=0.5)
-        self.ax.tick_params(colors=ColorPalette.TEXT_SECONDARY, which='both')
-        
-        # Customize spines
-        for spine in self.ax.spines.values():
-            spine.set_color(ColorPalette.BORDER_DARK)
-        
-        # Format the X-axis for dates
-        if len(dates) > 10:
-            # If many dates, show fewer labels to avoid clutter
-            self.ax.set_xticks(self.ax.get_xticks()[::max(1, len(dates)//5)])
-        
-        # Add labels for min and max prices
-        min_price = min(close_prices)
-        max_price = max(close_prices)
-        min_index = close_prices.index(min_price)
-        max_index = close_prices.index(max_price)
-        
-        self.ax.annotate(f"${min_price:.2f}", 
-                        xy=(dates[min_index], min_price),
-                        xytext=(0, -15),
-                        textcoords="offset points",
-                        ha='center',
-                        color=ColorPalette.ACCENT_DANGER,
-                        fontsize=8)
-                        
-        self.ax.annotate(f"${max_price:.2f}", 
-                        xy=(dates[max_index], max_price),
-                        xytext=(0, 10),
-                        textcoords="offset points",
-                        ha='center',
-                        color=ColorPalette.ACCENT_SUCCESS,
-                        fontsize=8)
-                        
-        # Auto adjust plot to fit data
-        self.figure.tight_layout()
-        
-        # Redraw the canvas
-        self.canvas.draw()
+        self.chart.set_series(close_prices, dates)
 
 class Card(QFrame):
     def __init__(self, title="", content="", parent=None, min_height=150):
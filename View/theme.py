@@ -0,0 +1,241 @@
+"""
+theme.py - One application stylesheet compiled from ColorPalette/GlobalStyle
+
+Widgets don't format their own stylesheet: they get a `role` property
+(set_role) that the compiled stylesheet selects on, and switch state (active
+button, last row, up/down change...) by flipping another property with
+set_state. Qt then only re-polishes that widget instead of parsing a new
+stylesheet for it, which keeps long lists cheap to build and to update.
+"""
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QApplication
+
+from View.shared_components import ColorPalette, GlobalStyle
+
+_stylesheet = None
+
+
+def _rgba(hex_color, alpha):
+    """rgba() of a palette color - Qt reads 8 digit hex as #AARRGGBB, not #RRGGBBAA"""
+    color = QColor(hex_color)
+    return f"rgba({color.red()}, {color.green()}, {color.blue()}, {alpha})"
+
+
+def _scoped(style, widget_class, selector):
+    """A GlobalStyle stylesheet with its `widget_class` rules narrowed to `selector`"""
+    return style.replace(widget_class, selector)
+
+
+def compile_stylesheet():
+    """The application stylesheet, built once"""
+    global _stylesheet
+    if _stylesheet is not None:
+        return _stylesheet
+
+    p = ColorPalette
+    rules = [
+        # Base of the main window (used to be its own stylesheet, which outranked every role below)
+        f"""
+        MainWindow {{
+            background-color: {p.BG_DARK};
+        }}
+        MainWindow, MainWindow QWidget {{
+            color: {p.TEXT_PRIMARY};
+            font-family: 'Segoe UI', Arial, sans-serif;
+        }}
+        MainWindow QDialog {{
+            background-color: {p.BG_DARK};
+        }}
+        MainWindow QScrollBar:vertical {{
+            background: {p.BG_DARK};
+            width: 8px;  /* Thinner scrollbar */
+            margin: 0px;
+            border-radius: 4px;
+        }}
+        MainWindow QScrollBar::handle:vertical {{
+            background: {p.BORDER_LIGHT};
+            min-height: 30px;
+            border-radius: 4px;
+        }}
+        MainWindow QScrollBar::add-line:vertical, MainWindow QScrollBar::sub-line:vertical {{
+            height: 0px;
+        }}
+        MainWindow QScrollBar:horizontal {{
+            background: {p.BG_DARK};
+            height: 8px;  /* Thinner scrollbar */
+            margin: 0px;
+            border-radius: 4px;
+        }}
+        MainWindow QScrollBar::handle:horizontal {{
+            background: {p.BORDER_LIGHT};
+            min-width: 30px;
+            border-radius: 4px;
+        }}
+        MainWindow QScrollBar::add-line:horizontal, MainWindow QScrollBar::sub-line:horizontal {{
+            width: 0px;
+        }}
+        /* Tooltip styling */
+        QToolTip {{
+            background-color: {p.BG_CARD};
+            color: {p.TEXT_PRIMARY};
+            border: none;
+            border-radius: 4px;
+            padding: 6px;
+            font-size: 12px;
+        }}
+        """,
+
+        # Areas of the main window
+        f"""
+        QFrame[role="sidebar"] {{
+            background-color: {p.BG_SIDEBAR};
+            border-right: 1px solid {p.BORDER_DARK};
+        }}
+        QFrame[role="content"] {{
+            background-color: {p.BG_DARK};
+            border: none;
+        }}
+        """,
+
+        # Cards and their text
+        f'QFrame[role="card"] {{{GlobalStyle.CARD_STYLE}}}',
+        f'QLabel[role="header"] {{{GlobalStyle.HEADER_STYLE}}}',
+        f'QLabel[role="subheader"] {{{GlobalStyle.SUBHEADER_STYLE}}}',
+        f'QLabel[role="body"] {{{GlobalStyle.BODY_STYLE}}}',
+        f"""
+        QLabel[role="empty"] {{
+            color: {p.TEXT_SECONDARY};
+            font-size: 14px;
+            padding: 30px;
+        }}
+        """,
+
+        # Buttons
+        _scoped(GlobalStyle.PRIMARY_BUTTON, "QPushButton", 'QPushButton[role="primary"]'),
+        _scoped(GlobalStyle.SECONDARY_BUTTON, "QPushButton", 'QPushButton[role="secondary"]'),
+        f"""
+        QPushButton[role="nav"] {{
+            background-color: transparent;
+            color: {p.TEXT_SECONDARY};
+            border: none;
+            border-radius: 8px;
+            text-align: left;
+            padding: 10px 15px;
+        }}
+        QPushButton[role="nav"]:hover {{
+            background-color: rgba(255, 255, 255, 0.1);
+            color: {p.TEXT_PRIMARY};
+        }}
+        QPushButton[role="nav"][active="true"], QPushButton[role="nav"][active="true"]:hover {{
+            background-color: {p.ACCENT_PRIMARY};
+            color: {p.TEXT_PRIMARY};
+        }}
+        """,
+
+        # Lists of rows (holdings, transactions)
+        f"""
+        QWidget[role="list"] {{
+            background-color: {p.CARD_BG_DARKER};
+            border-radius: 8px;
+        }}
+        QFrame[role="row"] {{
+            background-color: transparent;
+            border: none;
+            border-bottom: 1px solid {p.BORDER_DARK};
+        }}
+        QFrame[role="row"][last="true"] {{
+            border-bottom: none;
+        }}
+        QLabel[role="row-title"] {{
+            color: {p.TEXT_PRIMARY};
+            font-weight: bold;
+            font-size: 14px;
+        }}
+        QLabel[role="row-subtitle"] {{
+            color: {p.TEXT_SECONDARY};
+            font-size: 12px;
+        }}
+        QLabel[role="row-value"] {{
+            color: {p.TEXT_PRIMARY};
+            font-weight: bold;
+            font-size: 15px;
+        }}
+        """,
+
+        # Gains and losses
+        f"""
+        QLabel[role="change"] {{
+            font-weight: bold;
+            font-size: 13px;
+            padding: 2px 6px;
+            border-radius: 4px;
+        }}
+        QLabel[role="change"][trend="up"] {{
+            color: {p.ACCENT_SUCCESS};
+            background-color: {_rgba(p.ACCENT_SUCCESS, 0.06)};
+        }}
+        QLabel[role="change"][trend="down"] {{
+            color: {p.ACCENT_DANGER};
+            background-color: {_rgba(p.ACCENT_DANGER, 0.06)};
+        }}
+        QLabel[role="trade"] {{
+            font-size: 14px;
+            padding: 2px 6px;
+        }}
+        QLabel[role="trade"][side="buy"] {{
+            color: {p.ACCENT_SUCCESS};
+        }}
+        QLabel[role="trade"][side="sell"] {{
+            color: {p.ACCENT_DANGER};
+        }}
+        QLabel[role="summary-change"] {{
+            color: white;
+            font-size: 16px;
+            font-weight: bold;
+            border-radius: 4px;
+            padding: 4px 10px;
+            background: rgba(255, 255, 255, 0.2);
+        }}
+        QLabel[role="summary-change"][trend="down"] {{
+            background: rgba(255, 255, 255, 0.15);
+        }}
+        """,
+    ]
+    _stylesheet = "\n".join(rules)
+    return _stylesheet
+
+
+def apply_theme(app=None):
+    """Install the compiled stylesheet (and a matching palette) on the application, once"""
+    app = app or QApplication.instance()
+    if app is None or app.property("themeApplied"):
+        return
+    palette = app.palette()
+    palette.setColor(QPalette.Window, QColor(ColorPalette.BG_DARK))
+    palette.setColor(QPalette.Base, QColor(ColorPalette.BG_DARK))
+    palette.setColor(QPalette.AlternateBase, QColor(ColorPalette.CARD_BG_DARKER))
+    palette.setColor(QPalette.WindowText, QColor(ColorPalette.TEXT_PRIMARY))
+    palette.setColor(QPalette.Text, QColor(ColorPalette.TEXT_PRIMARY))
+    palette.setColor(QPalette.ButtonText, QColor(ColorPalette.TEXT_PRIMARY))
+    app.setPalette(palette)
+    app.setStyleSheet(app.styleSheet() + compile_stylesheet())
+    app.setProperty("themeApplied", True)
+
+
+def set_role(widget, role, **states):
+    """Style a new widget through the theme, with optional initial states (e.g. last=True)"""
+    apply_theme()
+    widget.setProperty("role", role)
+    for name, value in states.items():
+        widget.setProperty(name, value)
+    return widget
+
+
+def set_state(widget, name, value):
+    """Flip a state property the theme selects on, re-polishing only this widget"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
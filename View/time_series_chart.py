@@ -0,0 +1,183 @@
+"""
+time_series_chart.py - QPainter line chart used for price history
+"""
+import numpy as np
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen, QBrush, QFont, QLinearGradient, QFontMetrics
+from PySide6.QtCore import Qt, QPointF, QRectF
+
+from View.shared_components import ColorPalette
+from View.chart_utils import DownsampleCache
+
+
+class TimeSeriesChart(QWidget):
+    """Lightweight line chart painted with QPainter.
+
+    The line, fill and marker paths are built once per (data, size) and reused by
+    every paintEvent, so repaints only stroke cached paths. Long series are
+    reduced with LTTB to what the width can show. Points are laid out by index,
+    the line takes the trend color (green up, red down) and the min/max closes
+    are labelled.
+    """
+    MARKER_LIMIT = 60  # Above this many points the markers would just be noise
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values = np.array([])
+        self.labels = []
+        self.version = 0
+        self.line_color = QColor(ColorPalette.ACCENT_SUCCESS)
+        self._downsample_cache = DownsampleCache()
+        self._paths = None
+        self._paths_size = None
+        self.setMinimumHeight(180)
+
+        self.label_font = QFont()
+        self.label_font.setPointSize(8)
+        self.label_metrics = QFontMetrics(self.label_font)
+
+    def set_series(self, values, labels=None):
+        """Replace the plotted values (and optional x-axis labels, one per value)"""
+        self.values = np.asarray(values, dtype=float)
+        self.labels = list(labels) if labels else []
+        if len(self.values):
+            trend_up = self.values[-1] >= self.values[0]
+            self.line_color = QColor(ColorPalette.ACCENT_SUCCESS if trend_up else ColorPalette.ACCENT_DANGER)
+        self.version += 1
+        self._paths = None
+        self.update()
+
+    def clear(self):
+        self.set_series([])
+
+    def _plot_rect(self):
+        # Room for the min/max labels above/below and the date labels at the bottom
+        label_height = self.label_metrics.height()
+        return QRectF(8, label_height + 6, max(1, self.width() - 16),
+                      max(1, self.height() - 3 * label_height - 16))
+
+    def _build_paths(self):
+        """Lay out the points and build every path for the current size"""
+        rect = self._plot_rect()
+        count = len(self.values)
+        min_index = int(np.argmin(self.values))
+        max_index = int(np.argmax(self.values))
+        min_val = self.values[min_index]
+        max_val = self.values[max_index]
+        value_range = (max_val - min_val) or 1.0
+
+        def to_x(index):
+            return rect.left() + (index * rect.width() / (count - 1) if count > 1 else rect.width() / 2)
+
+        def to_y(value):
+            return rect.bottom() - (value - min_val) / value_range * rect.height()
+
+        indices = self._downsample_cache.indices(self.version, rect.width(), self.values)
+        xs = to_x(indices.astype(float)) if count > 1 else np.full(len(indices), to_x(0))
+        ys = to_y(self.values[indices])
+        points = [QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+        line_path = QPainterPath(points[0])
+        for point in points[1:]:
+            line_path.lineTo(point)
+
+        fill_path = QPainterPath(line_path)
+        fill_path.lineTo(points[-1].x(), rect.bottom())
+        fill_path.lineTo(points[0].x(), rect.bottom())
+        fill_path.closeSubpath()
+
+        marker_path = QPainterPath()
+        if len(points) <= self.MARKER_LIMIT:
+            for point in points:
+                marker_path.addEllipse(point, 2.5, 2.5)
+
+        grid_path = QPainterPath()
+        for i in range(5):
+            y = rect.top() + rect.height() * i / 4
+            grid_path.moveTo(rect.left(), y)
+            grid_path.lineTo(rect.right(), y)
+
+        gradient = QLinearGradient(0, rect.top(), 0, rect.bottom())
+        fill_color = QColor(self.line_color)
+        fill_color.setAlpha(60)
+        gradient.setColorAt(0, fill_color)
+        fill_color.setAlpha(5)
+        gradient.setColorAt(1, fill_color)
+
+        self._paths = {
+            'rect': rect,
+            'line': line_path,
+            'fill': fill_path,
+            'markers': marker_path,
+            'grid': grid_path,
+            'gradient': gradient,
+            'min': (QPointF(to_x(min_index), to_y(min_val)), f"${min_val:.2f}"),
+            'max': (QPointF(to_x(max_index), to_y(max_val)), f"${max_val:.2f}"),
+            'x_labels': self._x_label_positions(indices, points),
+        }
+        self._paths_size = self.size()
+
+    def _x_label_positions(self, indices, points):
+        """Pick the x-axis labels (of the plotted points) that fit left to right without overlapping"""
+        if len(self.labels) != len(self.values):
+            return []
+        positions = []
+        next_free_x = float("-inf")
+        for index, point in zip(indices.tolist(), points):
+            text = str(self.labels[index])
+            half_width = self.label_metrics.horizontalAdvance(text) / 2
+            # Clamp to the widget like paintEvent does, then check against the last label
+            x = min(max(half_width, point.x()), self.width() - half_width)
+            if x - half_width >= next_free_x:
+                positions.append((x, text))
+                next_free_x = x + half_width + 12
+        return positions
+
+    def resizeEvent(self, event):
+        self._paths = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if not len(self.values):
+            return
+        if self._paths is None or self._paths_size != self.size():
+            self._build_paths()
+        paths = self._paths
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        grid_color = QColor(ColorPalette.BORDER_LIGHT)
+        grid_color.setAlpha(90)
+        painter.setPen(QPen(grid_color, 0.5))
+        painter.drawPath(paths['grid'])
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(paths['gradient']))
+        painter.drawPath(paths['fill'])
+
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(self.line_color, 2))
+        painter.drawPath(paths['line'])
+
+        if not paths['markers'].isEmpty():
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.line_color)
+            painter.drawPath(paths['markers'])
+
+        painter.setFont(self.label_font)
+        metrics = self.label_metrics
+        for key, color, offset in (('min', ColorPalette.ACCENT_DANGER, metrics.height() + 4),
+                                   ('max', ColorPalette.ACCENT_SUCCESS, -6)):
+            point, text = paths[key]
+            text_width = metrics.horizontalAdvance(text)
+            x = min(max(0, point.x() - text_width / 2), self.width() - text_width)
+            painter.setPen(QColor(color))
+            painter.drawText(QPointF(x, point.y() + offset), text)
+
+        painter.setPen(QColor(ColorPalette.TEXT_SECONDARY))
+        baseline = self.height() - 4
+        for x, text in paths['x_labels']:
+            painter.drawText(QPointF(x - metrics.horizontalAdvance(text) / 2, baseline), text)
+
+        painter.end()
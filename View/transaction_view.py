@@ -5,15 +5,141 @@ import random
 
 from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton, QFrame, QHBoxLayout,
                                QLabel, QGridLayout, QScrollArea, QSizePolicy, QGraphicsDropShadowEffect,
-                               QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit, QComboBox, 
-                               QTabWidget, QStackedWidget, QBoxLayout, QToolButton, QMenu)
-from PySide6.QtGui import (QColor, QAction, QFont, QPainter, QLinearGradient, QBrush, QPen,
+                               QHeaderView, QLineEdit, QComboBox, 
+                               QTabWidget, QStackedWidget, QBoxLayout, QTableView)
+from PySide6.QtGui import (QColor, QFont, QPainter, QLinearGradient, QBrush, QPen,
                            QFontMetrics, QIcon, QPixmap, QCursor, QPainterPath, QRadialGradient)
 from PySide6.QtCore import (Qt, QSize, QRect, QTimer, QEvent, QPoint, QPointF, 
-                            QPropertyAnimation, Signal)
+                            QPropertyAnimation, Signal, QAbstractTableModel, QModelIndex)
 
 # Import shared components from previous files
-from View.shared_components import ColorPalette, GlobalStyle, AvatarWidget
+from View.shared_components import ColorPalette, GlobalStyle, AvatarWidget, ExportProgressDialog
+from Model.Transactions.transaction_store import TransactionStore
+from Model.Protofilio.lots_engine import LotsEngine
+from Model.Stocks.symbol_metadata import symbol_metadata
+from Export.export_service import ExportService, file_dialog_filter, format_for_path, transaction_export_job
+
+
+class TransactionTableModel(QAbstractTableModel):
+    """Table model over a TransactionStore - cells are formatted only when the view asks for them.
+
+    The model shows the store through a row map (view row -> store row) that comes
+    from the store's precomputed sort orders and type/symbol indexes, so sorting
+    and filtering only swap that array.
+    """
+    COLUMNS = ["Date", "Type", "Stock", "Shares/Price", "Total", "Status"]
+    # Store sort key used by each column (None = keep the API order)
+    SORT_KEYS = ["date", "type", "symbol", "shares", "amount", None]
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else TransactionStore()
+        self.sort_key = None
+        self.descending = False
+        self.symbol_filter = None
+        self.type_filter = None
+        self.rows = self.store.query()
+
+        # Colors are created once and shared by every cell
+        self.type_colors = {
+            "buy": QColor(ColorPalette.ACCENT_SUCCESS),
+            "sell": QColor(ColorPalette.ACCENT_DANGER),
+            "dividend": QColor(ColorPalette.ACCENT_INFO),
+            "deposit": QColor(ColorPalette.ACCENT_PRIMARY),
+        }
+        self.status_color = QColor(ColorPalette.ACCENT_SUCCESS)
+
+    def refresh(self):
+        """Tell the view the underlying store was rebuilt"""
+        self.beginResetModel()
+        self.rows = self._query()
+        self.endResetModel()
+
+    def _query(self):
+        return self.store.query(sort_key=self.sort_key, descending=self.descending,
+                                symbol=self.symbol_filter, tx_type=self.type_filter)
+
+    def is_sortable(self, column):
+        return 0 <= column < len(self.SORT_KEYS) and self.SORT_KEYS[column] is not None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Reorder the rows using the store's cached sort permutation for the column"""
+        if not self.is_sortable(column):
+            return  # Keep the current order, the header puts its indicator back
+        self.layoutAboutToBeChanged.emit()
+        self.sort_key = self.SORT_KEYS[column]
+        self.descending = order == Qt.DescendingOrder
+        self.rows = self._query()
+        self.layoutChanged.emit()
+
+    def set_filters(self, symbol=None, tx_type=None):
+        """Show only rows matching the symbol/type (None or "" = no filter)"""
+        self.beginResetModel()
+        self.symbol_filter = symbol or None
+        self.type_filter = tx_type or None
+        self.rows = self._query()
+        self.endResetModel()
+
+    def store_row(self, row):
+        """Store row shown at a view row"""
+        return int(self.rows[row])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return self.COLUMNS[section]
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignLeft | Qt.AlignVCenter
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self.store_row(index.row())
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            return self._display_text(row, column)
+        if role == Qt.ForegroundRole:
+            if column == 1:
+                return self.type_colors.get(self.store.types[row])
+            if column == 5:
+                return self.status_color  # All transactions are completed
+            return None
+        if role == Qt.TextAlignmentRole:
+            if column in (3, 4):
+                return Qt.AlignRight | Qt.AlignVCenter
+            return Qt.AlignLeft | Qt.AlignVCenter
+        return None
+
+    def _display_text(self, row, column):
+        """Format a single cell from the store columns"""
+        store = self.store
+        if column == 0:
+            return store.formatted_date(row)
+        if column == 1:
+            return store.types[row].capitalize()
+        if column == 2:
+            return store.symbols[row]
+        if column == 3:
+            if store.has_shares(row):
+                return f"{store.quantity(row)} shares @ ${store.prices[row]:.2f}"
+            return ""
+        if column == 4:
+            total_text = f"${store.totals[row]:.2f}"
+            if store.types[row] == "withdrawal":
+                total_text = f"-{total_text}"  # Add negative sign for withdrawals
+            return total_text
+        if column == 5:
+            return "Completed"
+        return None
 
 
 class TransactionsPage(QWidget):
@@ -27,6 +153,9 @@ class TransactionsPage(QWidget):
         self.stocks_the_user_has = stocks_the_user_has or {}
         self.balance = balance
         
+        # Exports are written by a background worker
+        self.export_service = ExportService(self)
+        
         # Set the same background color as main window
         self.setStyleSheet(f"background-color: {ColorPalette.BG_DARK};")
         
@@ -36,8 +165,8 @@ class TransactionsPage(QWidget):
         layout.setSpacing(20)
         
         # Header with transaction overview
-        header = self._create_header()
-        layout.addWidget(header)
+        self.header = self._create_header()
+        layout.addWidget(self.header)
         
         # Scrollable content area
         self.scroll_area = QScrollArea()
@@ -266,239 +395,111 @@ class TransactionsPage(QWidget):
         
         return header
 
-    def convert_transaction_data(self):
-        """Convert raw transaction data to UI format"""
-        ui_transactions = []
-        
-        try:
-            for tx in self.user_transactions:
-                # Parse date - Fix for handling the specific format
-                try:
-                    date_str = tx['date']
-                    
-                    # Handle microseconds properly by making sure it has exactly 6 digits
-                    if '.' in date_str:
-                        base, ms_part = date_str.split('.')
-                        # Remove any trailing 'Z' or timezone info first
-                        ms_part = ms_part.rstrip('Z').split('+')[0].split('-')[0]
-                        # Pad or truncate microseconds to exactly 6 digits
-                        ms_part = ms_part.ljust(6, '0')[:6]
-                        date_str = f"{base}.{ms_part}"
-                    
-                    # Use strptime instead of fromisoformat for more flexible parsing
-                    tx_date = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S.%f")
-                    formatted_date = tx_date.strftime("%b %d, %Y")
-                except Exception as date_err:
-                    print(f"Error parsing date: {date_err}")
-                    formatted_date = tx['date']
-                
-                # Get full stock name if available
-                symbol = tx.get('stockSymbol', '')
-                name = symbol
-                if symbol and self.stocks_the_user_has and symbol in self.stocks_the_user_has:
-                    name = self.stocks_the_user_has[symbol].get('name', symbol)
-                
-                ui_transactions.append({
-                    "date": formatted_date,
-                    "type": tx['transactionType'].lower(),
-                    "stock": symbol,
-                    "shares": tx.get('quantity'),
-                    "price": tx.get('price'),
-                    "total": tx.get('price', 0) * tx.get('quantity', 1) if tx.get('quantity') and tx.get('price') else tx.get('amount', 0),
-                    "status": "Completed"  # Assuming all transactions are completed
-                })
-        except Exception as e:
-            print(f"Error converting transaction data: {e}")
-        
-        return ui_transactions
+    def update_data(self, user_transactions=None, stocks_the_user_has=None, balance=None):
+        """Bring a cached page up to date; the table and the summaries are only rebuilt for new transactions"""
+        if stocks_the_user_has is not None:
+            self.stocks_the_user_has = stocks_the_user_has
+        balance_changed = balance is not None and balance != self.balance
+        if balance_changed:
+            self.balance = balance
+        if user_transactions is None or user_transactions is self.user_transactions:
+            if balance_changed:
+                self._rebuild_header()  # The buying power card shows the balance
+            return
+
+        self.user_transactions = user_transactions
+        self._generate_transactions()
+
+        # The header and analysis cards are snapshots of the transactions, swap in new ones
+        self._rebuild_header()
+
+        self.content_layout.removeWidget(self.analysis_section)
+        self.analysis_section.deleteLater()
+        self._setup_transaction_analysis_section()
+        self._adjust_responsive_layout()
+
+    def _rebuild_header(self):
+        header = self._create_header()
+        self.layout().replaceWidget(self.header, header)
+        self.header.deleteLater()
+        self.header = header
+
     def _generate_transactions(self):
-        """Generate transaction table using converted transaction data"""
-        # Convert raw transaction data to UI format
-        transactions = self.convert_transaction_data()
-        
-        # Update table with converted transactions
-        self.transaction_table.setRowCount(len(transactions))
-        
-        for row, transaction in enumerate(transactions):
-            # Date
-            date_item = QTableWidgetItem(transaction["date"])
-            date_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            
-            # Type with colored styling
-            type_item = QTableWidgetItem()
-            type_item.setText(transaction["type"].capitalize())
-            type_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            
-            # Set color based on transaction type
-            if transaction["type"] == "buy":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_SUCCESS))
-            elif transaction["type"] == "sell":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_DANGER))
-            elif transaction["type"] == "dividend":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_INFO))
-            elif transaction["type"] == "deposit":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_PRIMARY))
-            
-            # Stock
-            stock_item = QTableWidgetItem(transaction["stock"])
-            stock_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            
-            # Shares/Price - combined column
-            shares_price_text = ""
-            if transaction["shares"] is not None and transaction["price"] is not None:
-                shares_price_text = f"{transaction['shares']} shares @ ${transaction['price']:.2f}"
-            shares_price_item = QTableWidgetItem(shares_price_text)
-            shares_price_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Total with dollar sign
-            total_text = f"${transaction['total']:.2f}"
-            if transaction["type"] == "withdrawal":
-                total_text = f"-{total_text}"  # Add negative sign for withdrawals
-                
-            total_item = QTableWidgetItem(total_text)
-            total_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Status
-            status_item = QTableWidgetItem(transaction["status"])
-            status_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            
-            # Style status based on value
-            if transaction["status"] == "Completed":
-                status_item.setForeground(QColor(ColorPalette.ACCENT_SUCCESS))
-            
-            # Set items in the table
-            self.transaction_table.setItem(row, 0, date_item)
-            self.transaction_table.setItem(row, 1, type_item)
-            self.transaction_table.setItem(row, 2, stock_item)
-            self.transaction_table.setItem(row, 3, shares_price_item)
-            self.transaction_table.setItem(row, 4, total_item)
-            self.transaction_table.setItem(row, 5, status_item)
-            
-            # Set row height
-            self.transaction_table.setRowHeight(row, 50)
+        """Load the transaction history into the table model"""
+        # Only the columns are rebuilt here, the view formats the visible rows on demand
+        self.transaction_store.set_transactions(self.user_transactions)
+        self.lots.sync_ledger(self.user_transactions)
+        self.transaction_model.refresh()
+        self._populate_filter_options()
 
-    def _export_transactions_to_csv(self):
-        """Export transaction data to a CSV file"""
-        try:
-            # Skip if no transactions
-            if not self.user_transactions:
-                # Show a message dialog
-                from PySide6.QtWidgets import QMessageBox
-                QMessageBox.information(self, "Export Transactions", 
-                                    "No transactions available to export.",
-                                    QMessageBox.Ok)
-                return
+    def _populate_filter_options(self):
+        """Fill the type/stock filter boxes from the store indexes"""
+        for selector, key, all_label in ((self.type_filter_selector, "type", "All Types"),
+                                         (self.symbol_filter_selector, "symbol", "All Stocks")):
+            current = selector.currentData()
+            selector.blockSignals(True)
+            selector.clear()
+            selector.addItem(all_label, None)
+            for value in self.transaction_store.distinct(key):
+                selector.addItem(value.capitalize() if key == "type" else value, value)
+            # Keep the previous choice if it still exists
+            selector.setCurrentIndex(max(0, selector.findData(current)))
+            selector.blockSignals(False)
+        self._apply_transaction_filters()
 
-            # Get file path from save dialog
-            from PySide6.QtWidgets import QFileDialog
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Export Transactions",
-                "transaction_history.csv",
-                "CSV Files (*.csv)"
-            )
-            
-            # Return if user cancels the dialog
-            if not file_path:
-                return
-                
-            # Add .csv extension if not provided
-            if not file_path.endswith('.csv'):
-                file_path += '.csv'
-                
-            # Convert transaction data to a consistent format for CSV export
-            export_data = []
-            
-            for tx in self.user_transactions:
-                # Process the date to a consistent format
-                try:
-                    date_str = tx['date']
-                    
-                    # Handle multiple date formats
-                    if 'T' in date_str:
-                        # ISO format
-                        if '.' in date_str:  # Has microseconds
-                            base, ms_part = date_str.split('.')
-                            # Remove timezone info and Z if present
-                            ms_part = ms_part.rstrip('Z').split('+')[0].split('-')[0]
-                            date_str = f"{base}.{ms_part}"
-                            
-                        try:
-                            tx_date = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S.%f")
-                        except ValueError:
-                            try:
-                                tx_date = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S")
-                            except ValueError:
-                                tx_date = datetime.now()  # Fallback
-                    else:
-                        # Other formats
-                        for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%b %d, %Y"]:
-                            try:
-                                tx_date = datetime.strptime(date_str, fmt)
-                                break
-                            except ValueError:
-                                continue
-                        else:
-                            tx_date = datetime.now()  # Fallback
-                    
-                    formatted_date = tx_date.strftime("%Y-%m-%d %H:%M:%S")
-                except Exception as e:
-                    print(f"Error formatting date: {e}")
-                    formatted_date = tx.get('date', 'Unknown')
-                
-                # Calculate the total amount if price and quantity are available
-                total_amount = 0
-                if 'price' in tx and 'quantity' in tx and tx['price'] is not None and tx['quantity'] is not None:
-                    total_amount = tx['price'] * tx['quantity']
-                elif 'amount' in tx and tx['amount'] is not None:
-                    total_amount = tx['amount']
-                
-                # Get stock name if available
-                stock_symbol = tx.get('stockSymbol', '')
-                stock_name = stock_symbol
-                
-                if stock_symbol and self.stocks_the_user_has and stock_symbol in self.stocks_the_user_has:
-                    stock_name = self.stocks_the_user_has[stock_symbol].get('name', stock_symbol)
-                
-                # Create a row for the CSV
-                row = {
-                    'Date': formatted_date,
-                    'Type': tx.get('transactionType', 'Unknown'),
-                    'Symbol': stock_symbol,
-                    'Company': stock_name if stock_name != stock_symbol else '',
-                    'Quantity': tx.get('quantity', ''),
-                    'Price': f"${tx.get('price', 0):.2f}" if 'price' in tx and tx['price'] is not None else '',
-                    'Total': f"${total_amount:.2f}" if total_amount else '',
-                    'Status': 'Completed'  # Default status
-                }
-                
-                export_data.append(row)
-            
-            # Write to CSV file
-            import csv
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                # Define CSV columns
-                fieldnames = ['Date', 'Type', 'Symbol', 'Company', 'Quantity', 'Price', 'Total', 'Status']
-                
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for row in export_data:
-                    writer.writerow(row)
-            
-            # Show success message
-            from PySide6.QtWidgets import QMessageBox
-            QMessageBox.information(self, "Export Successful", 
-                                f"Transaction history exported to {file_path}",
-                                QMessageBox.Ok)
-                                
-        except Exception as e:
-            # Show error message
+    def _apply_transaction_filters(self):
+        """Filter the table locally - only the model's row map changes"""
+        self.transaction_model.set_filters(
+            symbol=self.symbol_filter_selector.currentData(),
+            tx_type=self.type_filter_selector.currentData()
+        )
+
+    def _on_sort_indicator_changed(self, column, order):
+        """Move the arrow back when a column that can't be sorted (Status) was clicked"""
+        if self.transaction_model.is_sortable(column):
+            self._sort_indicator = (column, order)
+        else:
+            self.transaction_table.horizontalHeader().setSortIndicator(*self._sort_indicator)
+
+    def _export_transactions_to_csv(self):
+        """Export transaction data (CSV, JSON Lines or Parquet) in a background worker"""
+        # Skip if no transactions
+        if not self.user_transactions:
+            # Show a message dialog
             from PySide6.QtWidgets import QMessageBox
-            QMessageBox.critical(self, "Export Error", 
-                                f"Failed to export transactions: {str(e)}",
+            QMessageBox.information(self, "Export Transactions", 
+                                "No transactions available to export.",
                                 QMessageBox.Ok)
-            print(f"Error exporting transactions: {e}")
+            return
+
+        if self.export_service.is_running():
+            return
+
+        # Get file path from save dialog
+        from PySide6.QtWidgets import QFileDialog
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Transactions",
+            "transaction_history.csv",
+            file_dialog_filter()
+        )
+        
+        # Return if user cancels the dialog
+        if not file_path:
+            return
+
+        file_format, file_path = format_for_path(file_path, selected_filter)
+
+        # Rows are generated from the store while the worker writes them
+        names = symbol_metadata.names(self.transaction_store.distinct("symbol"))
+        names.update({
+            symbol: details['name']
+            for symbol, details in (self.stocks_the_user_has or {}).items() if details.get('name')
+        })
+        job = transaction_export_job(file_path, file_format, self.transaction_store, names, self.lots)
+
+        ExportProgressDialog(self.export_service, "Export Transactions", self)
+        self.export_service.start(job)
 
     # Update the _setup_transaction_history_section to connect the export button
     def _setup_transaction_history_section(self):
@@ -528,10 +529,35 @@ class TransactionsPage(QWidget):
         
         
         
+        # Filters are applied in memory through the store indexes
+        filter_style = f"""
+            QComboBox {{
+                background-color: {ColorPalette.BG_DARK};
+                color: {ColorPalette.TEXT_PRIMARY};
+                border: 1px solid {ColorPalette.BORDER_DARK};
+                border-radius: 6px;
+                padding: 4px 8px;
+            }}
+            QComboBox::drop-down {{
+                border: none;
+                width: 20px;
+            }}
+        """
+        self.type_filter_selector = QComboBox()
+        self.type_filter_selector.setFixedWidth(120)
+        self.type_filter_selector.setStyleSheet(filter_style)
+        self.type_filter_selector.currentIndexChanged.connect(self._apply_transaction_filters)
+        
+        self.symbol_filter_selector = QComboBox()
+        self.symbol_filter_selector.setFixedWidth(120)
+        self.symbol_filter_selector.setStyleSheet(filter_style)
+        self.symbol_filter_selector.currentIndexChanged.connect(self._apply_transaction_filters)
+        
         header_layout.addWidget(title)
         header_layout.addStretch()
-
+        header_layout.addWidget(self.type_filter_selector)
         header_layout.addSpacing(10)
+        header_layout.addWidget(self.symbol_filter_selector)
 
         
         history_layout.addLayout(header_layout)
@@ -549,13 +575,17 @@ class TransactionsPage(QWidget):
         container_layout.setSpacing(0)  # No spacing for table items
         
         # Improved table to match the style of tables in your app
-        self.transaction_table = QTableWidget()
-        self.transaction_table.setColumnCount(6)
-        self.transaction_table.setHorizontalHeaderLabels(["Date", "Type", "Stock", "Shares/Price", "Total", "Status"])
+        # (model/view - only the rows on screen are ever formatted)
+        self.transaction_store = TransactionStore()
+        self.lots = LotsEngine()  # Realized P&L of the sells for the export
+        self.transaction_model = TransactionTableModel(self.transaction_store, self)
+        self.transaction_table = QTableView()
+        self.transaction_table.setModel(self.transaction_model)
         
         # Table styling to match other tables in the app but with modernized look
         self.transaction_table.setShowGrid(False)
         self.transaction_table.setAlternatingRowColors(True)  # Enable alternating row colors
+        self.transaction_table.setWordWrap(False)
         self.transaction_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.transaction_table.horizontalHeader().setStyleSheet(f"""
             QHeaderView::section {{
@@ -569,7 +599,7 @@ class TransactionsPage(QWidget):
             }}
         """)
         self.transaction_table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: transparent;
                 color: {ColorPalette.TEXT_PRIMARY};
                 border: none;
@@ -577,20 +607,28 @@ class TransactionsPage(QWidget):
                 selection-color: {ColorPalette.TEXT_PRIMARY};
                 alternate-background-color: {ColorPalette.BG_DARK}30;  /* Subtle alternating color */
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 border-bottom: 1px solid {ColorPalette.BORDER_DARK}40;  /* Lighter border */
                 padding: 12px;  /* Increased padding */
             }}
-            QTableWidget QTableCornerButton::section {{
+            QTableView QTableCornerButton::section {{
                 background-color: {ColorPalette.CARD_BG_DARKER};
                 border: none;
             }}
         """)
         self.transaction_table.verticalHeader().setVisible(False)
-        self.transaction_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.transaction_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Fixed row height for every row instead of setting it row by row
+        self.transaction_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.transaction_table.verticalHeader().setDefaultSectionSize(50)
+        self.transaction_table.setSelectionBehavior(QTableView.SelectRows)
+        self.transaction_table.setEditTriggers(QTableView.NoEditTriggers)
         self.transaction_table.setFocusPolicy(Qt.NoFocus)
         self.transaction_table.setMinimumHeight(400)
+        # Header clicks sort through the model (most recent first by default)
+        self.transaction_table.horizontalHeader().setSortIndicator(0, Qt.DescendingOrder)
+        self.transaction_table.setSortingEnabled(True)
+        self._sort_indicator = (0, Qt.DescendingOrder)
+        self.transaction_table.horizontalHeader().sortIndicatorChanged.connect(self._on_sort_indicator_changed)
         
         # Add table to container layout
         container_layout.addWidget(self.transaction_table)
@@ -604,7 +642,7 @@ class TransactionsPage(QWidget):
         view_all_btn.setCursor(Qt.PointingHandCursor)
         view_all_btn.setFixedHeight(36)
         
-        export_btn = QPushButton("Export CSV")  # Added file format for clarity
+        export_btn = QPushButton("Export")
         export_btn.setStyleSheet(GlobalStyle.SECONDARY_BUTTON)
         export_btn.setCursor(Qt.PointingHandCursor)
         export_btn.setFixedHeight(36)
@@ -1417,9 +1455,9 @@ class TransactionsPage(QWidget):
             
             if most_traded_stock:
                 # Get stock name if available
-                stock_name = most_traded_stock
+                stock_name = symbol_metadata.name(most_traded_stock)
                 if self.stocks_the_user_has and most_traded_stock in self.stocks_the_user_has:
-                    stock_name = self.stocks_the_user_has[most_traded_stock].get('name', most_traded_stock)
+                    stock_name = self.stocks_the_user_has[most_traded_stock].get('name', stock_name)
                 
                 metrics.append({
                     "label": "Most Traded Stock",
@@ -1464,155 +1502,6 @@ class TransactionsPage(QWidget):
         return metrics
 
 
-    def _generate_sample_transactions(self):
-        """Generate sample transaction data for the table that matches the style of other tables"""
-        # Sample data for transactions
-        transactions = [
-            {"date": "Mar 07, 2025", "type": "Buy", "stock": "AAPL", "shares": 10, "price": 173.45, "total": 1734.50, "status": "Completed"},
-            {"date": "Mar 05, 2025", "type": "Sell", "stock": "TSLA", "shares": 5, "price": 238.79, "total": 1193.95, "status": "Completed"},
-            {"date": "Mar 02, 2025", "type": "Buy", "stock": "MSFT", "shares": 8, "price": 324.62, "total": 2596.96, "status": "Completed"},
-            {"date": "Feb 28, 2025", "type": "Dividend", "stock": "JNJ", "shares": None, "price": None, "total": 134.50, "status": "Completed"},
-            {"date": "Feb 25, 2025", "type": "Buy", "stock": "GOOGL", "shares": 12, "price": 139.78, "total": 1677.36, "status": "Completed"},
-            {"date": "Feb 20, 2025", "type": "Sell", "stock": "AMZN", "shares": 4, "price": 128.91, "total": 515.64, "status": "Completed"},
-            {"date": "Feb 18, 2025", "type": "Buy", "stock": "META", "shares": 15, "price": 302.55, "total": 4538.25, "status": "Completed"},
-            {"date": "Feb 15, 2025", "type": "Deposit", "stock": None, "shares": None, "price": None, "total": 10000.00, "status": "Completed"},
-            {"date": "Feb 10, 2025", "type": "Buy", "stock": "NVDA", "shares": 5, "price": 437.26, "total": 2186.30, "status": "Completed"},
-            {"date": "Feb 05, 2025", "type": "Sell", "stock": "AAPL", "shares": 8, "price": 180.90, "total": 1447.20, "status": "Completed"}
-        ]
-        
-        # Set up table
-        self.transaction_table.setRowCount(len(transactions))
-        
-        # Create transaction items with styles that match your app's other tables
-        for row, transaction in enumerate(transactions):
-            # Date
-            date_item = QTableWidgetItem(transaction["date"])
-            date_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            
-            # Type with colored styling - same as in main window
-            type_item = QTableWidgetItem()
-            type_item.setText(transaction["type"])
-            type_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            
-            # Set color based on transaction type
-            if transaction["type"] == "Buy":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_SUCCESS))
-            elif transaction["type"] == "Sell":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_DANGER))
-            elif transaction["type"] == "Dividend":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_INFO))
-            elif transaction["type"] == "Deposit":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_PRIMARY))
-            elif transaction["type"] == "Withdrawal":
-                type_item.setForeground(QColor(ColorPalette.ACCENT_WARNING))
-            
-            # Stock
-            stock_item = QTableWidgetItem(transaction["stock"] if transaction["stock"] else "")
-            stock_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            
-            # Shares/Price - combined column
-            shares_price_text = ""
-            if transaction["shares"] is not None and transaction["price"] is not None:
-                shares_price_text = f"{transaction['shares']} shares @ ${transaction['price']:.2f}"
-            shares_price_item = QTableWidgetItem(shares_price_text)
-            shares_price_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Total with dollar sign
-            total_text = f"${transaction['total']:.2f}"
-            if transaction["type"] == "Withdrawal":
-                total_text = f"-{total_text}"  # Add negative sign for withdrawals
-                
-            total_item = QTableWidgetItem(total_text)
-            total_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Status with colored styling
-            status_item = QTableWidgetItem(transaction["status"])
-            
-            # Style status based on value
-            if transaction["status"] == "Completed":
-                status_item.setForeground(QColor(ColorPalette.ACCENT_SUCCESS))
-            elif transaction["status"] == "Pending":
-                status_item.setForeground(QColor(ColorPalette.ACCENT_WARNING))
-            elif transaction["status"] == "Failed":
-                status_item.setForeground(QColor(ColorPalette.ACCENT_DANGER))
-            elif transaction["status"] == "Canceled":
-                status_item.setForeground(QColor(ColorPalette.TEXT_SECONDARY))
-            
-            # Add item action button (for the last row to demonstrate)
-            if row == 0:
-                # Create action button widget
-                action_widget = QWidget()
-                action_layout = QHBoxLayout(action_widget)
-                action_layout.setContentsMargins(0, 0, 0, 0)
-                action_layout.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                
-                # Action button
-                action_btn = QToolButton()
-                action_btn.setText("⋮")  # Vertical ellipsis for menu
-                action_btn.setCursor(Qt.PointingHandCursor)
-                action_btn.setStyleSheet(f"""
-                    QToolButton {{
-                        background-color: transparent;
-                        border: none;
-                        padding: 2px;
-                        color: {ColorPalette.TEXT_SECONDARY};
-                        font-size: 16px;
-                    }}
-                    QToolButton:hover {{
-                        background-color: {ColorPalette.BG_DARK};
-                        border-radius: 4px;
-                    }}
-                """)
-                
-                # Create menu
-                action_menu = QMenu()
-                action_menu.setStyleSheet(f"""
-                    QMenu {{
-                        background-color: {ColorPalette.BG_CARD};
-                        color: {ColorPalette.TEXT_PRIMARY};
-                        border: 1px solid {ColorPalette.BORDER_DARK};
-                        border-radius: 8px;
-                        padding: 5px;
-                    }}
-                    QMenu::item {{
-                        padding: 8px 15px;
-                        border-radius: 4px;
-                    }}
-                    QMenu::item:selected {{
-                        background-color: {ColorPalette.BG_DARK};
-                    }}
-                """)
-                
-                # Add actions
-                action_sell = QAction("Sell", action_menu)
-                action_buy = QAction("Buy More", action_menu)
-                action_view = QAction("View Details", action_menu)
-                
-                action_menu.addAction(action_sell)
-                action_menu.addAction(action_buy)
-                action_menu.addSeparator()
-                action_menu.addAction(action_view)
-                
-                action_btn.setMenu(action_menu)
-                action_btn.setPopupMode(QToolButton.InstantPopup)
-                
-                action_layout.addWidget(action_btn)
-                
-                # Set the action_widget to the last column
-                self.transaction_table.setCellWidget(row, 5, action_widget)
-            else:
-                self.transaction_table.setItem(row, 5, status_item)
-            
-            # Set items in the table
-            self.transaction_table.setItem(row, 0, date_item)
-            self.transaction_table.setItem(row, 1, type_item)
-            self.transaction_table.setItem(row, 2, stock_item)
-            self.transaction_table.setItem(row, 3, shares_price_item)
-            self.transaction_table.setItem(row, 4, total_item)
-            
-            # Set row height
-            self.transaction_table.setRowHeight(row, 50)  # Same row height as in main window
-    
     def eventFilter(self, obj, event):
         """Handle resize events for responsive design"""
         if obj == self and event.type() == QEvent.Resize:
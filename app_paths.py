@@ -0,0 +1,18 @@
+# app_paths.py
+import os
+
+APP_DIR_NAME = ".stockmaster"
+
+
+def data_dir():
+    """Folder for the files the app keeps between runs, created on first use"""
+    path = os.environ.get("STOCKMASTER_DATA_DIR") or os.path.join(os.path.expanduser("~"), APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(*parts):
+    """Path of a file (or sub folder) inside the app data folder"""
+    path = os.path.join(data_dir(), *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -0,0 +1,149 @@
+"""
+startup_benchmark.py - Time from launching the app to a shown login window
+
+Usage:
+    python benchmarks/startup_benchmark.py [--budget 1.5] [--runs 5] [--top 15] [--offscreen]
+
+Starts a fresh interpreter per run that builds the login window the same way
+main.py does and reports back once it has been shown. Prints the median time
+to the login window, the modules with the largest import times (one extra run
+with `-X importtime`) and any heavy module that got imported before the login
+window although it is only needed later. Exits with 1 if the median is over the
+budget or a heavy module was imported at startup, so it can gate a build.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = 1.5  # Seconds
+
+# Only needed after login (or for one feature) - none of these may load before the login window
+LAZY_MODULES = [
+    "View.home_page",
+    "View.protofilio_view",
+    "View.transaction_view",
+    "View.stock_search_window",
+    "View.ai_advisor_window",
+    "View.profile_page",
+    "Export.export_service",
+    "numpy",
+    "pyarrow",
+    "matplotlib",
+    "google_auth_oauthlib",
+    "PySide6.QtNetwork",
+]
+
+READY_MARKER = "LOGIN_WINDOW_READY"
+
+
+def run_child():
+    """Build and show the login window, then print which lazy modules were loaded"""
+    sys.path.insert(0, ROOT)
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
+
+    app = QApplication(sys.argv)
+    from View.theme import apply_theme
+    apply_theme(app)
+    from main import create_login_window
+    login_window, auth_presenter = create_login_window()
+    login_window.show()
+
+    def report():
+        loaded = [name for name in LAZY_MODULES if name in sys.modules]
+        print(f"{READY_MARKER} {json.dumps(loaded)}", flush=True)
+        app.quit()
+
+    # Fires once the event loop has processed the first show/paint events
+    QTimer.singleShot(0, report)
+    app.exec()
+
+
+def launch(extra_args=(), offscreen=False):
+    """Run one child, returns (seconds to the login window, lazy modules loaded, stderr)"""
+    env = dict(os.environ)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    command = [sys.executable, *extra_args, os.path.abspath(__file__), "--child"]
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True)
+    elapsed = None
+    loaded = None
+    for line in process.stdout:
+        if line.startswith(READY_MARKER):
+            elapsed = time.perf_counter() - start
+            loaded = json.loads(line[len(READY_MARKER):])
+    _, stderr = process.communicate()
+    if elapsed is None:
+        raise RuntimeError(f"The login window never came up:\n{stderr[-2000:]}")
+    return elapsed, loaded, stderr
+
+
+def parse_importtime(stderr):
+    """{module: (self us, cumulative us)} from `-X importtime` output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            modules[name] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time budget for the login window")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Seconds allowed to the login window")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs, the median is compared to the budget")
+    parser.add_argument("--top", type=int, default=15, help="Modules listed in the import time table")
+    parser.add_argument("--offscreen", action="store_true", help="Use Qt's offscreen platform (CI without a display)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return 0
+
+    times = []
+    loaded = []
+    for _ in range(args.runs):
+        elapsed, loaded, _ = launch(offscreen=args.offscreen)
+        times.append(elapsed)
+    median = statistics.median(times)
+
+    # One more run for the per-module breakdown (importtime itself adds overhead, so it isn't timed)
+    _, _, stderr = launch(["-X", "importtime"], offscreen=args.offscreen)
+    modules = parse_importtime(stderr)
+    total_us = sum(self_us for self_us, _ in modules.values())
+
+    print(f"Import time per module (top {args.top} by cumulative time, {total_us / 1000:.0f} ms in all imports)")
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    ranked = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in ranked[:args.top]:
+        print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:14.1f}  {name}")
+
+    print()
+    print(f"Time to login window: median {median:.3f}s over {args.runs} runs "
+          f"(min {min(times):.3f}s, max {max(times):.3f}s), budget {args.budget:.3f}s")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: imported before the login window although only needed later: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: startup is {median - args.budget:.3f}s over budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ class EventSystem(QObject):
     
     # Data-carrying signals
     data_updated = Signal(object, object, object)  # (stocks, transactions, stock_details)
+    risk_updated = Signal(object)  # Latest RiskEngine report of the portfolio
     
 # Single instance to be used application-wide
 event_system = EventSystem()
\ No newline at end of file
@@ -5,19 +5,26 @@ from PySide6.QtWidgets import QApplication
 # Import MVP components
 from Model.Auth.auth_model import AuthModel
 from View.auth_page import LoginWindow
+from View.theme import apply_theme
 from Presenter.Auth.auth_presenter import AuthPresenter
 
 
+def create_login_window():
+    """Create model, view, and presenter of the login window"""
+    auth_model = AuthModel()
+    login_window = LoginWindow()
+    auth_presenter = AuthPresenter(login_window, auth_model)
+    return login_window, auth_presenter
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    # One compiled stylesheet for the whole app
+    apply_theme(app)
     
-    # Create model, view, and presenter
-    auth_model = AuthModel()
-    login_window = LoginWindow()
-    auth_presenter = AuthPresenter(login_window, auth_model)
+    login_window, auth_presenter = create_login_window()
     
     # Show login window
     login_window.show()
     
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())